@@ -1,16 +1,49 @@
+import asyncio
+import functools
+import gzip
 import logging
 import os
-from typing import Any, Optional, Union
+import ssl
+import threading
+import time
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Container,
+    Deque,
+    Dict,
+    List,
+    Literal,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlparse
 
 import requests
 from requests import Session
 
+from STACpopulator.bloom import BloomFilter
+from STACpopulator.metrics import METRICS
+from STACpopulator.retry import RetryPolicy, arequest, get_retry_policy
+from STACpopulator.serialization import dumps
+from STACpopulator.transport import get_pool_size, get_session
+
+if TYPE_CHECKING:
+    import aiohttp
+
 LOGGER = logging.getLogger(__name__)
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 def stac_host_reachable(url: str, session: Optional[Session] = None) -> bool:
     try:
-        session = session or requests
+        session = get_session(session)
         response = session.get(url, headers={"Accept": "application/json"})
         response.raise_for_status()
         body = response.json()
@@ -27,16 +60,273 @@ def stac_collection_exists(stac_host: str, collection_id: str, session: Optional
 
     Returns the collection JSON.
     """
-    session = session or requests
+    session = get_session(session)
     r = session.get(os.path.join(stac_host, "collections", collection_id), verify=False)
     return r.status_code == 200
 
 
+class AdaptiveConcurrencyLimiter:
+    """
+    Adaptive limit of the number of requests in flight to the STAC host, following an AIMD strategy.
+
+    The limit starts at ``minimum`` and doubles after every window of ``limit`` healthy requests (slow start) until
+    the host first shows signs of degradation, after which it only grows by one per window (additive increase). A
+    request is unhealthy if it fails with a connection error, a 429 or 5xx status code, or if its latency exceeds
+    ``tolerance`` times the baseline latency (the lowest one observed recently). The limit is then halved
+    (multiplicative decrease), ignoring the outcome of the requests that were already in flight at that moment.
+
+    Every change of the limit is logged with the observed latencies. The limiter can be shared by threads, using
+    the ``with`` statement, and by coroutines of one or more event loops, using ``async with``.
+    """
+
+    def __init__(
+        self,
+        minimum: int = 1,
+        maximum: int = 64,
+        tolerance: float = 2.0,
+        decrease: float = 0.5,
+    ) -> None:
+        """Constructor
+
+        :param minimum: initial and minimum number of requests in flight
+        :type minimum: int
+        :param maximum: maximum number of requests in flight
+        :type maximum: int
+        :param tolerance: ratio of the baseline latency above which the host is considered degraded
+        :type tolerance: float
+        :param decrease: factor applied to the limit when the host is degraded
+        :type decrease: float
+        """
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.tolerance = tolerance
+        self.decrease = decrease
+        self.limit = minimum
+        self._in_flight = 0
+        self._slow_start = True
+        self._skip = 0
+        self._window_samples = 0
+        self._window_latency = 0.0
+        self._baseline: Optional[float] = None
+        self._cond = threading.Condition()
+        self._async_waiters: Deque["asyncio.Future[None]"] = deque()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= self.limit or self._async_waiters:
+                self._cond.wait()
+            self._in_flight += 1
+
+    async def aacquire(self) -> None:
+        with self._cond:
+            if self._in_flight < self.limit and not self._async_waiters:
+                self._in_flight += 1
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._async_waiters.append(waiter)
+        await waiter  # the slot is handed over by release()
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._hand_over()
+
+    def _hand_over(self) -> None:
+        while self._async_waiters and self._in_flight < self.limit:
+            waiter = self._async_waiters.popleft()
+            self._in_flight += 1
+            waiter.get_loop().call_soon_threadsafe(self._wake, waiter)
+        self._cond.notify_all()
+
+    def _wake(self, waiter: "asyncio.Future[None]") -> None:
+        if waiter.done():  # cancelled while waiting, give the slot back
+            self.release()
+        else:
+            waiter.set_result(None)
+
+    def __enter__(self) -> "AdaptiveConcurrencyLimiter":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    async def __aenter__(self) -> "AdaptiveConcurrencyLimiter":
+        await self.aacquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    def record(self, latency: float, status: Optional[int] = None) -> None:
+        """Record the outcome of a request: its latency and status code, or None if it failed without response.
+
+        Must be called before the slot of the request is released.
+        """
+        overloaded = status is None or status == 429 or status >= 500
+        with self._cond:
+            if not overloaded:
+                # slowly forget the lowest latency, in case the host became durably slower
+                self._baseline = latency if self._baseline is None else min(latency, self._baseline * 1.01)
+            degraded = overloaded or (self._baseline is not None and latency > self.tolerance * self._baseline)
+            self._window_latency += latency
+            self._window_samples += 1
+            if self._skip:
+                # requests sent before the last decrease do not reflect the current limit
+                self._skip -= 1
+                return
+            if degraded:
+                limit = max(self.minimum, int(self.limit * self.decrease))
+                reason = f"status {status}" if overloaded else "latency"
+                self._slow_start = False
+                self._skip = self._in_flight - 1
+            elif self._window_samples >= self.limit:
+                limit = min(self.maximum, self.limit * 2 if self._slow_start else self.limit + 1)
+                reason = "healthy"
+            else:
+                return
+            average = self._window_latency / self._window_samples
+            self._window_samples = 0
+            self._window_latency = 0.0
+            if limit == self.limit:
+                return
+            LOGGER.info(
+                f"Posting concurrency limit changed from {self.limit} to {limit} ({reason})",
+                extra={
+                    "concurrency_limit": limit,
+                    "previous_limit": self.limit,
+                    "in_flight": self._in_flight,
+                    "latency": latency,
+                    "latency_average": average,
+                    "latency_baseline": self._baseline,
+                },
+            )
+            self.limit = limit
+            self._hand_over()
+
+
+class RequestCompression:
+    """
+    Compression of the JSON bodies of requests, sent with a ``Content-Encoding`` header.
+
+    Servers that do not support compressed bodies reject them with a 415 (Unsupported Media Type) status code. Such a
+    request is sent again uncompressed, and compression is disabled for the host if it is then accepted. Other client
+    errors, such as 400 or 422, report an invalid item rather than its encoding, and are returned as is so that
+    invalid items are neither sent twice nor disable compression. Bodies smaller than ``min_size`` are not worth
+    compressing and are sent as is.
+    """
+
+    rejection_statuses = frozenset([415])
+
+    def __init__(
+        self,
+        encoding: Literal["gzip", "zstd"] = "gzip",
+        level: Optional[int] = None,
+        min_size: int = 1024,
+    ) -> None:
+        """Constructor
+
+        :param encoding: compression algorithm, ``zstd`` requiring the optional ``zstandard`` package
+        :type encoding: str
+        :param level: compression level, defaults to a fast one of the algorithm (6 for gzip, 3 for zstd)
+        :type level: int, optional
+        :param min_size: minimum size in bytes of the bodies to compress
+        :type min_size: int
+        """
+        if encoding == "gzip":
+            level = 6 if level is None else level
+            self._compress: Callable[[bytes], bytes] = functools.partial(gzip.compress, compresslevel=level, mtime=0)
+        elif encoding == "zstd":
+            try:
+                import zstandard
+            except ImportError as exc:  # pragma: no cover
+                raise ImportError(
+                    "Package 'zstandard' is required for 'zstd' compressed requests. Install 'STACpopulator[zstd]'."
+                ) from exc
+            level = 3 if level is None else level
+            # compressors cannot be shared by threads, but are cheap to create
+            self._compress = lambda data: zstandard.ZstdCompressor(level=level).compress(data)
+        else:
+            raise ValueError(f"Unknown compression [{encoding}]")
+        self.encoding = encoding
+        self.min_size = min_size
+        self._disabled_hosts: Set[str] = set()
+
+    def encode(self, url: str, body: bytes) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """Compress the serialized JSON body of a request to the URL, unless compression does not apply to it.
+
+        :return: the compressed body and its headers, or None to send the body uncompressed
+        """
+        if urlparse(url).netloc in self._disabled_hosts:
+            return None
+        if len(body) < self.min_size:
+            return None
+        headers = {**JSON_HEADERS, "Content-Encoding": self.encoding}
+        return self._compress(body), headers
+
+    def disable(self, url: str) -> None:
+        host = urlparse(url).netloc
+        if host not in self._disabled_hosts:
+            self._disabled_hosts.add(host)
+            LOGGER.warning(
+                f"Host {host} rejects {self.encoding} compressed requests. Sending them uncompressed.",
+                extra={"host": host, "encoding": self.encoding},
+            )
+
+
+def _send(
+    session: Optional[Session],
+    method: str,
+    url: str,
+    json_data: Any,
+    limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    compression: Optional[RequestCompression] = None,
+) -> requests.Response:
+    """Send a request with a JSON body, compressed if requested, within the concurrency limit if any.
+
+    The body is serialized by :func:`dumps`, unless it is given as bytes that are already serialized.
+    """
+    session = get_session(session)
+    body = json_data if isinstance(json_data, bytes) else dumps(json_data)
+    encoded = compression.encode(url, body) if compression else None
+    if encoded is None:
+        return _request(session, method, url, limiter, data=body, headers=JSON_HEADERS)
+    compressed_body, headers = encoded
+    r = _request(session, method, url, limiter, data=compressed_body, headers=headers)
+    if r.status_code not in compression.rejection_statuses:
+        return r
+    r = _request(session, method, url, limiter, data=body, headers=JSON_HEADERS)
+    if r.ok or r.status_code == 409:
+        compression.disable(url)
+    return r
+
+
+def _request(
+    session: Session,
+    method: str,
+    url: str,
+    limiter: Optional[AdaptiveConcurrencyLimiter],
+    **kwargs: Any,
+) -> requests.Response:
+    if limiter is None:
+        return session.request(method, url, **kwargs)
+    with limiter:
+        start = time.monotonic()
+        try:
+            r = session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            limiter.record(time.monotonic() - start)
+            raise
+        limiter.record(time.monotonic() - start, r.status_code)
+        return r
+
+
 def post_stac_collection(
     stac_host: str,
     json_data: dict[str, Any],
     update: Optional[bool] = True,
     session: Optional[Session] = None,
+    compression: Optional[RequestCompression] = None,
 ) -> None:
     """Post/create a collection on the STAC host
 
@@ -47,18 +337,18 @@ def post_stac_collection(
     :param update: if True, update the collection on the host server if it is already present, defaults to True
     :type update: Optional[bool], optional
     :param session: Session with additional configuration to perform requests.
+    :param compression: Compression of the request bodies, if any.
     """
-    session = session or requests
     collection_id = json_data["id"]
     collection_url = os.path.join(stac_host, "collections")
-    r = session.post(collection_url, json=json_data)
+    r = _send(session, "POST", collection_url, json_data, compression=compression)
 
     if r.status_code == 200:
         LOGGER.info(f"Collection {collection_id} successfully created")
     elif r.status_code == 409:
         if update:
             LOGGER.info(f"Collection {collection_id} already exists. Updating.")
-            r = session.put(os.path.join(stac_host, "collections"), json=json_data)
+            r = _send(session, "PUT", collection_url, json_data, compression=compression)
             r.raise_for_status()
         else:
             LOGGER.info(f"Collection {collection_id} already exists.")
@@ -66,6 +356,61 @@ def post_stac_collection(
         r.raise_for_status()
 
 
+def load_stac_item_ids(
+    stac_host: str,
+    collection_id: str,
+    session: Optional[Session] = None,
+    page_size: int = 1000,
+    max_exact: int = 1_000_000,
+    error_rate: float = 0.001,
+) -> Container[str]:
+    """Load the IDs of all the items of a collection on the host server.
+
+    The items are paginated following the ``next`` links, requesting only their ID when the host supports the fields
+    extension. The IDs are held in a :class:`set`, or in a :class:`BloomFilter` if the host reports more than
+    ``max_exact`` items, in which case membership tests have false positives at about ``error_rate``.
+
+    :param stac_host: address of the STAC host
+    :type stac_host: str
+    :param collection_id: ID of the collection whose items are loaded
+    :type collection_id: str
+    :param session: Session with additional configuration to perform requests.
+    :param page_size: number of items requested per page
+    :type page_size: int
+    :return: IDs of the items of the collection, empty if the collection does not exist
+    :rtype: Container[str]
+    """
+    session = get_session(session)
+    items_url = os.path.join(stac_host, f"collections/{collection_id}/items")
+    request = {"method": "GET", "url": items_url, "params": {"limit": page_size, "fields": "id"}}
+    ids: Union[Set[str], BloomFilter, None] = None
+    count = 0
+    while request:
+        r = session.request(**request)
+        if r.status_code == 404 and ids is None:
+            return set()
+        r.raise_for_status()
+        body = r.json()
+        if ids is None:
+            matched = body.get("numberMatched", body.get("context", {}).get("matched"))
+            ids = BloomFilter(matched, error_rate) if matched and matched > max_exact else set()
+        features = body.get("features", [])
+        for feature in features:
+            ids.add(feature["id"])
+        count += len(features)
+        request = None
+        next_link = next((link for link in body.get("links", []) if link.get("rel") == "next"), None)
+        if features and next_link:
+            request = {"method": next_link.get("method", "GET").upper(), "url": next_link["href"]}
+            if next_link.get("body"):
+                request["json"] = next_link["body"]
+    LOGGER.info(
+        f"Found {count} existing items in collection {collection_id}",
+        extra={"collection_id": collection_id, "item_count": count, "bloom_filter": isinstance(ids, BloomFilter)},
+    )
+    return ids
+
+
 def post_stac_item(
     stac_host: str,
     collection_id: str,
@@ -73,6 +418,10 @@ def post_stac_item(
     json_data: dict[str, dict],
     update: Optional[bool] = True,
     session: Optional[Session] = None,
+    limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    exists: Optional[bool] = None,
+    compression: Optional[RequestCompression] = None,
+    body: Optional[bytes] = None,
 ) -> None:
     """Post a STAC item to the host server.
 
@@ -87,22 +436,400 @@ def post_stac_item(
     :param update: if True, update the item on the host server if it is already present, defaults to True
     :type update: Optional[bool], optional
     :param session: Session with additional configuration to perform requests.
+    :param limiter: Limiter of the number of concurrent requests to the host server, if any.
+    :param exists: Whether the item is known to be present on the host server (e.g.: from
+      :func:`load_stac_item_ids`). If True and ``update`` is requested, the item is directly updated, and only
+      created if it turns out to be missing. Otherwise, the creation is attempted first.
+    :type exists: Optional[bool], optional
+    :param compression: Compression of the request bodies, if any.
+    :param body: The STAC item already serialized by :func:`dumps`, if available.
+    :type body: Optional[bytes], optional
     """
-    session = session or requests
     item_id = json_data["id"]
     item_url = os.path.join(stac_host, f"collections/{collection_id}/items")
-    r = session.post(item_url, json=json_data)
-
     extra_log_info = {"item_id": item_id, "item_url": os.path.join(item_url, item_id)}
+    # serialized once for all the requests that may be needed
+    body = body if body is not None else dumps(json_data)
+
+    if exists and update:
+        r = _send(session, "PUT", os.path.join(item_url, item_id), body, limiter, compression)
+        if r.status_code != 404:
+            r.raise_for_status()
+            LOGGER.info(f"Item {item_name} successfully updated", extra=extra_log_info)
+            return
+    r = _send(session, "POST", item_url, body, limiter, compression)
 
     if r.status_code == 200:
         LOGGER.info(f"Item {item_name} successfully added", extra=extra_log_info)
     elif r.status_code == 409:
         if update:
             LOGGER.info(f"Item {item_id} already exists. Updating.", extra=extra_log_info)
-            r = session.put(os.path.join(stac_host, f"collections/{collection_id}/items/{item_id}"), json=json_data)
+            item_url = os.path.join(stac_host, f"collections/{collection_id}/items/{item_id}")
+            r = _send(session, "PUT", item_url, body, limiter, compression)
             r.raise_for_status()
         else:
             LOGGER.warn(f"Item {item_id} already exists.", extra=extra_log_info)
     else:
         r.raise_for_status()
+
+
+def post_stac_items_bulk(
+    stac_host: str,
+    collection_id: str,
+    items: MutableMapping[str, Union[dict[str, Any], bytes]],
+    update: Optional[bool] = True,
+    session: Optional[Session] = None,
+    limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    compression: Optional[RequestCompression] = None,
+) -> requests.Response:
+    """Post many STAC items at once using the bulk transaction endpoint of the host server.
+
+    The endpoint (``POST /collections/{collection_id}/bulk_items``) is provided by ``stac-fastapi``. Items of a batch
+    are inserted within a single transaction, meaning that the whole batch is rejected if any item is invalid.
+
+    :param stac_host: address of the STAC host
+    :type stac_host: str
+    :param collection_id: ID of the collection to which to post the items
+    :type collection_id: str
+    :param items: JSON representations of the STAC items, or their serialization by :func:`dumps`, indexed by their ID
+    :type items: MutableMapping[str, Union[dict[str, Any], bytes]]
+    :param update: if True, items already present on the host server are replaced (upsert), defaults to True
+    :type update: Optional[bool], optional
+    :param session: Session with additional configuration to perform requests.
+    :param limiter: Limiter of the number of concurrent requests to the host server, if any.
+    :param compression: Compression of the request body, if any.
+    :return: the response of the bulk request, without raising on error status
+    :rtype: requests.Response
+    """
+    bulk_url = os.path.join(stac_host, f"collections/{collection_id}/bulk_items")
+    method = "upsert" if update else "insert"
+    # the body is assembled from the serialized items instead of serializing them all again
+    entries = [
+        dumps(item_id) + b":" + (item if isinstance(item, bytes) else dumps(item)) for item_id, item in items.items()
+    ]
+    body = b'{"items":{' + b",".join(entries) + b'},"method":' + dumps(method) + b"}"
+    return _send(session, "POST", bulk_url, body, limiter, compression)
+
+
+class BulkItemUploader:
+    """
+    Accumulates STAC items and posts them in batches through the bulk transaction endpoint of the STAC host.
+
+    A batch is flushed when it reaches either the maximum number of items or the maximum serialized size. If the host
+    rejects the content of a batch (``rejection_statuses``), its items are posted one by one with
+    :func:`post_stac_item` in order to isolate and report the faulty ones individually. Other failures of a batch,
+    such as an overloaded host, are only retried by the retry policy of the session, after which all of its items are
+    reported as failed rather than adding individual requests to the struggling host. If the host does not provide the
+    bulk endpoint, batching is disabled for the remaining items, which are then posted individually.
+
+    Items can be added from multiple threads.
+    """
+
+    # statuses of a batch rejected because of its content, whose items are posted individually to find the faulty ones
+    rejection_statuses = frozenset([400, 409, 422])
+
+    def __init__(
+        self,
+        stac_host: str,
+        collection_id: str,
+        update: Optional[bool] = True,
+        session: Optional[Session] = None,
+        max_items: int = 500,
+        max_bytes: int = 4 * 1024 * 1024,
+        on_failure: Optional[Callable[[str, str, dict[str, Any]], None]] = None,
+        on_success: Optional[Callable[[str, str, dict[str, Any]], None]] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        compression: Optional[RequestCompression] = None,
+    ) -> None:
+        """Constructor
+
+        :param max_items: maximum number of items in a batch
+        :type max_items: int
+        :param max_bytes: maximum size of the serialized items in a batch
+        :type max_bytes: int
+        :param on_failure: called with the item name, location and JSON representation of every item that could not
+          be posted, from within the exception handler that caught the error.
+        :param on_success: called with the item name, location and JSON representation of every posted item.
+        :param limiter: limiter of the number of concurrent requests to the host server, if any.
+        :param compression: compression of the request bodies, if any.
+        """
+        self.stac_host = stac_host
+        self.collection_id = collection_id
+        self.update = update
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.failures = 0
+        self._session = session
+        self._on_failure = on_failure
+        self._on_success = on_success
+        self._limiter = limiter
+        self._compression = compression
+        self._enabled = True
+        self._lock = threading.Lock()
+        self._batch: List[Tuple[str, str, dict[str, Any], bytes]] = []
+        self._batch_bytes = 0
+
+    def add(self, item_name: str, item_loc: str, json_data: dict[str, Any]) -> None:
+        """Add an item to the current batch, flushing it if any of the limits is reached."""
+        body = dumps(json_data)
+        size = len(body)
+        with self._lock:
+            if self._batch and self._batch_bytes + size > self.max_bytes:
+                batch = self._take_batch()
+            else:
+                batch = []
+            self._batch.append((item_name, item_loc, json_data, body))
+            self._batch_bytes += size
+            if len(self._batch) >= self.max_items:
+                batch.extend(self._take_batch())
+            METRICS.set_queue_depth("bulk_batch", len(self._batch))
+        if batch:
+            self._post_batch(batch)
+
+    def flush(self) -> None:
+        """Post all pending items."""
+        with self._lock:
+            batch = self._take_batch()
+        if batch:
+            self._post_batch(batch)
+
+    def _take_batch(self) -> List[Tuple[str, str, dict[str, Any], bytes]]:
+        batch, self._batch, self._batch_bytes = self._batch, [], 0
+        METRICS.set_queue_depth("bulk_batch", 0)
+        return batch
+
+    def _post_batch(self, batch: List[Tuple[str, str, dict[str, Any], bytes]]) -> None:
+        if self._enabled:
+            items = {json_data["id"]: body for _, _, json_data, body in batch}
+            try:
+                r = post_stac_items_bulk(
+                    self.stac_host,
+                    self.collection_id,
+                    items,
+                    self.update,
+                    session=self._session,
+                    limiter=self._limiter,
+                    compression=self._compression,
+                )
+            except requests.exceptions.RequestException as exc:
+                LOGGER.error(f"Bulk post of {len(items)} items failed", exc_info=exc)
+                self._fail_batch(batch)
+                return
+            if r.status_code == 200:
+                LOGGER.info(
+                    f"{len(items)} items successfully added",
+                    extra={"collection_id": self.collection_id, "item_ids": list(items)},
+                )
+                if self._on_success:
+                    for item_name, item_loc, json_data, _ in batch:
+                        self._on_success(item_name, item_loc, json_data)
+                return
+            if r.status_code in [404, 405]:
+                LOGGER.warning("Bulk transactions are not supported by the STAC host. Posting items individually.")
+                self._enabled = False
+            elif r.status_code in self.rejection_statuses:
+                LOGGER.warning(
+                    f"Bulk post of {len(items)} items rejected with status {r.status_code}. "
+                    "Posting items individually to identify the failing ones.",
+                    extra={"collection_id": self.collection_id, "response": r.text},
+                )
+            else:
+                try:
+                    raise requests.exceptions.HTTPError(
+                        f"Bulk post of {len(items)} items failed with status {r.status_code}", response=r
+                    )
+                except requests.exceptions.HTTPError:
+                    LOGGER.error(
+                        f"Bulk post of {len(items)} items failed with status {r.status_code}",
+                        extra={"collection_id": self.collection_id, "response": r.text},
+                    )
+                    self._fail_batch(batch)
+                return
+
+        for item_name, item_loc, json_data, body in batch:
+            try:
+                post_stac_item(
+                    self.stac_host,
+                    self.collection_id,
+                    item_name,
+                    json_data,
+                    update=self.update,
+                    session=self._session,
+                    limiter=self._limiter,
+                    compression=self._compression,
+                    body=body,
+                )
+            except Exception:
+                with self._lock:
+                    self.failures += 1
+                if self._on_failure:
+                    self._on_failure(item_name, item_loc, json_data)
+            else:
+                if self._on_success:
+                    self._on_success(item_name, item_loc, json_data)
+
+    def _fail_batch(self, batch: List[Tuple[str, str, dict[str, Any], bytes]]) -> None:
+        """Report every item of a batch as failed. Must be called from the exception handler of the failure."""
+        with self._lock:
+            self.failures += len(batch)
+        if self._on_failure:
+            for item_name, item_loc, json_data, _ in batch:
+                self._on_failure(item_name, item_loc, json_data)
+
+
+def create_async_session(session: Optional[Session] = None, limit: int = 100) -> "aiohttp.ClientSession":
+    """Create an :mod:`aiohttp` session, with a pool of connections, matching the settings of a :mod:`requests` session.
+
+    SSL verification and client certificate are transferred to the new session. Authorization and cookies are
+    resolved for each request by :func:`async_request_options`, using the original session.
+
+    :param session: Session with the configuration to employ, if any.
+    :param limit: Maximum number of simultaneous connections.
+    :raises ImportError: if the optional :mod:`aiohttp` package is not installed.
+    """
+    try:
+        import aiohttp
+    except ImportError as exc:  # pragma: no cover
+        raise ImportError(
+            "Package 'aiohttp' is required for asynchronous requests. Install 'STACpopulator[async]'."
+        ) from exc
+
+    ssl_option: Union[bool, ssl.SSLContext] = True
+    if session is not None:
+        if session.verify is False:
+            ssl_option = False
+        else:
+            cafile = session.verify if isinstance(session.verify, str) else None
+            cert = session.cert
+            if cert and not isinstance(cert, (str, tuple)):
+                cert = cert.name  # the CLI provides an opened file rather than its path
+            ssl_option = _ssl_context(cafile, cert)
+    # connections per host are limited as those of the synchronous requests of the session
+    limit_per_host = min(limit, get_pool_size(session) or limit)
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host, ssl=ssl_option)
+    return aiohttp.ClientSession(connector=connector, raise_for_status=False)
+
+
+@functools.lru_cache(maxsize=None)
+def _ssl_context(cafile: Optional[str], cert: Union[str, Tuple[str, str], None]) -> ssl.SSLContext:
+    """SSL context shared by the asynchronous sessions with the same configuration, loading certificates once."""
+    context = ssl.create_default_context(cafile=cafile)
+    if isinstance(cert, tuple):
+        context.load_cert_chain(*cert)
+    elif cert:
+        context.load_cert_chain(cert)
+    return context
+
+
+def async_request_options(session: Optional[Session], method: str, url: str) -> dict[str, Any]:
+    """Obtain the headers that the :mod:`requests` session would send for a request, for use with :mod:`aiohttp`.
+
+    This allows the same authorization handlers and cookies to be applied to asynchronous requests.
+    Authorization handlers that require a challenge-response exchange (e.g.: digest) are not supported.
+    """
+    if session is None:
+        return {"headers": {}}
+    prepared = session.prepare_request(requests.Request(method, url))
+    headers = dict(prepared.headers)
+    headers.pop("Content-Length", None)  # computed from the empty body, the actual one is set by aiohttp
+    return {"headers": headers}
+
+
+async def _asend(
+    async_session: "aiohttp.ClientSession",
+    method: str,
+    url: str,
+    json_data: Any,
+    session: Optional[Session] = None,
+    limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    compression: Optional[RequestCompression] = None,
+    **kwargs: Any,
+) -> "aiohttp.ClientResponse":
+    """Asynchronous counterpart of :func:`_send`, applying the retry policy of the session if any."""
+    policy = get_retry_policy(session)
+    body = json_data if isinstance(json_data, bytes) else dumps(json_data)
+    plain_kwargs = {**kwargs, "headers": {**kwargs.get("headers", {}), **JSON_HEADERS}}
+    encoded = compression.encode(url, body) if compression else None
+    if encoded is None:
+        return await _arequest(async_session, method, url, policy, limiter, data=body, **plain_kwargs)
+    compressed_body, headers = encoded
+    compressed_kwargs = {**kwargs, "headers": {**kwargs.get("headers", {}), **headers}}
+    r = await _arequest(async_session, method, url, policy, limiter, data=compressed_body, **compressed_kwargs)
+    if r.status not in compression.rejection_statuses:
+        return r
+    r = await _arequest(async_session, method, url, policy, limiter, data=body, **plain_kwargs)
+    if r.ok or r.status == 409:
+        compression.disable(url)
+    return r
+
+
+async def _arequest(
+    async_session: "aiohttp.ClientSession",
+    method: str,
+    url: str,
+    policy: Optional[RetryPolicy],
+    limiter: Optional[AdaptiveConcurrencyLimiter],
+    **kwargs: Any,
+) -> "aiohttp.ClientResponse":
+    if limiter is None:
+        return await arequest(async_session, method, url, policy, **kwargs)
+    async with limiter:
+        start = time.monotonic()
+        try:
+            r = await arequest(async_session, method, url, policy, **kwargs)
+        except Exception:
+            limiter.record(time.monotonic() - start)
+            raise
+        limiter.record(time.monotonic() - start, r.status)
+        return r
+
+
+async def apost_stac_item(
+    stac_host: str,
+    collection_id: str,
+    item_name: str,
+    json_data: dict[str, dict],
+    update: Optional[bool] = True,
+    session: Optional[Session] = None,
+    async_session: "aiohttp.ClientSession" = None,
+    limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    exists: Optional[bool] = None,
+    compression: Optional[RequestCompression] = None,
+    body: Optional[bytes] = None,
+) -> None:
+    """Asynchronous counterpart of :func:`post_stac_item`.
+
+    :param session: Session used to resolve the authorization and cookies of the requests.
+    :param async_session: Session employed to send the requests, from :func:`create_async_session`.
+    :param limiter: Limiter of the number of concurrent requests to the host server, if any.
+    """
+    item_id = json_data["id"]
+    item_url = os.path.join(stac_host, f"collections/{collection_id}/items")
+    extra_log_info = {"item_id": item_id, "item_url": os.path.join(item_url, item_id)}
+    body = body if body is not None else dumps(json_data)
+
+    if exists and update:
+        put_url = os.path.join(item_url, item_id)
+        put_options = async_request_options(session, "PUT", put_url)
+        r = await _asend(async_session, "PUT", put_url, body, session, limiter, compression, **put_options)
+        if r.status != 404:
+            r.raise_for_status()
+            LOGGER.info(f"Item {item_name} successfully updated", extra=extra_log_info)
+            return
+    options = async_request_options(session, "POST", item_url)
+    r = await _asend(async_session, "POST", item_url, body, session, limiter, compression, **options)
+    status = r.status
+    if status not in [200, 409]:
+        r.raise_for_status()
+
+    if status == 200:
+        LOGGER.info(f"Item {item_name} successfully added", extra=extra_log_info)
+    elif status == 409:
+        if update:
+            LOGGER.info(f"Item {item_id} already exists. Updating.", extra=extra_log_info)
+            put_url = os.path.join(stac_host, f"collections/{collection_id}/items/{item_id}")
+            put_options = async_request_options(session, "PUT", put_url)
+            r = await _asend(async_session, "PUT", put_url, body, session, limiter, compression, **put_options)
+            r.raise_for_status()
+        else:
+            LOGGER.warn(f"Item {item_id} already exists.", extra=extra_log_info)
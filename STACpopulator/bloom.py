@@ -0,0 +1,42 @@
+import hashlib
+import math
+from typing import Iterator
+
+
+class BloomFilter:
+    """
+    Compact set of strings, whose membership tests have no false negatives and false positives at about ``error_rate``
+    as long as at most ``capacity`` values are added.
+
+    It takes about 1.8 bytes per value at a 0.1% error rate, regardless of the length of the values, which makes it
+    suitable to hold millions of STAC item IDs where a :class:`set` would require hundreds of megabytes.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        """Constructor
+
+        :param capacity: expected number of values
+        :type capacity: int
+        :param error_rate: probability of false positives once the capacity is reached
+        :type error_rate: float
+        """
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str) -> Iterator[int]:
+        # double hashing: positions h1 + i * h2 behave like independent hash functions
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, str):
+            return False
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
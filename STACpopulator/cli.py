@@ -1,4 +1,5 @@
 import argparse
+import contextlib
 import glob
 import importlib
 import logging
@@ -6,14 +7,18 @@ import os
 import sys
 from datetime import datetime
 from http import cookiejar
-from typing import Callable, Optional
+from typing import Any, Callable, ContextManager, Dict, Optional
 
 import requests
 from requests.auth import AuthBase, HTTPBasicAuth, HTTPDigestAuth, HTTPProxyAuth
 from requests.sessions import Session
 
-from STACpopulator import __version__
+from STACpopulator import __version__, local_api
+from STACpopulator.crawl_index import CrawlIndex
+from STACpopulator.http_cache import HTTPCache
 from STACpopulator.logging import setup_logging
+from STACpopulator.retry import CircuitBreaker, RetryPolicy
+from STACpopulator.transport import DEFAULT_POOL_SIZE, configure_session
 
 POPULATORS = {}
 
@@ -76,6 +81,347 @@ def add_request_options(parser: argparse.ArgumentParser) -> None:
         required=False,
         help="Bearer token, cookie-jar file or proxy/digest/basic username:password for selected authorization handler.",
     )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=5,
+        help=(
+            "Maximum number of retries of requests failing with a connection error or a transient status code "
+            "(429, 502, 503, 504), with exponential backoff (default: %(default)s, 0 to disable retries)."
+        ),
+    )
+    parser.add_argument(
+        "--retry-backoff",
+        type=float,
+        default=0.5,
+        help="Base delay in seconds of the exponential backoff between retries (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--retry-backoff-max",
+        type=float,
+        default=60.0,
+        help=(
+            "Maximum delay in seconds between retries, including those requested by 'Retry-After' headers "
+            "(default: %(default)s)."
+        ),
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=5,
+        help=(
+            "Number of consecutive failures of a host after which all requests to it are paused "
+            "(default: %(default)s, 0 to disable)."
+        ),
+    )
+    parser.add_argument(
+        "--breaker-cooldown",
+        type=float,
+        default=30.0,
+        help="Delay in seconds during which requests to a failing host are paused (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=positive_int,
+        required=False,
+        help=(
+            "Maximum number of connections kept alive per host. Requests beyond it wait for a free connection "
+            f"(default: the number of '--workers' plus one, at least {DEFAULT_POOL_SIZE})."
+        ),
+    )
+
+
+def positive_int(value: str) -> int:
+    """
+    Argument type that only accepts strictly positive integers.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"invalid positive integer value: '{value}'")
+    return number
+
+
+def add_ingest_options(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds arguments to a parser to control how a populator ingests the items produced by its loader.
+    """
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=1,
+        help="Number of STAC items created and posted concurrently (default: %(default)s, serial ingestion).",
+    )
+    parser.add_argument(
+        "--bulk-size",
+        type=positive_int,
+        required=False,
+        help=(
+            "Post STAC items in batches of this many items using the bulk transactions endpoint of the STAC API "
+            "(POST /collections/{id}/bulk_items) instead of one request per item."
+        ),
+    )
+    parser.add_argument(
+        "--bulk-max-bytes",
+        type=positive_int,
+        default=4 * 1024 * 1024,
+        help="Maximum size in bytes of the serialized STAC items of a batch when using '--bulk-size'.",
+    )
+    parser.add_argument(
+        "--compress",
+        dest="compression",
+        choices=["gzip", "zstd"],
+        required=False,
+        help=(
+            "Compress the bodies of the requests to the STAC API ('zstd' requires the 'zstandard' package). "
+            "Requests are sent uncompressed to a STAC API that rejects compressed ones."
+        ),
+    )
+    parser.add_argument(
+        "--async",
+        dest="asynchronous",
+        action="store_true",
+        help=(
+            "Run the ingestion on an asyncio event loop, with up to '--workers' items processed concurrently "
+            "as coroutines. Requires the 'aiohttp' package."
+        ),
+    )
+    parser.add_argument(
+        "--processes",
+        type=positive_int,
+        required=False,
+        help=(
+            "Create STAC items with a pool of this many processes to employ multiple CPU cores. "
+            "The number of '--workers' is increased to match it if lower."
+        ),
+    )
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help=(
+            "Adapt the number of STAC items posted concurrently, up to '--workers', to the latency and errors of the "
+            "STAC API: it grows while the API remains responsive and is halved when it degrades."
+        ),
+    )
+    parser.add_argument(
+        "--preload-item-ids",
+        action="store_true",
+        help=(
+            "With '--update', load the IDs of the items already in the collection before posting, so that existing "
+            "items are directly updated instead of first being rejected by a creation attempt."
+        ),
+    )
+    parser.add_argument(
+        "--journal",
+        type=str,
+        required=False,
+        help="Path to a SQLite database (created if missing) where the outcome of every processed item is recorded.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip the items that the '--journal' reports as successfully posted by a previous run.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Skip the items whose source data (e.g.: modification date and size) is unchanged since the '--journal' "
+            "recorded them as successfully posted."
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        choices=["api", "ndjson", "catalog"],
+        default="api",
+        help=(
+            "Destination of the STAC Collection and Items: the STAC API (default), a newline-delimited JSON file "
+            "(compressed if '--output-path' ends with '.gz' or '.zst') or a static catalog written in a directory."
+        ),
+    )
+    parser.add_argument(
+        "--output-path",
+        type=str,
+        required=False,
+        help="Path of the file or directory written by the 'ndjson' and 'catalog' outputs.",
+    )
+    parser.add_argument(
+        "--summaries",
+        action="store_true",
+        help=(
+            "Aggregate the summaries and extent of the collection from the ingested STAC items and update the "
+            "collection with them, replacing the published ones. Only enable it for runs ingesting all the items of "
+            "the collection, or extending the aggregation saved in the '--journal' by previous runs."
+        ),
+    )
+    parser.add_argument(
+        "--summaries-interval",
+        type=float,
+        default=600,
+        help=(
+            "Interval in seconds between updates of the collection summaries during the ingestion "
+            "(default: %(default)s, 0 to only update them at the end)."
+        ),
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        required=False,
+        help="Serve metrics of the ingestion in the Prometheus format on the '/metrics' endpoint of this port.",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        type=str,
+        required=False,
+        help=(
+            "Write metrics of the ingestion in the Prometheus format to this file (e.g.: a '.prom' file of the "
+            "textfile collector directory of the node exporter), updated every '--metrics-interval' seconds."
+        ),
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=15,
+        help="Interval in seconds between updates of the '--metrics-textfile' (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=30,
+        help=(
+            "Interval in seconds between logs of the ingestion progress, with the throughput, remaining items and "
+            "estimated time left (default: %(default)s, 0 to disable)."
+        ),
+    )
+
+
+
+def ingest_kwargs(namespace: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Obtains the keyword arguments of a :class:`STACpopulator.populator_base.STACpopulatorBase` from the parsed
+    arguments added by :func:`add_ingest_options`.
+    """
+    return {
+        "workers": namespace.workers,
+        "bulk_size": namespace.bulk_size,
+        "bulk_max_bytes": namespace.bulk_max_bytes,
+        "compression": namespace.compression,
+        "asynchronous": namespace.asynchronous,
+        "processes": namespace.processes,
+        "adaptive_concurrency": namespace.adaptive_concurrency,
+        "preload_item_ids": namespace.preload_item_ids,
+        "journal": namespace.journal,
+        "resume": namespace.resume,
+        "incremental": namespace.incremental,
+        "output": namespace.output,
+        "output_path": namespace.output_path,
+        "summaries": namespace.summaries,
+        "summaries_interval": namespace.summaries_interval,
+        "metrics_port": namespace.metrics_port,
+        "metrics_textfile": namespace.metrics_textfile,
+        "metrics_interval": namespace.metrics_interval,
+        "progress_interval": namespace.progress_interval,
+    }
+
+
+def add_thredds_options(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds arguments to a parser to control how the ``THREDDSLoader`` of a populator crawls the THREDDS catalogs.
+    """
+    parser.add_argument(
+        "--crawl-workers",
+        type=positive_int,
+        default=1,
+        help=(
+            "Number of THREDDS sub-catalogs requested concurrently, crawling the catalogs breadth-first "
+            "(default: %(default)s, sequential depth-first crawl). Ignored with '--async', which requests them "
+            "concurrently already."
+        ),
+    )
+    parser.add_argument(
+        "--ncml-prefetch",
+        type=int,
+        default=0,
+        help=(
+            "Number of NcML descriptions of the upcoming THREDDS datasets requested and parsed concurrently while "
+            "the current items are ingested (default: %(default)s, requested one at a time). Ignored with '--async', "
+            "which requests up to '--workers' of them concurrently already."
+        ),
+    )
+    parser.add_argument(
+        "--ncml-unordered",
+        dest="ncml_ordered",
+        action="store_false",
+        help="Ingest the prefetched datasets as soon as their NcML description is loaded instead of in catalog order.",
+    )
+    parser.add_argument(
+        "--http-cache",
+        metavar="PATH",
+        help=(
+            "SQLite database where the THREDDS catalogs and NcML descriptions are cached with their 'ETag' and "
+            "'Last-Modified' headers. On later runs, they are requested conditionally and only transferred again "
+            "if they were modified."
+        ),
+    )
+    parser.add_argument(
+        "--http-cache-size",
+        type=positive_int,
+        default=1024,
+        metavar="MB",
+        help="Maximum size of the '--http-cache', evicting the least recently used responses (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--crawl-index",
+        metavar="PATH",
+        help=(
+            "SQLite database where every crawled THREDDS catalog and dataset is recorded with its modification date, "
+            "size, NcML URL and the last run that saw it. Catalogs already indexed are requested conditionally, and "
+            "only parsed again if they were modified."
+        ),
+    )
+    parser.add_argument(
+        "--from-index",
+        action="store_true",
+        help=(
+            "Enumerate the datasets from the catalogs recorded in the '--crawl-index' without requesting them, "
+            "for instance to ingest a known list of datasets again. Only their NcML descriptions are requested."
+        ),
+    )
+    parser.add_argument(
+        "--skip-unchanged-subtrees",
+        action="store_true",
+        help=(
+            "Rebuild the whole subtree of a THREDDS catalog from the '--crawl-index' without requesting its "
+            "sub-catalogs when the catalog is unchanged since the previous run. Changes of the sub-catalogs are then "
+            "only found once their parent catalog changes, which suits trees whose subtrees are mostly static."
+        ),
+    )
+    parser.add_argument(
+        "--stream-catalogs",
+        action="store_true",
+        help=(
+            "Download the THREDDS catalogs to temporary files and parse them incrementally, ingesting their datasets "
+            "as soon as they are found with a memory independent of the size of the catalogs. Only applies to the "
+            "sequential crawl, without '--crawl-workers', '--async', '--http-cache' or '--crawl-index'."
+        ),
+    )
+
+
+def open_http_cache(namespace: argparse.Namespace) -> ContextManager[Optional[HTTPCache]]:
+    """
+    Opens the HTTP cache requested by the THREDDS options, if any, to be closed at the end of the ingestion.
+    """
+    if not namespace.http_cache:
+        return contextlib.nullcontext()
+    return HTTPCache(namespace.http_cache, namespace.http_cache_size * 1024**2)
+
+
+def open_crawl_index(namespace: argparse.Namespace) -> ContextManager[Optional[CrawlIndex]]:
+    """
+    Opens the crawl index requested by the THREDDS options, if any, to be closed at the end of the ingestion.
+    """
+    if not namespace.crawl_index:
+        return contextlib.nullcontext()
+    return CrawlIndex(namespace.crawl_index)
 
 
 def apply_request_options(session: Session, namespace: argparse.Namespace) -> None:
@@ -84,6 +430,20 @@ def apply_request_options(session: Session, namespace: argparse.Namespace) -> No
     """
     session.verify = namespace.verify
     session.cert = namespace.cert
+    breaker = CircuitBreaker(threshold=namespace.breaker_threshold, cooldown=namespace.breaker_cooldown)
+    policy = RetryPolicy(
+        retries=namespace.retries,
+        backoff=namespace.retry_backoff,
+        backoff_max=namespace.retry_backoff_max,
+        breaker=breaker,
+    )
+    pool_size = namespace.pool_size
+    if not pool_size:
+        # every worker may be sending a request to the same host, along with the main thread and the crawlers
+        workers = max(getattr(namespace, "workers", 1), getattr(namespace, "processes", None) or 0)
+        loaders = getattr(namespace, "crawl_workers", 0) + getattr(namespace, "ncml_prefetch", 0)
+        pool_size = max(DEFAULT_POOL_SIZE, workers + loaders + 1)
+    configure_session(session, pool_size=pool_size, policy=policy)
     if namespace.auth_handler in ["basic", "digest", "proxy"]:
         usr, pwd = namespace.auth_identity.split(":", 1)
         if namespace.auth_handler == "basic":
@@ -122,6 +482,16 @@ def make_main_parser() -> argparse.ArgumentParser:
         description=run_cmd_parser.description,
     )
 
+    serve_cmd_parser = local_api.make_parser()
+    commands.add_parser(
+        "serve",
+        prog=f"{parser.prog} serve",
+        parents=[serve_cmd_parser],
+        add_help=False,
+        help=serve_cmd_parser.description,
+        description=serve_cmd_parser.description,
+    )
+
     # add more commands as needed...
     parser.add_argument("--debug", action="store_true", help="Set logger level to debug")
 
@@ -205,6 +575,9 @@ def main(*args: str) -> Optional[int]:
             result = populator_runner(ns)
         else:
             result = populator_caller(*populator_args)
+    elif populator_cmd == "serve":
+        logging.basicConfig(level=logging.DEBUG if ns.debug else logging.INFO)
+        result = local_api.runner(ns)
     return 0 if result is None else result
 
 
@@ -0,0 +1,366 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from requests.structures import CaseInsensitiveDict
+from siphon.catalog import TDSCatalog
+
+LOGGER = logging.getLogger(__name__)
+
+# common table expression of the URLs of the catalogs in the subtree of a catalog, including itself
+SUBTREE = """
+    WITH RECURSIVE subtree(url) AS (
+        SELECT ?
+        UNION
+        SELECT json_extract(ref.value, '$[1]')
+        FROM catalogs JOIN subtree USING (url), json_each(catalogs.refs) ref
+    )
+"""
+
+
+def _digests(refs: Mapping[str, List[str]], datasets: Iterable[Tuple[str, str, Any, Any]]) -> Dict[str, Optional[str]]:
+    """Compute the Merkle-style digests of the subtrees of catalogs, from the leaves up.
+
+    :param refs: URLs of the sub-catalogs referenced by every catalog
+    :param datasets: catalog URL, name, size and modification date of the datasets, ordered by catalog and name
+    :return: the digest of every catalog, None if its subtree references a catalog missing from ``refs`` or a cycle
+    """
+    content: Dict[str, Any] = {url: hashlib.sha256() for url in refs}
+    for url, name, size, modified in datasets:
+        if url in content:
+            content[url].update(json.dumps([name, size, modified]).encode())
+
+    digests: Dict[str, Optional[str]] = {}
+    visiting = set()
+    for root in refs:
+        # iterative post-order walk, a catalog being digested once all of its sub-catalogs are
+        stack = [root]
+        while stack:
+            url = stack[-1]
+            if url in digests:
+                stack.pop()
+            elif url not in visiting:
+                visiting.add(url)
+                stack.extend(href for href in refs[url] if href in refs and href not in visiting)
+            else:
+                stack.pop()
+                # sub-catalogs missing or still being visited (reference cycle) have no digest
+                children = [digests.get(href) for href in refs[url]]
+                if any(child is None for child in children):
+                    digests[url] = None
+                    continue
+                digest = content[url].copy()
+                for child in children:
+                    digest.update(child.encode())
+                digests[url] = digest.hexdigest()
+    return digests
+
+
+class IndexedRef(NamedTuple):
+    """Reference to a sub-catalog, as recorded in the :class:`CrawlIndex`."""
+
+    title: str
+    href: str
+
+
+class IndexedDataset(NamedTuple):
+    """Description of a dataset recorded in the :class:`CrawlIndex`, standing for a :class:`siphon.catalog.Dataset`."""
+
+    name: str
+    url_path: str
+    access_urls: Dict[str, str]
+    modified: Optional[str]
+    size: Optional[str]
+
+
+class IndexedCatalog:
+    """
+    Catalog rebuilt from the :class:`CrawlIndex`, providing the attributes of a :class:`siphon.catalog.TDSCatalog`
+    employed to walk the catalogs.
+    """
+
+    def __init__(
+        self,
+        catalog_url: str,
+        catalog_name: str,
+        datasets: List[IndexedDataset],
+        catalog_refs: List[IndexedRef],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        digest: Optional[str] = None,
+        last_seen: Optional[int] = None,
+    ) -> None:
+        self.catalog_url = catalog_url
+        self.catalog_name = catalog_name
+        self.datasets = {ds.name: ds for ds in datasets}
+        self.catalog_refs = {ref.title: ref for ref in catalog_refs}
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_hash = content_hash
+        self.digest = digest
+        self.last_seen = last_seen
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Headers of a request for the catalog, only answered with its content if it was modified since indexed."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class CrawlIndex:
+    """
+    Persistent index of the THREDDS catalogs and datasets found by the crawls of a
+    :class:`STACpopulator.input.THREDDSLoader`, stored in a SQLite database.
+
+    Every catalog is recorded with the ``ETag`` and ``Last-Modified`` headers of its response and its references to
+    sub-catalogs, and every dataset with its modification date, size and access URLs (including its NcML description),
+    along with the crawl run that last saw them. The index allows later crawls to request the catalogs conditionally,
+    rebuilding those that are not modified from the index, and the datasets to be enumerated without any catalog
+    request.
+
+    At the end of a run, every catalog is given a Merkle-style digest of its subtree, computed from the names, sizes
+    and modification dates of its datasets and the digests of its sub-catalogs. Only catalogs whose whole subtree was
+    seen by the run have a digest. A later run can rebuild the subtree of an unchanged catalog from the index once
+    :meth:`subtree_digest` verifies that the subtree is still indexed as it was digested.
+
+    The index can be written from multiple threads.
+    """
+
+    def __init__(self, path: Union[os.PathLike[str], str]) -> None:
+        """Constructor
+
+        :param path: path to the SQLite database file, created if missing
+        :type path: Union[os.PathLike[str], str]
+        """
+        self.path = path
+        self.run: Optional[int] = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level="DEFERRED")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL,
+                    started REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS catalogs (
+                    url TEXT NOT NULL PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    refs TEXT NOT NULL,
+                    content_hash TEXT,
+                    digest TEXT,
+                    last_seen INTEGER NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS datasets (
+                    catalog_url TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    url_path TEXT NOT NULL,
+                    ncml_url TEXT,
+                    access_urls TEXT NOT NULL,
+                    modified TEXT,
+                    size TEXT,
+                    last_seen INTEGER NOT NULL,
+                    PRIMARY KEY (catalog_url, name)
+                )
+                """
+            )
+
+    def start_run(self, url: str) -> int:
+        """Register a new crawl of the catalogs from a top-level catalog, marking everything it records as seen by it.
+
+        :return: the identifier of the run
+        """
+        with self._lock, self._conn:
+            self.run = self._conn.execute("INSERT INTO runs (url, started) VALUES (?, ?)", (url, time.time())).lastrowid
+        LOGGER.info(f"Recording crawl run {self.run} in index [{self.path}]")
+        return self.run
+
+    def catalog(self, url: str) -> Optional[IndexedCatalog]:
+        """Rebuild a catalog from the index, if it was recorded."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT name, etag, last_modified, refs, content_hash, digest, last_seen FROM catalogs WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT name, url_path, access_urls, modified, size FROM datasets WHERE catalog_url = ? ORDER BY rowid",
+                (url,),
+            ).fetchall()
+        catalog_name, etag, last_modified, refs, content_hash, digest, last_seen = row
+        return IndexedCatalog(
+            url,
+            catalog_name,
+            [IndexedDataset(name, path, json.loads(urls), modified, size) for name, path, urls, modified, size in rows],
+            [IndexedRef(*ref) for ref in json.loads(refs)],
+            etag=etag,
+            last_modified=last_modified,
+            content_hash=content_hash,
+            digest=digest,
+            last_seen=last_seen,
+        )
+
+    def record_catalog(
+        self,
+        url: str,
+        catalog: TDSCatalog,
+        headers: Optional[Mapping[str, str]] = None,
+        content_hash: Optional[str] = None,
+    ) -> None:
+        """Record a loaded catalog with its datasets, replacing those previously indexed for it.
+
+        :param url: URL with which the catalog was requested
+        :param catalog: the loaded catalog
+        :param headers: headers of the response, providing the validators of the catalog
+        :param content_hash: hash of the catalog document, identifying it when requested again
+        """
+        headers = CaseInsensitiveDict(headers or {})
+        refs = [(title, ref.href) for title, ref in catalog.catalog_refs.items()]
+        datasets = [
+            (
+                url,
+                name,
+                ds.url_path,
+                ds.access_urls.get("NCML"),
+                json.dumps(ds.access_urls),
+                getattr(ds, "modified", None),
+                getattr(ds, "size", None),
+                self.run,
+            )
+            for name, ds in catalog.datasets.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO catalogs (url, name, etag, last_modified, refs, content_hash, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    catalog.catalog_name,
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    json.dumps(refs),
+                    content_hash,
+                    self.run,
+                ),
+            )
+            self._conn.execute("DELETE FROM datasets WHERE catalog_url = ?", (url,))
+            self._conn.executemany("INSERT INTO datasets VALUES (?, ?, ?, ?, ?, ?, ?, ?)", datasets)
+
+    def touch_catalog(self, url: str, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Mark an unmodified catalog and its datasets as seen by the current run.
+
+        :param url: URL with which the catalog was requested
+        :param headers: headers of the response, updating the validators of the catalog if provided
+        """
+        headers = CaseInsensitiveDict(headers or {})
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE catalogs SET last_seen = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (self.run, headers.get("ETag"), headers.get("Last-Modified"), url),
+            )
+            self._conn.execute("UPDATE datasets SET last_seen = ? WHERE catalog_url = ?", (self.run, url))
+
+    def touch_subtree(self, url: str) -> int:
+        """Mark a catalog, all the catalogs of its subtree and their datasets as seen by the current run.
+
+        :return: the number of datasets in the subtree
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"{SUBTREE} UPDATE catalogs SET last_seen = ? WHERE url IN (SELECT url FROM subtree)", (url, self.run)
+            )
+            return self._conn.execute(
+                f"{SUBTREE} UPDATE datasets SET last_seen = ? WHERE catalog_url IN (SELECT url FROM subtree)",
+                (url, self.run),
+            ).rowcount
+
+    def subtree_digest(self, url: str) -> Optional[str]:
+        """Compute the digest of the subtree of a catalog from its current content in the index.
+
+        The digest only matches the one recorded for the catalog if none of the catalogs and datasets of its subtree
+        were recorded differently since then, such as by a run crawling one of its sub-catalogs alone.
+
+        :return: the digest, or None if a catalog of the subtree is not indexed
+        """
+        with self._lock:
+            refs = {
+                catalog_url: [href for _, href in json.loads(catalog_refs)]
+                for catalog_url, catalog_refs in self._conn.execute(
+                    f"{SUBTREE} SELECT url, refs FROM catalogs WHERE url IN (SELECT url FROM subtree)", (url,)
+                )
+            }
+            rows = self._conn.execute(
+                f"{SUBTREE} SELECT catalog_url, name, size, modified FROM datasets "
+                "WHERE catalog_url IN (SELECT url FROM subtree) ORDER BY catalog_url, name",
+                (url,),
+            ).fetchall()
+        if url not in refs:
+            return None
+        return _digests(refs, rows)[url]
+
+    def update_digests(self) -> None:
+        """Compute the digest of the subtree of every catalog seen by the current run, from the leaves up.
+
+        A catalog referencing a sub-catalog that the run did not see (e.g.: beyond the crawl depth) gets no digest.
+        """
+        with self._lock:
+            refs = {
+                url: [href for _, href in json.loads(refs)]
+                for url, refs in self._conn.execute("SELECT url, refs FROM catalogs WHERE last_seen = ?", (self.run,))
+            }
+            rows = self._conn.execute(
+                "SELECT catalog_url, name, size, modified FROM datasets WHERE last_seen = ? ORDER BY catalog_url, name",
+                (self.run,),
+            ).fetchall()
+        digests = _digests(refs, rows)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE catalogs SET digest = ? WHERE url = ?", [(digest, url) for url, digest in digests.items()]
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Number of indexed catalogs and datasets, and how many of them were seen by the current run."""
+        with self._lock:
+            return {
+                f"{table}{suffix}": self._conn.execute(f"SELECT COUNT(*) FROM {table}{where}", args).fetchone()[0]
+                for table in ["catalogs", "datasets"]
+                for suffix, where, args in [("", "", ()), ("_seen", " WHERE last_seen = ?", (self.run,))]
+            }
+
+    def __enter__(self) -> "CrawlIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.run is not None:
+            self.update_digests()
+            LOGGER.info(f"Crawl index [{self.path}] updated", extra=self.stats())
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,198 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Union
+
+import requests
+from requests.sessions import Session
+from requests.structures import CaseInsensitiveDict
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 1024**3
+
+# headers of the responses kept with their body, to revalidate them and to restore them when they are not modified
+CACHED_HEADERS = ["ETag", "Last-Modified", "Content-Type"]
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    headers: Dict[str, str]
+
+
+class HTTPCache:
+    """
+    On-disk cache of HTTP responses revalidated by conditional requests, stored in a SQLite database.
+
+    Bodies of the responses having an ``ETag`` or ``Last-Modified`` header are kept, and requested again with an
+    ``If-None-Match`` or ``If-Modified-Since`` header respectively. When the server answers that the resource is not
+    modified (304 status), the body is obtained from the cache instead of being transferred again. Responses are
+    always revalidated, so that the cache never serves outdated content.
+
+    The total size of the cached bodies is limited to ``max_size`` bytes, evicting the least recently used ones.
+
+    The cache can be used from multiple threads.
+    """
+
+    def __init__(self, path: Union[os.PathLike[str], str], max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """Constructor
+
+        :param path: path to the SQLite database file, created if missing
+        :type path: Union[os.PathLike[str], str]
+        :param max_size: maximum total size in bytes of the cached bodies
+        :type max_size: int
+        """
+        self.path = path
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT NOT NULL PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_used ON responses (used)")
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        LOGGER.info(f"Using HTTP cache [{path}]", extra={"http_cache_size": self._size})
+
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        """Obtain the cached response of a URL, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_type, body FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        headers = {name: value for name, value in zip(CACHED_HEADERS, row[:3]) if value is not None}
+        return CachedResponse(row[3], headers)
+
+    @staticmethod
+    def conditional_headers(cached: Optional[CachedResponse]) -> Dict[str, str]:
+        """Headers of a request revalidating a cached response."""
+        headers = {}
+        if cached is not None:
+            if "ETag" in cached.headers:
+                headers["If-None-Match"] = cached.headers["ETag"]
+            if "Last-Modified" in cached.headers:
+                headers["If-Modified-Since"] = cached.headers["Last-Modified"]
+        return headers
+
+    def store(self, url: str, headers: Mapping[str, str], body: bytes) -> None:
+        """Cache the body of a successful response, if it can be revalidated, and evict the least recently used ones
+        when the cache exceeds its maximum size."""
+        with self._lock:
+            self.misses += 1
+        headers = CaseInsensitiveDict(headers)
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        if len(body) > self.max_size:
+            return
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, etag, last_modified, content_type, body, size, used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, headers.get("Content-Type"), body, len(body), time.time()),
+            )
+            self._size += len(body) - (previous[0] if previous else 0)
+            if self._size > self.max_size:
+                self._evict()
+
+    def revalidated(self, url: str, cached: CachedResponse, headers: Mapping[str, str]) -> CachedResponse:
+        """Mark a cached response as used after the server reported it unchanged, updating its validators if
+        provided with the 304 response."""
+        headers = CaseInsensitiveDict(headers)
+        updated = dict(cached.headers)
+        for name in ["ETag", "Last-Modified"]:
+            if headers.get(name):
+                updated[name] = headers[name]
+        with self._lock:
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE responses SET etag = ?, last_modified = ?, used = ? WHERE url = ?",
+                (updated.get("ETag"), updated.get("Last-Modified"), time.time(), url),
+            )
+        return CachedResponse(cached.body, updated)
+
+    def _evict(self) -> None:
+        # evict a bit more than needed, to avoid doing it again for every new response
+        target = self.max_size * 0.9
+        rows = self._conn.execute("SELECT url, size FROM responses ORDER BY used").fetchall()
+        evicted = []
+        for url, size in rows:
+            if self._size <= target:
+                break
+            evicted.append((url,))
+            self._size -= size
+        self._conn.executemany("DELETE FROM responses WHERE url = ?", evicted)
+        LOGGER.debug(f"Evicted {len(evicted)} responses from the HTTP cache", extra={"http_cache_size": self._size})
+
+    def get(self, session: Session, url: str, **kwargs: Any) -> requests.Response:
+        """Perform a GET request with the session, revalidating the cached response of the URL if any.
+
+        :return: the response, whose body is obtained from the cache if the server reported it as not modified
+        """
+        cached = self.lookup(url)
+        headers = {**kwargs.pop("headers", {}), **self.conditional_headers(cached)}
+        r = session.get(url, headers=headers, **kwargs)
+        if r.status_code == 304 and cached is not None:
+            cached = self.revalidated(url, cached, r.headers)
+            response = requests.Response()
+            response.status_code = 200
+            response.url = r.url
+            response.headers = CaseInsensitiveDict({**cached.headers, **r.headers})
+            response.headers.pop("Content-Length", None)
+            response._content = cached.body
+            response._content_consumed = True
+            response.request = r.request
+            response.from_cache = True
+            return response
+        if r.status_code == 200:
+            self.store(url, r.headers, r.content)
+        return r
+
+    def __enter__(self) -> "HTTPCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        LOGGER.info(
+            f"HTTP cache served {self.hits} unchanged responses out of {self.hits + self.misses}",
+            extra={"http_cache_hits": self.hits, "http_cache_misses": self.misses},
+        )
+
+
+class CachedSession:
+    """
+    Minimal session performing the GET requests of a :class:`requests.Session` through a :class:`HTTPCache`, such as
+    those of the :class:`STACpopulator.input.THREDDSCatalog`.
+    """
+
+    def __init__(self, session: Session, cache: HTTPCache) -> None:
+        self.session = session
+        self.cache = cache
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.cache.get(self.session, url, **kwargs)
+
+    def close(self) -> None:
+        pass  # the session and the cache are shared with other requests
@@ -1,7 +1,7 @@
 import argparse
-import json
 import logging
 import os
+import threading
 from typing import Any, MutableMapping, NoReturn, Optional, Tuple, Union
 from urllib.parse import urlparse
 
@@ -10,22 +10,38 @@ import netCDF4 as nc
 from marble_client import MarbleClient
 from pystac import STACValidationError
 from pystac.extensions.datacube import DatacubeExtension
+from pystac.validation import JsonSchemaSTACValidator, RegisteredValidator
 from requests.sessions import Session
 
-from STACpopulator.cli import add_request_options, apply_request_options
-from STACpopulator.extensions.cmip6 import CMIP6Helper, CMIP6Properties
+from STACpopulator.cli import (
+    add_ingest_options,
+    add_request_options,
+    add_thredds_options,
+    apply_request_options,
+    ingest_kwargs,
+    open_crawl_index,
+    open_http_cache,
+)
+from STACpopulator.extensions.cmip6 import CMIP6Extension, CMIP6Helper, CMIP6Properties
 from STACpopulator.extensions.datacube import DataCubeHelper
 from STACpopulator.extensions.thredds import THREDDSExtension, THREDDSHelper
 from STACpopulator.input import ErrorLoader, GenericLoader, THREDDSLoader
 from STACpopulator.models import GeoJSONPolygon
 from STACpopulator.populator_base import STACpopulatorBase
+from STACpopulator.timing import stage
 
 LOGGER = logging.getLogger(__name__)
 
+MARBLE_SCHEMA_URI = "https://raw.githubusercontent.com/DACCS-Climate/marble-stac-extension/v1.0.0/json-schema/schema.json"
+
+# The netCDF-C library is not thread-safe, OpenDAP accesses must be serialized when items are ingested concurrently.
+NETCDF_LOCK = threading.Lock()
+
 
 class CMIP6populator(STACpopulatorBase):
     item_properties_model = CMIP6Properties
     item_geometry_model = GeoJSONPolygon
+    summary_properties = ("cmip6:",)
 
     def __init__(
         self,
@@ -37,15 +53,23 @@ class CMIP6populator(STACpopulatorBase):
         config_file: Optional[Union[os.PathLike[str], str]] = None,
         log_debug: Optional[bool] = False,
         add_magpie_item_links: Optional[bool] = False,
+        **kwargs: Any,
     ) -> None:
         """Constructor
 
         :param stac_host: URL to the STAC API
         :type stac_host: str
         :param data_loader: loader to iterate over ingestion data.
+        :param kwargs: additional ingestion options forwarded to :class:`STACpopulatorBase`.
         """
         super().__init__(
-            stac_host, data_loader, update=update, session=session, config_file=config_file, log_debug=log_debug
+            stac_host,
+            data_loader,
+            update=update,
+            session=session,
+            config_file=config_file,
+            log_debug=log_debug,
+            **kwargs,
         )
         self.add_magpie_item_links = add_magpie_item_links
         self._catalog_url = catalog_url
@@ -63,6 +87,14 @@ class CMIP6populator(STACpopulatorBase):
             raise RuntimeError("Could not infer name of the host that contains the data")
         return name
 
+    def initialize_worker(self) -> None:
+        # The CMIP6 controlled vocabulary of pyessv is loaded when importing the extension.
+        # Retrieve the JSON-schemas validating every item once per process rather than for its first item.
+        validator = RegisteredValidator.get_validator()
+        if isinstance(validator, JsonSchemaSTACValidator):
+            for uri in [CMIP6Extension.get_schema_uri(), DatacubeExtension.get_schema_uri(), MARBLE_SCHEMA_URI]:
+                validator.get_schema_from_uri(uri)
+
     def get_item_temporal_information(self, item_opendap_url: str) -> Tuple[str, str, str]:
         """Get the temporal extents (start and end date) by opening the file via its OpenDAP URL.
 
@@ -71,11 +103,11 @@ class CMIP6populator(STACpopulatorBase):
         :return: A tuple of start and end datetimes encoded as strings and the time calendar
         :rtype: Tuple[str, str, str]
         """
-        ncf = nc.Dataset(item_opendap_url, "r")
-        calendar = ncf["time"].calendar
-        units = ncf["time"].units
-        st = cftime.num2date(ncf["time"][0], units, calendar).isoformat() + "Z"
-        ed = cftime.num2date(ncf["time"][-1], units, calendar).isoformat() + "Z"
+        with NETCDF_LOCK, nc.Dataset(item_opendap_url, "r") as ncf:
+            calendar = ncf["time"].calendar
+            units = ncf["time"].units
+            st = cftime.num2date(ncf["time"][0], units, calendar).isoformat() + "Z"
+            ed = cftime.num2date(ncf["time"][-1], units, calendar).isoformat() + "Z"
         return st, ed, calendar
 
     def create_stac_item(
@@ -101,10 +133,12 @@ class CMIP6populator(STACpopulatorBase):
             item_data["attributes"]["version"] = item_loc.strip().split("/")[-2]
 
             # Get the item's start and end date from the item name
-            st, ed, _ = self.get_item_temporal_information(item_data["access_urls"]["OPENDAP"])
+            with stage("temporal_probe"):
+                st, ed, _ = self.get_item_temporal_information(item_data["access_urls"]["OPENDAP"])
 
-            cmip_helper = CMIP6Helper(item_data, self.item_geometry_model, st, ed)
-            item = cmip_helper.stac_item()
+            with stage("build"):
+                cmip_helper = CMIP6Helper(item_data, self.item_geometry_model, st, ed)
+                item = cmip_helper.stac_item()
         except Exception as e:
             raise Exception("Failed to add CMIP6 extension") from e
 
@@ -127,16 +161,16 @@ class CMIP6populator(STACpopulatorBase):
         # Add Marble network extension
         item.properties["marble:host_node"] = self._marble_host_node
         item.properties["marble:is_local"] = True
-        item.stac_extensions.append(
-            "https://raw.githubusercontent.com/DACCS-Climate/marble-stac-extension/v1.0.0/json-schema/schema.json"
-        )
+        item.stac_extensions.append(MARBLE_SCHEMA_URI)
 
         try:
-            item.validate()
+            with stage("validate"):
+                item.validate()
         except STACValidationError:
             raise Exception("Failed to validate STAC item") from e
 
-        return json.loads(json.dumps(item.to_dict()))
+        # serialized only once by the sink, from this dictionary
+        return item.to_dict()
 
 
 def make_parser() -> argparse.ArgumentParser:
@@ -160,16 +194,30 @@ def make_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument("--add-magpie-item-links", action="store_true")
     add_request_options(parser)
+    add_ingest_options(parser)
+    add_thredds_options(parser)
     return parser
 
 
 def runner(ns: argparse.Namespace) -> Optional[int] | NoReturn:
     LOGGER.info(f"Arguments to call: {vars(ns)}")
 
-    with Session() as session:
+    with Session() as session, open_http_cache(ns) as http_cache, open_crawl_index(ns) as crawl_index:
         apply_request_options(session, ns)
         if ns.mode == "full":
-            data_loader = THREDDSLoader(ns.href, session=session)
+            data_loader = THREDDSLoader(
+                ns.href,
+                session=session,
+                async_limit=ns.workers,
+                crawl_workers=ns.crawl_workers,
+                ncml_prefetch=ns.ncml_prefetch,
+                ncml_ordered=ns.ncml_ordered,
+                http_cache=http_cache,
+                crawl_index=crawl_index,
+                from_index=ns.from_index,
+                skip_unchanged_subtrees=ns.skip_unchanged_subtrees,
+                streaming=ns.stream_catalogs,
+            )
         else:
             # To be implemented
             data_loader = ErrorLoader()
@@ -183,6 +231,7 @@ def runner(ns: argparse.Namespace) -> Optional[int] | NoReturn:
             config_file=ns.config,
             log_debug=ns.debug,
             add_magpie_item_links=ns.add_magpie_item_links,
+            **ingest_kwargs(ns),
         )
         c.ingest()
 
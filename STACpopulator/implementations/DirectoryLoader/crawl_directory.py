@@ -5,7 +5,7 @@ from typing import Any, MutableMapping, NoReturn, Optional
 
 from requests.sessions import Session
 
-from STACpopulator.cli import add_request_options, apply_request_options
+from STACpopulator.cli import add_ingest_options, add_request_options, apply_request_options, ingest_kwargs
 from STACpopulator.input import STACDirectoryLoader
 from STACpopulator.models import GeoJSONPolygon
 from STACpopulator.populator_base import STACpopulatorBase
@@ -23,9 +23,10 @@ class DirectoryPopulator(STACpopulatorBase):
         update: bool,
         collection: dict[str, Any],
         session: Optional[Session] = None,
+        **kwargs: Any,
     ) -> None:
         self._collection = collection
-        super().__init__(stac_host, loader, update=update, session=session)
+        super().__init__(stac_host, loader, update=update, session=session, **kwargs)
 
     def load_config(self) -> MutableMapping[str, Any]:
         self._collection_info = self._collection
@@ -52,6 +53,7 @@ def make_parser() -> argparse.ArgumentParser:
         help="Limit search of STAC Collections only to first top-most matches in the crawled directory structure.",
     )
     add_request_options(parser)
+    add_ingest_options(parser)
     return parser
 
 
@@ -63,7 +65,14 @@ def runner(ns: argparse.Namespace) -> Optional[int] | NoReturn:
         for _, collection_path, collection_json in STACDirectoryLoader(ns.directory, "collection", ns.prune):
             collection_dir = os.path.dirname(collection_path)
             loader = STACDirectoryLoader(collection_dir, "item", prune=ns.prune)
-            populator = DirectoryPopulator(ns.stac_host, loader, ns.update, collection_json, session=session)
+            populator = DirectoryPopulator(
+                ns.stac_host,
+                loader,
+                ns.update,
+                collection_json,
+                session=session,
+                **ingest_kwargs(ns),
+            )
             populator.ingest()
 
 
@@ -1,7 +1,7 @@
 import argparse
-import json
 import logging
 import os
+import threading
 from typing import Any, MutableMapping, NoReturn, Optional, Tuple, Union
 from urllib.parse import urlparse
 
@@ -14,16 +14,28 @@ from pystac import STACValidationError
 from pystac.extensions.datacube import DatacubeExtension
 from requests.sessions import Session
 
-from STACpopulator.cli import add_request_options, apply_request_options
+from STACpopulator.cli import (
+    add_ingest_options,
+    add_request_options,
+    add_thredds_options,
+    apply_request_options,
+    ingest_kwargs,
+    open_crawl_index,
+    open_http_cache,
+)
 from STACpopulator.extensions.datacube import DataCubeHelper
 from STACpopulator.extensions.thredds import THREDDSExtension, THREDDSHelper
 from STACpopulator.input import ErrorLoader, GenericLoader, THREDDSLoader
 from STACpopulator.models import GeoJSONPolygon
 from STACpopulator.populator_base import STACpopulatorBase
 from STACpopulator.stac_utils import ncattrs_to_bbox, ncattrs_to_geometry
+from STACpopulator.timing import stage
 
 LOGGER = logging.getLogger(__name__)
 
+# The netCDF-C library is not thread-safe, OpenDAP accesses must be serialized when items are ingested concurrently.
+NETCDF_LOCK = threading.Lock()
+
 
 class NEXGDDPProperties(BaseModel, validate_assignment=True):
     """Data model for NEX GDDP files."""
@@ -48,6 +60,7 @@ class NEXGDDPProperties(BaseModel, validate_assignment=True):
 
 class NEXGDDPCMIP6populator(STACpopulatorBase):
     item_geometry_model = GeoJSONPolygon
+    summary_properties = ("nexgddp:",)
 
     def __init__(
         self,
@@ -59,15 +72,23 @@ class NEXGDDPCMIP6populator(STACpopulatorBase):
         config_file: Optional[Union[os.PathLike[str], str]] = None,
         log_debug: Optional[bool] = False,
         add_magpie_item_links: Optional[bool] = False,
+        **kwargs: Any,
     ) -> None:
         """Constructor
 
         :param stac_host: URL to the STAC API
         :type stac_host: str
         :param data_loader: loader to iterate over ingestion data.
+        :param kwargs: additional ingestion options forwarded to :class:`STACpopulatorBase`.
         """
         super().__init__(
-            stac_host, data_loader, update=update, session=session, config_file=config_file, log_debug=log_debug
+            stac_host,
+            data_loader,
+            update=update,
+            session=session,
+            config_file=config_file,
+            log_debug=log_debug,
+            **kwargs,
         )
         self.add_magpie_item_links = add_magpie_item_links
         self._catalog_url = catalog_url
@@ -93,11 +114,11 @@ class NEXGDDPCMIP6populator(STACpopulatorBase):
         :return: A tuple of start and end datetimes encoded as strings and the time calendar
         :rtype: Tuple[str, str, str]
         """
-        ncf = nc.Dataset(item_opendap_url, "r")
-        calendar = ncf["time"].calendar
-        units = ncf["time"].units
-        st = cftime.num2date(ncf["time"][0], units, calendar).isoformat() + "Z"
-        ed = cftime.num2date(ncf["time"][-1], units, calendar).isoformat() + "Z"
+        with NETCDF_LOCK, nc.Dataset(item_opendap_url, "r") as ncf:
+            calendar = ncf["time"].calendar
+            units = ncf["time"].units
+            st = cftime.num2date(ncf["time"][0], units, calendar).isoformat() + "Z"
+            ed = cftime.num2date(ncf["time"][-1], units, calendar).isoformat() + "Z"
         return st, ed, calendar
 
     def create_stac_item(
@@ -119,20 +140,21 @@ class NEXGDDPCMIP6populator(STACpopulatorBase):
         # Now include the variable id in the item_data["attributes"] fiedd so the pydantic model can pick it up
         item_data["attributes"]["variable_id"] = varid
         # Get the item's start and end date from the item name
-        st, ed, calendar = self.get_item_temporal_information(item_data["access_urls"]["OPENDAP"])
+        with stage("temporal_probe"):
+            st, ed, calendar = self.get_item_temporal_information(item_data["access_urls"]["OPENDAP"])
         item_data["attributes"]["start_datetime"] = st
         item_data["attributes"]["end_datetime"] = ed
         item_data["attributes"]["calendar"] = calendar
-        properties = NEXGDDPProperties(**item_data["attributes"]).model_dump_json(by_alias=True)
-        properties = json.loads(properties)
-
-        item = pystac.Item(
-            id=item_name.strip().split(".")[0],
-            geometry=self.item_geometry_model(**ncattrs_to_geometry(item_data)).model_dump(),
-            bbox=ncattrs_to_bbox(item_data),
-            properties=properties,
-            datetime=None,
-        )
+        with stage("build"):
+            properties = NEXGDDPProperties(**item_data["attributes"]).model_dump(mode="json", by_alias=True)
+
+            item = pystac.Item(
+                id=item_name.strip().split(".")[0],
+                geometry=self.item_geometry_model(**ncattrs_to_geometry(item_data)).model_dump(),
+                bbox=ncattrs_to_bbox(item_data),
+                properties=properties,
+                datetime=None,
+            )
         item.stac_extensions.append(
             "https://raw.githubusercontent.com/DACCS-Climate/nexgddp-stac-extension/v1.0.0/json-schema/schema.json"
         )
@@ -161,12 +183,13 @@ class NEXGDDPCMIP6populator(STACpopulatorBase):
         )
 
         try:
-            item.validate()
+            with stage("validate"):
+                item.validate()
         except STACValidationError:
             raise Exception("Failed to validate STAC item") from e
 
-        return json.loads(json.dumps(item.to_dict()))
-        # return item
+        # serialized only once by the sink, from this dictionary
+        return item.to_dict()
 
 
 def make_parser() -> argparse.ArgumentParser:
@@ -194,16 +217,30 @@ def make_parser() -> argparse.ArgumentParser:
         help="If specified, the item level resource links are added to Magpie.",
     )
     add_request_options(parser)
+    add_ingest_options(parser)
+    add_thredds_options(parser)
     return parser
 
 
 def runner(ns: argparse.Namespace) -> Optional[int] | NoReturn:
     LOGGER.info(f"Arguments to call: {vars(ns)}")
 
-    with Session() as session:
+    with Session() as session, open_http_cache(ns) as http_cache, open_crawl_index(ns) as crawl_index:
         apply_request_options(session, ns)
         if ns.mode == "full":
-            data_loader = THREDDSLoader(ns.href, session=session)
+            data_loader = THREDDSLoader(
+                ns.href,
+                session=session,
+                async_limit=ns.workers,
+                crawl_workers=ns.crawl_workers,
+                ncml_prefetch=ns.ncml_prefetch,
+                ncml_ordered=ns.ncml_ordered,
+                http_cache=http_cache,
+                crawl_index=crawl_index,
+                from_index=ns.from_index,
+                skip_unchanged_subtrees=ns.skip_unchanged_subtrees,
+                streaming=ns.stream_catalogs,
+            )
         else:
             # To be implemented
             data_loader = ErrorLoader()
@@ -217,6 +254,7 @@ def runner(ns: argparse.Namespace) -> Optional[int] | NoReturn:
             config_file=ns.config,
             log_debug=ns.debug,
             add_magpie_item_links=ns.add_magpie_item_links,
+            **ingest_kwargs(ns),
         )
         c.ingest()
 
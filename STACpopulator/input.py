@@ -1,17 +1,60 @@
+import asyncio
+import hashlib
 import json
 import logging
 import os
+import tempfile
+import xml.etree.ElementTree as ET
 from abc import ABC, abstractmethod
-from typing import Any, Iterator, Literal, MutableMapping, Optional, Tuple, Union
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Literal,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import pystac
 import requests
 import siphon
 import xncml
 from requests.sessions import Session
-from siphon.catalog import TDSCatalog, session_manager
-
+from requests.structures import CaseInsensitiveDict
+from siphon.catalog import (
+    CatalogRef,
+    CompoundService,
+    Dataset,
+    SimpleService,
+    TDSCatalog,
+    TDSCatalogMetadata,
+    _find_base_tds_url,
+    session_manager,
+)
+
+from STACpopulator.api_requests import async_request_options, create_async_session
+from STACpopulator.crawl_index import CrawlIndex, IndexedCatalog
+from STACpopulator.http_cache import CachedSession, HTTPCache
+from STACpopulator.metrics import METRICS
+from STACpopulator.retry import arequest, get_retry_policy
 from STACpopulator.stac_utils import numpy_to_python_datatypes, url_validate
+from STACpopulator.timing import stage
+from STACpopulator.transport import get_session
+
+if TYPE_CHECKING:
+    import aiohttp
 
 LOGGER = logging.getLogger(__name__)
 
@@ -19,6 +62,26 @@ LOGGER = logging.getLogger(__name__)
 class GenericLoader(ABC):
     def __init__(self) -> None:
         self.links = []
+        # Optional predicate called with the name, location and source fingerprint of each item before its data is
+        # loaded. Items for which it returns False are skipped by the loaders that support it.
+        self.item_filter: Optional[Callable[[str, str, Optional[str]], bool]] = None
+
+    def accept_item(self, item_name: str, item_loc: str, fingerprint: Optional[str] = None) -> bool:
+        """Check whether an item should be loaded according to the :attr:`item_filter`.
+
+        :param fingerprint: value that changes whenever the source data of the item changes, if known by the loader
+          without loading the data (e.g.: modification date and size).
+        """
+        return self.item_filter is None or self.item_filter(item_name, item_loc, fingerprint)
+
+    def estimate_total(self) -> Optional[int]:
+        """Estimate the total number of items of the loader, including those skipped by the :attr:`item_filter`.
+
+        The estimate can be refined as the loader is iterated. It may be requested from another thread.
+
+        :return: estimated number of items, or None if unknown
+        """
+        return None
 
     @abstractmethod
     def __iter__(self):
@@ -33,6 +96,18 @@ class GenericLoader(ABC):
         """Reset the internal state of the generator."""
         raise NotImplementedError
 
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        """
+        Asynchronous counterpart of :meth:`__iter__`.
+
+        By default, the synchronous generator is consumed from a worker thread to avoid blocking the event loop.
+        Loaders that perform requests should override this method to perform them as coroutines.
+        """
+        iterator = iter(self)
+        done = object()
+        while (item := await asyncio.to_thread(next, iterator, done)) is not done:
+            yield item
+
 
 class ErrorLoader(GenericLoader):
     def __init__(self):  # noqa
@@ -55,8 +130,18 @@ class THREDDSCatalog(TDSCatalog):
 
     def __init__(self, catalog_url: str, session: Optional[Session] = None) -> None:
         self._session = session
+        self._shared_session = session is not None
         super().__init__(catalog_url)
 
+    def __del__(self) -> None:
+        # only close a session created by this catalog, not one shared with other requests
+        if not self._shared_session and self._session is not None:
+            self._session.close()
+
+    def _process_dataset(self, element) -> None:
+        super()._process_dataset(element)
+        _parse_dataset_details(self.datasets[element.attrib["name"]], element)
+
     @property
     def session(self) -> Session:
         if self._session is None:
@@ -67,6 +152,143 @@ class THREDDSCatalog(TDSCatalog):
     def session(self, session: Session) -> None:
         pass  # ignore to bypass TDSCatalog.__init__ enforcing create_session !
 
+    @classmethod
+    def from_response(cls, response: requests.Response) -> "THREDDSCatalog":
+        """Parse a catalog from an already obtained response, such as one retrieved asynchronously."""
+        return cls(response.url, session=_ResponseSession(response))
+
+
+def _parse_dataset_details(ds: Dataset, element: ET.Element) -> None:
+    # keep the modification date and size of the dataset, which are not parsed by siphon
+    ds.modified = None
+    ds.size = None
+    for child in element:
+        tag_type = child.tag.split("}")[-1]
+        if tag_type == "date" and child.attrib.get("type") == "modified":
+            ds.modified = (child.text or "").strip()
+        elif tag_type == "dataSize":
+            ds.size = f"{(child.text or '').strip()} {child.attrib.get('units', '')}".strip()
+
+
+class THREDDSCatalogReader:
+    """
+    Streaming reader of a THREDDS catalog, yielding its datasets and references to sub-catalogs as they are parsed.
+
+    Unlike :class:`THREDDSCatalog`, which builds all the datasets of the document before any of them is available,
+    the document is parsed incrementally and every element is released once processed, so that the memory employed
+    does not depend on the number of datasets listed by the catalog. The document is first downloaded to a temporary
+    file (kept in memory up to ``spool_size`` bytes), so that the connection is not left idle, and possibly closed by
+    the server, while the consumer processes the datasets.
+    Datasets are described as by :class:`THREDDSCatalog`, except that their access URLs are resolved from the services
+    and metadata that precede them in the document, which is where THREDDS servers write them.
+    """
+
+    def __init__(
+        self,
+        catalog_url: str,
+        session: Optional[Session] = None,
+        chunk_size: int = 64 * 1024,
+        spool_size: int = 1024 * 1024,
+    ) -> None:
+        """Constructor
+
+        :param catalog_url: the URL to the THREDDS catalog to read
+        :type catalog_url: str
+        :param session: Session with additional configuration to perform requests.
+        :param chunk_size: Number of bytes of the document received and parsed at once.
+        :type chunk_size: int
+        :param spool_size: Size in bytes of the documents kept in memory rather than in a temporary file.
+        :type spool_size: int
+        """
+        self.catalog_url = catalog_url
+        self.session = session or session_manager.create_session()
+        self.chunk_size = chunk_size
+        self.spool_size = spool_size
+        self.catalog_name: Optional[str] = None
+        self.services: List[SimpleService] = []
+        self.metadata: Dict[str, Any] = {}
+
+    def __iter__(self) -> Iterator[Union[Dataset, CatalogRef]]:
+        """Request and parse the catalog.
+
+        :yield: the datasets of the catalog, having access URLs, and its references to sub-catalogs, in document order
+        :rtype: Iterator[Union[Dataset, CatalogRef]]
+        """
+        with tempfile.SpooledTemporaryFile(max_size=self.spool_size) as body:
+            self._download(body)
+            parser = ET.XMLPullParser(events=("start", "end"))
+            parents: List[ET.Element] = []
+            while chunk := body.read(self.chunk_size):
+                parser.feed(chunk)
+                yield from self._process(parser.read_events(), parents)
+            parser.close()
+            yield from self._process(parser.read_events(), parents)
+
+    def _download(self, body: IO[bytes]) -> None:
+        """Write the whole document to a file, closing the response before it is parsed."""
+        with stage("catalog") as timer, self.session.get(self.catalog_url, stream=True) as r:
+            r.raise_for_status()
+            self.catalog_url = r.url
+            for chunk in r.iter_content(self.chunk_size):
+                body.write(chunk)
+                timer.bytes += len(chunk)
+        body.seek(0)
+
+    def _process(
+        self, events: Iterator[Tuple[str, ET.Element]], parents: List[ET.Element]
+    ) -> Iterator[Union[Dataset, CatalogRef]]:
+        for event, element in events:
+            if event == "start":
+                if not parents:
+                    self.catalog_name = element.attrib.get("name", "No name found")
+                parents.append(element)
+                continue
+            parents.pop()
+            tag_type = element.tag.split("}")[-1]
+            if tag_type == "dataset":
+                ds = self._make_dataset(element)
+                if ds is not None:
+                    yield ds
+            elif tag_type == "catalogRef":
+                yield CatalogRef(self.catalog_url, element)
+            elif tag_type == "metadata":
+                self.metadata = TDSCatalogMetadata(element, self.metadata).metadata
+            elif tag_type == "service" and len(parents) == 1:
+                service_type = element.attrib["serviceType"].lower()
+                self.services.append(CompoundService(element) if service_type == "compound" else SimpleService(element))
+            else:
+                continue
+            # release the processed element, whose content is not needed anymore
+            if parents:
+                parents[-1].remove(element)
+
+    def _make_dataset(self, element: ET.Element) -> Optional[Dataset]:
+        catalog_url = self.catalog_url if element.attrib.get("urlPath") == "latest.xml" else ""
+        ds = Dataset(element, catalog_url=catalog_url)
+        for child in element:
+            if child.tag.split("}")[-1] == "access":
+                ds.add_access_element_info(child)
+        if ds.url_path is None and not ds.access_element_info:
+            return None
+        ds.make_access_urls(_find_base_tds_url(self.catalog_url), self.services, metadata=self.metadata)
+        _parse_dataset_details(ds, element)
+        return ds
+
+
+class _ResponseSession:
+    """
+    Minimal session that returns a prefetched response, used to parse a :class:`THREDDSCatalog` without a request.
+    """
+
+    def __init__(self, response: requests.Response) -> None:
+        self._response = response
+
+    def get(self, url: str, **__: Any) -> requests.Response:
+        return self._response
+
+    def close(self) -> None:
+        pass
+
 
 class THREDDSLoader(GenericLoader):
     def __init__(
@@ -74,6 +296,15 @@ class THREDDSLoader(GenericLoader):
         thredds_catalog_url: str,
         depth: Optional[int] = None,
         session: Optional[Session] = None,
+        async_limit: int = 100,
+        crawl_workers: int = 1,
+        ncml_prefetch: int = 0,
+        ncml_ordered: bool = True,
+        http_cache: Optional[HTTPCache] = None,
+        crawl_index: Optional[CrawlIndex] = None,
+        from_index: bool = False,
+        skip_unchanged_subtrees: bool = False,
+        streaming: bool = False,
     ) -> None:
         """Constructor
 
@@ -82,15 +313,72 @@ class THREDDSLoader(GenericLoader):
         :param depth: Maximum recursive depth for the class's generator. Setting 0 will return only datasets within the
           top-level catalog. If None, depth is set to 1000, defaults to None
         :type depth: int, optional
+        :param session: Session with additional configuration to perform requests.
+        :param async_limit: Maximum number of simultaneous requests when the loader is iterated asynchronously.
+        :type async_limit: int
+        :param crawl_workers: Number of sub-catalogs requested concurrently when the loader is iterated synchronously.
+          With more than one, the catalogs are crawled breadth-first (see :meth:`crawl_catalogs`).
+        :type crawl_workers: int
+        :param ncml_prefetch: Number of NcML descriptions of the upcoming datasets requested and parsed concurrently
+          when the loader is iterated synchronously. If 0, each one is requested when its item is consumed.
+        :type ncml_prefetch: int
+        :param ncml_ordered: Whether prefetched items are yielded in the order of the datasets, or as soon as their NcML
+          description is loaded otherwise.
+        :type ncml_ordered: bool
+        :param http_cache: Cache of the catalogs and NcML descriptions, requested again only if they were modified
+          since they were cached.
+        :type http_cache: HTTPCache, optional
+        :param crawl_index: Index where the crawled catalogs and datasets are recorded. Catalogs already indexed are
+          requested conditionally, and rebuilt from the index if they were not modified since.
+        :type crawl_index: CrawlIndex, optional
+        :param from_index: Walk the catalogs recorded in the ``crawl_index`` instead of requesting them, only the NcML
+          descriptions of the datasets being requested.
+        :type from_index: bool
+        :param skip_unchanged_subtrees: Rebuild the whole subtree of a catalog from the ``crawl_index`` without
+          requesting its sub-catalogs if the catalog is not modified since the previous run, its subtree was fully
+          crawled then (i.e.: it has a digest), and the digest of the subtree recomputed from the index still matches.
+          Changes of the sub-catalogs are only found once the catalog changes.
+        :type skip_unchanged_subtrees: bool
+        :param streaming: Read the catalogs with a :class:`THREDDSCatalogReader` when the loader is iterated
+          sequentially, yielding their datasets as they are parsed with a memory independent of the size of the
+          catalogs. Other modes of iteration parse every catalog fully. Cannot be combined with a ``http_cache`` or a
+          ``crawl_index``, which need the whole content of the catalogs.
+        :type streaming: bool
         """
         super().__init__()
         self._max_depth = depth if depth is not None else 1000
-        self._depth = 0
+        self._session = get_session(session)
+        self.http_cache = http_cache
+        # session of the catalog and NcML requests, whose responses are revalidated against the cache if any
+        self._catalog_session = CachedSession(self._session, http_cache) if http_cache is not None else self._session
+        self.async_limit = async_limit
+        self.crawl_workers = crawl_workers
+        self.ncml_prefetch = ncml_prefetch
+        self.ncml_ordered = ncml_ordered
+        self._catalogs_found = 1
+        self._catalogs_loaded = 0
+        self._datasets_found = 0
+
+        self.crawl_index = crawl_index
+        self.from_index = from_index
+        self.skip_unchanged_subtrees = skip_unchanged_subtrees
+        self.streaming = streaming
 
         self.thredds_catalog_URL = self.validate_catalog_url(thredds_catalog_url)
 
-        self.catalog = TDSCatalog(self.thredds_catalog_URL)
-        self.catalog_head = self.catalog
+        if (from_index or skip_unchanged_subtrees) and crawl_index is None:
+            raise ValueError("Walking the catalogs from the index requires a crawl index")
+        if streaming and crawl_index is not None:
+            raise ValueError("Streaming the catalogs is not supported with a crawl index")
+        if streaming and http_cache is not None:
+            raise ValueError("Streaming the catalogs is not supported with a HTTP cache")
+        if from_index:
+            if crawl_index.catalog(self.thredds_catalog_URL) is None:
+                raise RuntimeError(f"Catalog [{self.thredds_catalog_URL}] was not recorded in the crawl index")
+        elif crawl_index is not None:
+            crawl_index.start_run(self.thredds_catalog_URL)
+        # a streamed top-level catalog is only read when iterating, and loaded fully by the other modes if needed
+        self.catalog = None if streaming else self._fetch_catalog(self.thredds_catalog_URL)
         self.links.append(self.magpie_collection_link())
 
     def validate_catalog_url(self, url: str) -> str:
@@ -126,7 +414,25 @@ class THREDDSLoader(GenericLoader):
 
     def reset(self):
         """Reset the generator."""
-        self.catalog_head = self.catalog
+        self._catalogs_found = 1
+        self._catalogs_loaded = 0
+        self._datasets_found = 0
+
+    def _count_catalog(self, catalog: TDSCatalog, followed_refs: int) -> None:
+        self._catalogs_loaded += 1
+        self._catalogs_found += followed_refs
+        self._datasets_found += len(catalog.datasets)
+
+    def estimate_total(self) -> Optional[int]:
+        """Estimate the number of datasets from those of the catalogs loaded so far.
+
+        Catalogs referenced but not loaded yet are assumed to contain as many datasets as the average loaded catalog.
+        """
+        loaded = self._catalogs_loaded
+        if not loaded:
+            return None
+        datasets = self._datasets_found
+        return datasets + round((self._catalogs_found - loaded) * datasets / loaded)
 
     def __iter__(self) -> Iterator[Tuple[str, str, MutableMapping[str, Any]]]:
         """Return a generator walking a THREDDS data catalog for datasets.
@@ -134,36 +440,366 @@ class THREDDSLoader(GenericLoader):
         :yield: Returns three quantities: name of the item, location of the item, and its attributes
         :rtype: Iterator[Tuple[str, str, MutableMapping[str, Any]]]
         """
+        if self.ncml_prefetch > 0:
+            yield from self._prefetch(self._datasets())
+            return
+        for item_name, url, ds in self._datasets():
+            attrs = self.extract_metadata(ds)
+            yield item_name, url, attrs
+
+    def _datasets(self) -> Iterator[Tuple[str, str, siphon.catalog.Dataset]]:
+        """Walk the catalogs for the datasets accepted by the item filter, without loading their metadata.
 
-        if self._depth > self._max_depth:
+        Catalogs are walked depth-first from an explicit stack, which only holds the URLs of the catalogs remaining to
+        be visited, every catalog being released once its datasets are yielded.
+        """
+        if self.crawl_workers > 1:
+            for catalog in self.crawl_catalogs():
+                yield from self._catalog_items(catalog)
             return
 
-        if self.catalog_head.datasets.items():
-            for item_name, ds in self.catalog_head.datasets.items():
-                attrs = self.extract_metadata(ds)
-                filename = ds.url_path[ds.url_path.rfind("/") :]
-                url = self.catalog_head.catalog_url[: self.catalog_head.catalog_url.rfind("/")] + filename
-                yield item_name, url, attrs
+        visited = {self.thredds_catalog_URL}
+        stack: List[Tuple[str, int]] = [(self.thredds_catalog_URL, 0)]
+        while stack:
+            url, depth = stack.pop()
+            walk = self._stream_catalog if self.streaming else self._walk_catalog
+            refs = yield from walk(url, depth, visited)
+            stack.extend((href, depth + 1) for href in reversed(refs))
+
+    def _walk_catalog(
+        self, url: str, depth: int, visited: Set[str]
+    ) -> Generator[Tuple[str, str, siphon.catalog.Dataset], None, List[str]]:
+        """Yield the datasets of a catalog and return the URLs of the sub-catalogs to visit next."""
+        if url == self.thredds_catalog_URL and self.catalog is not None:
+            catalog = self.catalog
+        else:
+            catalog = self._fetch_catalog(url)
+        refs = self._follow_refs([ref.href for ref in catalog.catalog_refs.values()], depth, visited)
+        self._count_catalog(catalog, len(refs))
+        yield from self._catalog_items(catalog)
+        return refs
+
+    def _stream_catalog(
+        self, url: str, depth: int, visited: Set[str]
+    ) -> Generator[Tuple[str, str, siphon.catalog.Dataset], None, List[str]]:
+        """Yield the datasets of a catalog as they are parsed by a :class:`THREDDSCatalogReader`, and return the URLs
+        of the sub-catalogs to visit next."""
+        reader = THREDDSCatalogReader(url, session=self._catalog_session)
+        refs = []
+        for entry in reader:
+            if isinstance(entry, CatalogRef):
+                refs.append(entry.href)
+                continue
+            self._datasets_found += 1
+            item = self._dataset_item(reader.catalog_url, entry.name, entry)
+            if item is not None:
+                yield item
+        refs = self._follow_refs(refs, depth, visited)
+        self._catalogs_loaded += 1
+        self._catalogs_found += len(refs)
+        return refs
+
+    def _follow_refs(self, refs: List[str], depth: int, visited: Set[str]) -> List[str]:
+        """Select the sub-catalogs of a catalog at some depth to visit, marking them as visited.
+
+        References beyond the maximum depth are not followed, nor those to catalogs already visited, such as catalogs
+        referenced by several others or by their own sub-catalogs.
+        """
+        if depth >= self._max_depth:
+            return []
+        followed = []
+        for href in refs:
+            if href in visited:
+                LOGGER.debug(f"Catalog [{href}] was already visited, skipping it")
+                continue
+            visited.add(href)
+            followed.append(href)
+        return followed
+
+    def _prefetch(
+        self, datasets: Iterator[Tuple[str, str, siphon.catalog.Dataset]]
+    ) -> Iterator[Tuple[str, str, MutableMapping[str, Any]]]:
+        """Load the metadata of the datasets by a pool of threads, with up to ``ncml_prefetch`` of them in advance.
 
-        for name, ref in self.catalog_head.catalog_refs.items():
-            self.catalog_head = ref.follow()
-            self._depth -= 1
-            yield from self
-            self._depth += 1
+        Results are yielded as soon as they are available: in the order of the datasets if ``ncml_ordered``, or in the
+        order in which they are loaded otherwise. The window bounds the number of loaded items waiting to be consumed.
+        """
+        window = self.ncml_prefetch
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=window, thread_name_prefix="ncml") as executor:
+            try:
+                for item_name, url, ds in datasets:
+                    pending.append(executor.submit(self._load_item, item_name, url, ds))
+                    METRICS.set_queue_depth("ncml_prefetch", len(pending))
+                    while pending and (len(pending) >= window or self._prefetched(pending) is not None):
+                        yield self._pop_prefetched(pending)
+                while pending:
+                    METRICS.set_queue_depth("ncml_prefetch", len(pending))
+                    yield self._pop_prefetched(pending)
+            finally:
+                for future in pending:
+                    future.cancel()
+                METRICS.set_queue_depth("ncml_prefetch", 0)
+
+    def _prefetched(self, pending: Deque[Future]) -> Optional[Future]:
+        """Obtain the next completed item that can be yielded, if any."""
+        if self.ncml_ordered:
+            return pending[0] if pending[0].done() else None
+        return next((future for future in pending if future.done()), None)
+
+    def _pop_prefetched(self, pending: Deque[Future]) -> Tuple[str, str, MutableMapping[str, Any]]:
+        """Wait for the next item that can be yielded, and remove it from the pending ones."""
+        future = self._prefetched(pending)
+        if future is None:
+            if self.ncml_ordered:
+                future = pending[0]
+            else:
+                wait(pending, return_when=FIRST_COMPLETED)
+                future = self._prefetched(pending)
+        pending.remove(future)
+        return future.result()
+
+    def _load_item(
+        self, item_name: str, url: str, ds: siphon.catalog.Dataset
+    ) -> Tuple[str, str, MutableMapping[str, Any]]:
+        return item_name, url, self.extract_metadata(ds)
+
+    def crawl_catalogs(self) -> Iterator[TDSCatalog]:
+        """Walk the catalogs breadth-first, requesting up to ``crawl_workers`` sub-catalogs concurrently.
+
+        References to sub-catalogs are queued in a frontier as their parent catalog is loaded, down to the maximum
+        depth. Catalogs are yielded as soon as they are loaded, in the order in which their requests complete, and the
+        requests of the next catalogs of the frontier are already in flight while a catalog is being processed.
+
+        :yield: the loaded catalogs, starting with the top-level one
+        :rtype: Iterator[TDSCatalog]
+        """
+        visited = {self.thredds_catalog_URL}
+        frontier: Deque[Tuple[str, int]] = deque()
+        pending: Dict[Future, int] = {}
+        loaded: List[Tuple[TDSCatalog, int]] = [(self.catalog or self._fetch_catalog(self.thredds_catalog_URL), 0)]
+        with ThreadPoolExecutor(max_workers=self.crawl_workers, thread_name_prefix="crawl") as executor:
+            try:
+                while loaded:
+                    for catalog, depth in loaded:
+                        refs = self._follow_refs([ref.href for ref in catalog.catalog_refs.values()], depth, visited)
+                        self._count_catalog(catalog, len(refs))
+                        frontier.extend((href, depth + 1) for href in refs)
+                        while frontier and len(pending) < self.crawl_workers:
+                            href, ref_depth = frontier.popleft()
+                            pending[executor.submit(self._fetch_catalog, href)] = ref_depth
+                        METRICS.set_queue_depth("crawl_frontier", len(frontier))
+                        yield catalog
+                    loaded = []
+                    if pending:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        loaded = [(future.result(), pending.pop(future)) for future in done]
+            finally:
+                for future in pending:
+                    future.cancel()
+                METRICS.set_queue_depth("crawl_frontier", 0)
+
+    def _fetch_catalog(self, url: str) -> Union[THREDDSCatalog, IndexedCatalog]:
+        """Load a catalog, from the crawl index if it is not modified since it was recorded."""
+        with stage("catalog"):
+            if self.crawl_index is None:
+                return THREDDSCatalog(url, session=self._catalog_session)
+            indexed = self.crawl_index.catalog(url)
+            # catalogs already seen by this run were either loaded before or part of an unchanged subtree
+            if indexed is not None and (self.from_index or indexed.last_seen == self.crawl_index.run):
+                return indexed
+            if self.from_index:
+                return self._missing_catalog(url)
+            r = self._catalog_session.get(url, headers=indexed.validators if indexed else {})
+            if r.status_code != 304:
+                r.raise_for_status()
+            return self._index_catalog(url, indexed, r)
+
+    def _index_catalog(
+        self, url: str, indexed: Optional[IndexedCatalog], response: requests.Response
+    ) -> Union[THREDDSCatalog, IndexedCatalog]:
+        """Rebuild a catalog from the crawl index if its response is unchanged, or parse and record it otherwise."""
+        content_hash = hashlib.sha256(response.content).hexdigest() if response.status_code != 304 else None
+        if indexed is not None and (response.status_code == 304 or content_hash == indexed.content_hash):
+            self.crawl_index.touch_catalog(url, response.headers)
+            if self.skip_unchanged_subtrees and indexed.digest is not None:
+                if self.crawl_index.subtree_digest(url) == indexed.digest:
+                    datasets = self.crawl_index.touch_subtree(url)
+                    LOGGER.info(f"Catalog [{url}] is unchanged, reusing its subtree of {datasets} indexed datasets")
+                else:
+                    LOGGER.info(f"Catalog [{url}] is unchanged, but its indexed subtree changed since, crawling it")
+            return indexed
+        catalog = THREDDSCatalog.from_response(response)
+        self.crawl_index.record_catalog(url, catalog, response.headers, content_hash)
+        return catalog
+
+    @staticmethod
+    def _missing_catalog(url: str) -> IndexedCatalog:
+        LOGGER.warning(f"Catalog [{url}] was not recorded in the crawl index, skipping it")
+        return IndexedCatalog(url, url, [], [])
+
+    def _catalog_items(self, catalog: TDSCatalog) -> Iterator[Tuple[str, str, siphon.catalog.Dataset]]:
+        """Obtain the name, location and description of the datasets of a catalog accepted by the item filter."""
+        for item_name, ds in catalog.datasets.items():
+            item = self._dataset_item(catalog.catalog_url, item_name, ds)
+            if item is not None:
+                yield item
+
+    def _dataset_item(
+        self, catalog_url: str, item_name: str, ds: siphon.catalog.Dataset
+    ) -> Optional[Tuple[str, str, siphon.catalog.Dataset]]:
+        url = catalog_url[: catalog_url.rfind("/")] + ds.url_path[ds.url_path.rfind("/") :]
+        if self.accept_item(item_name, url, self.dataset_fingerprint(ds)):
+            return item_name, url, ds
+        return None
 
     def __getitem__(self, dataset):
         return self.catalog.datasets[dataset]
 
+    @staticmethod
+    def dataset_fingerprint(ds: siphon.catalog.Dataset) -> Optional[str]:
+        """Fingerprint of a dataset from the modification date and size reported by the catalog, if any."""
+        modified = getattr(ds, "modified", None)
+        size = getattr(ds, "size", None)
+        if not modified and not size:
+            return None
+        return f"{modified}|{size}"
+
     def extract_metadata(self, ds: siphon.catalog.Dataset) -> MutableMapping[str, Any]:
         LOGGER.info("Requesting NcML dataset description")
         url = ds.access_urls["NCML"]
-        r = requests.get(url)
-        # Convert NcML to CF-compliant dictionary
-        attrs = xncml.Dataset.from_text(r.text).to_cf_dict()
+        with stage("ncml") as timer:
+            r = self._catalog_session.get(url)
+            timer.bytes = len(r.content)
+        with stage("ncml_parse"):
+            return self.parse_metadata(r.text, ds)
+
+    @staticmethod
+    def parse_metadata(ncml: str, ds: siphon.catalog.Dataset) -> MutableMapping[str, Any]:
+        """Convert the NcML description of a dataset to a CF-compliant dictionary including its access URLs."""
+        attrs = xncml.Dataset.from_text(ncml).to_cf_dict()
         attrs["attributes"] = numpy_to_python_datatypes(attrs["attributes"])
         attrs["access_urls"] = ds.access_urls
         return attrs
 
+    async def __aiter__(self) -> AsyncIterator[Tuple[str, str, MutableMapping[str, Any]]]:
+        """Asynchronous counterpart of :meth:`__iter__`.
+
+        Sub-catalogs and NcML descriptions are requested concurrently, with at most ``async_limit`` requests in flight.
+        Items are yielded in the same order as the synchronous generator.
+
+        :yield: Returns three quantities: name of the item, location of the item, and its attributes
+        :rtype: AsyncIterator[Tuple[str, str, MutableMapping[str, Any]]]
+        """
+        window: Deque[asyncio.Task] = deque()
+        try:
+            async with create_async_session(self._session, limit=self.async_limit) as async_session:
+                async for catalog in self._acatalogs(async_session):
+                    for item_name, url, ds in self._catalog_items(catalog):
+                        window.append(asyncio.create_task(self._aitem(async_session, item_name, url, ds)))
+                        METRICS.set_queue_depth("loader_window", len(window))
+                        if len(window) >= self.async_limit:
+                            yield await window.popleft()
+                    del catalog  # only its datasets are kept by the queued requests
+                while window:
+                    METRICS.set_queue_depth("loader_window", len(window))
+                    yield await window.popleft()
+                METRICS.set_queue_depth("loader_window", 0)
+        finally:
+            for task in window:
+                task.cancel()
+
+    async def _acatalogs(self, async_session: "aiohttp.ClientSession") -> AsyncIterator[TDSCatalog]:
+        """Walk the catalogs depth-first, prefetching the next ones to visit.
+
+        Only the URLs of the catalogs to visit are kept, at most ``async_limit`` of the next ones being requested
+        concurrently, so that the walk holds a bounded number of loaded catalogs whatever the size of the tree.
+        """
+        stack: List[Tuple[str, int]] = [(self.thredds_catalog_URL, 0)]
+        visited = {self.thredds_catalog_URL}
+        prefetched: Dict[str, asyncio.Task] = {}
+        try:
+            while stack:
+                url, depth = stack.pop()
+                if url == self.thredds_catalog_URL and self.catalog is not None:
+                    catalog = self.catalog
+                elif url in prefetched:
+                    catalog = await prefetched.pop(url)
+                else:
+                    catalog = await self._afetch_catalog(async_session, url)
+                refs = self._follow_refs([ref.href for ref in catalog.catalog_refs.values()], depth, visited)
+                self._count_catalog(catalog, len(refs))
+                stack.extend((href, depth + 1) for href in reversed(refs))
+                # request the catalogs on top of the stack while the items of this one are processed
+                for href, _ in reversed(stack[-self.async_limit :]):
+                    if len(prefetched) >= self.async_limit:
+                        break
+                    if href not in prefetched:
+                        prefetched[href] = asyncio.create_task(self._afetch_catalog(async_session, href))
+                yield catalog
+                del catalog
+        finally:
+            for task in prefetched.values():
+                task.cancel()
+
+    async def _afetch_catalog(
+        self, async_session: "aiohttp.ClientSession", url: str
+    ) -> Union[THREDDSCatalog, IndexedCatalog]:
+        indexed = None
+        if self.crawl_index is not None:
+            indexed = await asyncio.to_thread(self.crawl_index.catalog, url)
+            if indexed is not None and (self.from_index or indexed.last_seen == self.crawl_index.run):
+                return indexed
+            if self.from_index:
+                return self._missing_catalog(url)
+        with stage("catalog") as timer:
+            response = await self._aget(async_session, url, indexed.validators if indexed else None)
+            timer.bytes = len(response.content)
+            if self.crawl_index is None:
+                return await asyncio.to_thread(THREDDSCatalog.from_response, response)
+            return await asyncio.to_thread(self._index_catalog, url, indexed, response)
+
+    async def _aitem(
+        self, async_session: "aiohttp.ClientSession", item_name: str, url: str, ds: siphon.catalog.Dataset
+    ) -> Tuple[str, str, MutableMapping[str, Any]]:
+        LOGGER.info("Requesting NcML dataset description")
+        ncml_url = ds.access_urls["NCML"]
+        with stage("ncml") as timer:
+            response = await self._aget(async_session, ncml_url)
+            ncml = response.content.decode(response.encoding or "utf-8")
+            timer.bytes = len(response.content)
+        with stage("ncml_parse"):
+            attrs = await asyncio.to_thread(self.parse_metadata, ncml, ds)
+        return item_name, url, attrs
+
+    async def _aget(
+        self, async_session: "aiohttp.ClientSession", url: str, headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """Request a catalog or NcML description, revalidating its cached response if any."""
+        options = async_request_options(self._session, "GET", url)
+        options["headers"].update(headers or {})
+        cached = None
+        if self.http_cache is not None:
+            cached = await asyncio.to_thread(self.http_cache.lookup, url)
+            options["headers"].update(self.http_cache.conditional_headers(cached))
+        resp = await arequest(async_session, "GET", url, get_retry_policy(self._session), **options)
+        resp.raise_for_status()
+        response = requests.Response()
+        response.status_code = resp.status
+        response.url = str(resp.url)
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response.encoding = resp.charset
+        if resp.status == 304 and cached is not None:
+            cached = await asyncio.to_thread(self.http_cache.revalidated, url, cached, response.headers)
+            response.status_code = 200
+            response.headers = CaseInsensitiveDict({**cached.headers, **response.headers})
+            response._content = cached.body
+            return response
+        response._content = await resp.read()
+        if self.http_cache is not None and resp.status == 200:
+            await asyncio.to_thread(self.http_cache.store, url, response.headers, response._content)
+        return response
+
 
 class STACDirectoryLoader(GenericLoader):
     """
@@ -192,6 +828,7 @@ class STACDirectoryLoader(GenericLoader):
         self.path = path
         self.iter = None
         self.prune = prune
+        self._total: Optional[int] = None
         self.reset()
         self._collection_mode = mode == "collection"
         self._collection_name = "collection.json"
@@ -203,15 +840,25 @@ class STACDirectoryLoader(GenericLoader):
         :rtype: Iterator[Tuple[str, str, MutableMapping[str, Any]]]
         """
 
+        for path in self._walk(self.iter):
+            if self._collection_mode:
+                yield self._collection_name, path, self._load_json(path)
+                continue
+            stat = os.stat(path)
+            fingerprint = f"{stat.st_mtime_ns}|{stat.st_size}"
+            if self.accept_item(self._collection_name, path, fingerprint):
+                yield self._collection_name, path, self._load_json(path)
+
+    def _walk(self, walk: Iterator[Tuple[str, List[str], List[str]]]) -> Iterator[str]:
+        """Filter the paths of the collections or items found by a directory walk."""
         is_root = True
-        for root, dirs, files in self.iter:
+        for root, dirs, files in walk:
             # since there can ever be only one 'collection' file name in a same directory
             # directly retrieve it instead of looping through all other files
             if self._collection_mode and self._collection_name in files:
                 if self.prune:  # stop recursive search if requested
                     del dirs[:]
-                col_path = os.path.join(root, self._collection_name)
-                yield self._collection_name, col_path, self._load_json(col_path)
+                yield os.path.join(root, self._collection_name)
             # if a collection is found deeper when not expected for items parsing
             # drop the nested directories to avoid over-crawling nested collections
             elif not self._collection_mode and not is_root and self._collection_name in files:
@@ -220,15 +867,21 @@ class STACDirectoryLoader(GenericLoader):
             is_root = False  # for next loop
             for name in files:
                 if not self._collection_mode and self._is_item(name):
-                    item_path = os.path.join(root, name)
-                    yield self._collection_name, item_path, self._load_json(item_path)
+                    yield os.path.join(root, name)
+
+    def estimate_total(self) -> Optional[int]:
+        """Count the files to be loaded with a separate walk of the directory, performed once."""
+        if self._total is None:
+            self._total = sum(1 for _ in self._walk(os.walk(self.path)))
+        return self._total
 
     def _is_item(self, path: Union[os.PathLike[str], str]) -> bool:
         name = os.path.split(path)[-1]
         return name != self._collection_name and os.path.splitext(name)[-1] in [".json", ".geojson"]
 
     def _load_json(self, path: Union[os.PathLike[str], str]) -> MutableMapping[str, Any]:
-        with open(path, mode="r", encoding="utf-8") as file:
+        with stage("read") as timer, open(path, mode="r", encoding="utf-8") as file:
+            timer.bytes = os.fstat(file.fileno()).st_size
             return json.load(file)
 
     def reset(self):
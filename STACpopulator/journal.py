@@ -0,0 +1,139 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Literal, Optional, Tuple, Union
+
+LOGGER = logging.getLogger(__name__)
+
+ItemStatus = Literal["posted", "create_failed", "post_failed"]
+
+
+class IngestJournal:
+    """
+    On-disk journal of the outcome of every item processed by a populator, stored in a SQLite database.
+
+    Items are identified by the collection they belong to and their location, as yielded by the loader.
+    Posted items can also be recorded with a fingerprint of their source data, allowing unchanged items to be skipped.
+    The aggregated summaries of the collection are saved as well, so that later runs processing only some items
+    keep summarizing all of them.
+    Records are accumulated in a transaction that is committed every ``commit_interval`` seconds or ``commit_size``
+    records, which keeps appending cheap while bounding the records that could be lost if the process dies.
+    The database employs write-ahead logging, so that an interrupted process never leaves it corrupted.
+
+    The journal can be written from multiple threads.
+    """
+
+    def __init__(
+        self,
+        path: Union[os.PathLike[str], str],
+        commit_interval: float = 1.0,
+        commit_size: int = 1000,
+    ) -> None:
+        """Constructor
+
+        :param path: path to the SQLite database file, created if missing
+        :type path: Union[os.PathLike[str], str]
+        :param commit_interval: maximum delay in seconds before records are committed to disk
+        :type commit_interval: float
+        :param commit_size: maximum number of uncommitted records
+        :type commit_size: int
+        """
+        self.path = path
+        self.commit_interval = commit_interval
+        self.commit_size = commit_size
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level="DEFERRED")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                collection_id TEXT NOT NULL,
+                item_loc TEXT NOT NULL,
+                item_name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                updated REAL NOT NULL,
+                fingerprint TEXT,
+                PRIMARY KEY (collection_id, item_loc)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS summaries (
+                collection_id TEXT NOT NULL PRIMARY KEY,
+                state TEXT NOT NULL,
+                updated REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        LOGGER.info(f"Using ingestion journal [{path}]")
+
+    def record(
+        self,
+        collection_id: str,
+        item_name: str,
+        item_loc: str,
+        status: ItemStatus,
+        fingerprint: Optional[str] = None,
+    ) -> None:
+        """Record the outcome of the last attempt to process an item, and the fingerprint of its source if any."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO items (collection_id, item_loc, item_name, status, updated, fingerprint) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (collection_id, item_loc, item_name, status, time.time(), fingerprint),
+            )
+            self._pending += 1
+            now = time.monotonic()
+            if self._pending >= self.commit_size or now - self._last_commit >= self.commit_interval:
+                self._commit(now)
+
+    def lookup(self, collection_id: str, item_loc: str) -> Tuple[Optional[ItemStatus], Optional[str]]:
+        """Obtain the outcome and source fingerprint of the last attempt to process an item.
+
+        :return: the status and fingerprint of the item, both None if it was never processed.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, fingerprint FROM items WHERE collection_id = ? AND item_loc = ?",
+                (collection_id, item_loc),
+            ).fetchone()
+        return row if row else (None, None)
+
+    def load_summaries(self, collection_id: str) -> Optional[str]:
+        """Obtain the state of the collection summaries saved by a previous run, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM summaries WHERE collection_id = ?", (collection_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def save_summaries(self, collection_id: str, state: str) -> None:
+        """Save the state of the collection summaries, committed along with the pending records."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (collection_id, state, updated) VALUES (?, ?, ?)",
+                (collection_id, state, time.time()),
+            )
+            self._commit(time.monotonic())
+
+    def flush(self) -> None:
+        """Commit all pending records to disk."""
+        with self._lock:
+            self._commit(time.monotonic())
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def _commit(self, now: float) -> None:
+        self._conn.commit()
+        self._pending = 0
+        self._last_commit = now
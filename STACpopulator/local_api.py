@@ -0,0 +1,467 @@
+import argparse
+import gzip
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlencode, urlparse
+
+LOGGER = logging.getLogger(__name__)
+
+Response = Tuple[int, Any]
+
+
+class LocalSTACAPI:
+    """
+    Lightweight stand-in of a STAC API with the Transactions extension, to test and benchmark the ingestion locally.
+
+    It implements the endpoints employed by the populators: the landing page, the creation and update of collections
+    and items (with a 409 status for existing ones), the listing of the items of a collection with pagination, and the
+    bulk transactions of ``stac-fastapi``. Collections and items are stored in a SQLite database, kept in memory
+    unless a file is provided, and returned as they were received, without validation.
+
+    Every response can be delayed by ``latency`` seconds plus a random ``latency_jitter``, and replaced by an
+    ``error_status`` response with probability ``error_rate``, in order to reproduce the behaviour of a remote server.
+    Given a ``seed``, the same delays and errors are drawn on every run for a same sequence of requests.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        database: Union[os.PathLike[str], str] = ":memory:",
+        prefix: str = "",
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        retry_after: Optional[float] = None,
+        compression: bool = True,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Constructor
+
+        :param host: interface on which to listen
+        :type host: str
+        :param port: port on which to listen, any free one if 0
+        :type port: int
+        :param database: path to the SQLite database file, or ``:memory:`` to keep the data in memory only
+        :type database: Union[os.PathLike[str], str]
+        :param prefix: path prefix of the endpoints (e.g.: ``/stac``)
+        :type prefix: str
+        :param latency: minimum delay in seconds of every response
+        :type latency: float
+        :param latency_jitter: maximum random delay in seconds added to the latency
+        :type latency_jitter: float
+        :param error_rate: probability of a request being answered with an injected error
+        :type error_rate: float
+        :param error_status: status code of the injected errors
+        :type error_status: int
+        :param retry_after: value in seconds of the ``Retry-After`` header of the injected errors, if any
+        :type retry_after: float, optional
+        :param compression: whether gzip (and zstd, if ``zstandard`` is installed) request bodies are accepted,
+          otherwise they are rejected with a 415 status
+        :type compression: bool
+        :param seed: seed of the random delays and errors
+        :type seed: int, optional
+        """
+        self.host = host
+        self.port = port
+        self.prefix = "/" + prefix.strip("/") if prefix.strip("/") else ""
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.compression = compression
+        self.requests: Counter[Tuple[str, int]] = Counter()
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._conn = sqlite3.connect(database, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")  # durability is irrelevant for a test server
+        self._conn.execute("CREATE TABLE IF NOT EXISTS collections (id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                collection_id TEXT NOT NULL,
+                id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (collection_id, id)
+            )
+            """
+        )
+
+    @property
+    def url(self) -> str:
+        """Address of the API, to be employed as the STAC host of the populators."""
+        return f"http://{self.host}:{self.port}{self.prefix}/"
+
+    def start(self) -> None:
+        api = self
+
+        class LocalSTACAPIHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive connections, like production servers
+            # buffered writes send the headers and the body together, otherwise delayed acknowledgements of the
+            # separate packets stall every response on a kept-alive connection
+            wbufsize = 64 * 1024
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, payload, headers = api.respond(self.command, self.path, body, dict(self.headers))
+                content = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, format: str, *args: object) -> None:
+                LOGGER.debug(format, *args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), LocalSTACAPIHandler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]  # resolved if 0
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, name="local-stac-api", daemon=True
+        )
+        self._thread.start()
+        LOGGER.info(f"Serving a local STAC API on [{self.url}]", extra={"url": self.url})
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+        self._conn.close()
+
+    def __enter__(self) -> "LocalSTACAPI":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def respond(
+        self, method: str, path: str, body: bytes = b"", headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Any, Dict[str, str]]:
+        """Process a request, with the configured latency and errors.
+
+        :return: the status code, the JSON payload (None for an empty body) and the additional headers of the response
+        """
+        with self._random_lock:
+            delay = self.latency + self._random.uniform(0, self.latency_jitter) if self.latency_jitter else self.latency
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        response_headers = {}
+        if failed:
+            status, payload = self.error_status, {"code": "InjectedError", "description": "Error injected for tests."}
+            if self.retry_after is not None:
+                response_headers["Retry-After"] = f"{self.retry_after:g}"
+        else:
+            try:
+                status, payload = self._dispatch(method, path, body, headers or {})
+            except (KeyError, TypeError, ValueError) as exc:
+                status, payload = 400, {"code": "BadRequest", "description": f"Invalid request: {exc!r}"}
+            except Exception as exc:  # reported as a server error like a real API would
+                LOGGER.exception("Local STAC API request failed")
+                status, payload = 500, {"code": type(exc).__name__, "description": str(exc)}
+        with self._lock:
+            self.requests[(method, status)] += 1
+        return status, payload, response_headers
+
+    def _dispatch(self, method: str, path: str, body: bytes, headers: Dict[str, str]) -> Response:
+        url = urlparse(path)
+        route = url.path
+        if self.prefix:
+            if route != self.prefix and not route.startswith(self.prefix + "/"):
+                return 404, {"code": "NotFound", "description": f"No route [{route}]"}
+            route = route[len(self.prefix) :]
+        parts = [part for part in route.split("/") if part]
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        data = None
+        if method in ["POST", "PUT"]:
+            encoding = {name.lower(): value for name, value in headers.items()}.get("content-encoding")
+            try:
+                body = self._decode(body, encoding)
+            except (ValueError, OSError, EOFError, zlib.error) as exc:  # unsupported encoding or corrupted body
+                return 415, {"code": "UnsupportedMediaType", "description": f"Cannot decode the body: {exc!r}"}
+            try:
+                data = json.loads(body)
+            except ValueError as exc:
+                return 400, {"code": "BadRequest", "description": f"Invalid JSON body: {exc}"}
+
+        if not parts and method == "GET":
+            return 200, self._landing_page()
+        if parts[:1] == ["collections"]:
+            if len(parts) == 1:
+                if method == "GET":
+                    return 200, {"collections": self._list_collections(), "links": []}
+                if method == "POST":
+                    return self._create_collection(data)
+                if method == "PUT":
+                    return self._update_collection(data.get("id"), data)
+            elif len(parts) == 2:
+                if method == "GET":
+                    return self._get("collections", parts[1])
+                if method == "PUT":
+                    return self._update_collection(parts[1], data)
+                if method == "DELETE":
+                    return self._delete_collection(parts[1])
+            elif len(parts) == 3 and parts[2] == "items":
+                if method == "GET":
+                    return self._list_items(parts[1], query, url.path)
+                if method == "POST":
+                    return self._create_item(parts[1], data)
+            elif len(parts) == 3 and parts[2] == "bulk_items" and method == "POST":
+                return self._bulk_items(parts[1], data)
+            elif len(parts) == 4 and parts[2] == "items":
+                if method == "GET":
+                    return self._get("items", parts[3], parts[1])
+                if method == "PUT":
+                    return self._update_item(parts[1], parts[3], data)
+                if method == "DELETE":
+                    return self._delete_item(parts[1], parts[3])
+        return 404, {"code": "NotFound", "description": f"No route [{method} {url.path}]"}
+
+    def _decode(self, body: bytes, encoding: Optional[str]) -> bytes:
+        if not encoding or encoding == "identity":
+            return body
+        if not self.compression:
+            raise ValueError(f"Compressed request bodies are not supported [{encoding}]")
+        if encoding == "gzip":
+            return gzip.decompress(body)
+        if encoding == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                raise ValueError("Encoding [zstd] requires the 'zstandard' package")
+            try:
+                return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+            except zstandard.ZstdError as exc:
+                raise ValueError(f"Invalid zstd body: {exc}") from exc
+        raise ValueError(f"Unknown encoding [{encoding}]")
+
+    def _landing_page(self) -> Dict[str, Any]:
+        return {
+            "type": "Catalog",
+            "id": "local-stac-api",
+            "title": "Local STAC API",
+            "description": "Stand-in STAC API for testing.",
+            "stac_version": "1.0.0",
+            "conformsTo": [
+                "https://api.stacspec.org/v1.0.0/core",
+                "https://api.stacspec.org/v1.0.0/ogcapi-features",
+                "https://api.stacspec.org/v1.0.0/ogcapi-features/extensions/transaction",
+            ],
+            "links": [{"rel": "data", "href": f"{self.url}collections", "type": "application/json"}],
+        }
+
+    def _get(self, table: str, obj_id: str, collection_id: Optional[str] = None) -> Response:
+        with self._lock:
+            if collection_id is None:
+                row = self._conn.execute("SELECT data FROM collections WHERE id = ?", (obj_id,)).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT data FROM items WHERE collection_id = ? AND id = ?", (collection_id, obj_id)
+                ).fetchone()
+        if row is None:
+            return 404, {"code": "NotFoundError", "description": f"{table[:-1].capitalize()} {obj_id} does not exist."}
+        return 200, json.loads(row[0])
+
+    def _collection_exists(self, collection_id: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM collections WHERE id = ?", (collection_id,)).fetchone() is not None
+
+    def _list_collections(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM collections ORDER BY id").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _create_collection(self, data: Dict[str, Any]) -> Response:
+        with self._lock:
+            try:
+                self._conn.execute("INSERT INTO collections (id, data) VALUES (?, ?)", (data["id"], json.dumps(data)))
+            except sqlite3.IntegrityError:
+                return 409, {"code": "ConflictError", "description": f"Collection {data['id']} already exists."}
+        return 200, data
+
+    def _update_collection(self, collection_id: Optional[str], data: Dict[str, Any]) -> Response:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE collections SET data = ? WHERE id = ?", (json.dumps(data), collection_id)
+            )
+        if not cursor.rowcount:
+            return 404, {"code": "NotFoundError", "description": f"Collection {collection_id} does not exist."}
+        return 200, data
+
+    def _delete_collection(self, collection_id: str) -> Response:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM collections WHERE id = ?", (collection_id,))
+            self._conn.execute("DELETE FROM items WHERE collection_id = ?", (collection_id,))
+        if not cursor.rowcount:
+            return 404, {"code": "NotFoundError", "description": f"Collection {collection_id} does not exist."}
+        return 200, {"deleted collection": collection_id}
+
+    def _list_items(self, collection_id: str, query: Dict[str, str], path: str) -> Response:
+        limit = min(max(int(query.get("limit", 10)), 1), 10000)
+        offset = int(query.get("token", 0))
+        ids_only = query.get("fields") == "id"
+        column = "id" if ids_only else "data"
+        with self._lock:
+            if not self._collection_exists(collection_id):
+                return 404, {"code": "NotFoundError", "description": f"Collection {collection_id} does not exist."}
+            matched = self._conn.execute(
+                "SELECT COUNT(*) FROM items WHERE collection_id = ?", (collection_id,)
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {column} FROM items WHERE collection_id = ? ORDER BY id LIMIT ? OFFSET ?",
+                (collection_id, limit, offset),
+            ).fetchall()
+        features = [{"id": row[0]} if ids_only else json.loads(row[0]) for row in rows]
+        links = []
+        if offset + len(features) < matched:
+            next_query = urlencode({**query, "token": offset + len(features)})
+            links.append({"rel": "next", "href": f"http://{self.host}:{self.port}{path}?{next_query}"})
+        return 200, {
+            "type": "FeatureCollection",
+            "features": features,
+            "links": links,
+            "numberMatched": matched,
+            "numberReturned": len(features),
+        }
+
+    def _create_item(self, collection_id: str, data: Dict[str, Any]) -> Response:
+        with self._lock:
+            if not self._collection_exists(collection_id):
+                return 404, {"code": "NotFoundError", "description": f"Collection {collection_id} does not exist."}
+            try:
+                self._conn.execute(
+                    "INSERT INTO items (collection_id, id, data) VALUES (?, ?, ?)",
+                    (collection_id, data["id"], json.dumps(data)),
+                )
+            except sqlite3.IntegrityError:
+                return 409, {"code": "ConflictError", "description": f"Item {data['id']} already exists."}
+        return 200, data
+
+    def _update_item(self, collection_id: str, item_id: str, data: Dict[str, Any]) -> Response:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE items SET data = ? WHERE collection_id = ? AND id = ?",
+                (json.dumps(data), collection_id, item_id),
+            )
+        if not cursor.rowcount:
+            return 404, {"code": "NotFoundError", "description": f"Item {item_id} does not exist."}
+        return 200, data
+
+    def _delete_item(self, collection_id: str, item_id: str) -> Response:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM items WHERE collection_id = ? AND id = ?", (collection_id, item_id)
+            )
+        if not cursor.rowcount:
+            return 404, {"code": "NotFoundError", "description": f"Item {item_id} does not exist."}
+        return 200, {"deleted item": item_id}
+
+    def _bulk_items(self, collection_id: str, data: Dict[str, Any]) -> Response:
+        items = data.get("items") or {}
+        upsert = data.get("method", "insert") == "upsert"
+        rows = [(collection_id, item_id, json.dumps(item)) for item_id, item in items.items()]
+        with self._lock:
+            if not self._collection_exists(collection_id):
+                return 404, {"code": "NotFoundError", "description": f"Collection {collection_id} does not exist."}
+            # all the items are inserted in a single transaction, like the bulk transactions of stac-fastapi
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    f"INSERT {'OR REPLACE ' if upsert else ''}INTO items (collection_id, id, data) VALUES (?, ?, ?)",
+                    rows,
+                )
+            except sqlite3.IntegrityError:
+                self._conn.execute("ROLLBACK")
+                return 409, {"code": "ConflictError", "description": "Some items already exist."}
+            self._conn.execute("COMMIT")
+        return 200, f"Successfully added {len(rows)} items."
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Local stand-in STAC API for testing and benchmarking.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface on which to listen.")
+    parser.add_argument("--port", type=int, default=8880, help="Port on which to listen.")
+    parser.add_argument("--prefix", default="/stac", help="Path prefix of the endpoints.")
+    parser.add_argument(
+        "--database",
+        default=":memory:",
+        help="SQLite database file storing the collections and items. By default, they are kept in memory.",
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="Minimum delay in seconds of every response.")
+    parser.add_argument(
+        "--latency-jitter", type=float, default=0.0, help="Maximum random delay in seconds added to the latency."
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Probability of a request being answered with an error."
+    )
+    parser.add_argument("--error-status", type=int, default=503, help="Status code of the injected errors.")
+    parser.add_argument("--retry-after", type=float, help="Retry-After header of the injected errors, in seconds.")
+    parser.add_argument(
+        "--no-compression",
+        dest="compression",
+        action="store_false",
+        help="Reject compressed request bodies with a 415 status.",
+    )
+    parser.add_argument("--seed", type=int, help="Seed of the random delays and errors, for reproducible runs.")
+    return parser
+
+
+def runner(ns: argparse.Namespace) -> Optional[int]:
+    api = LocalSTACAPI(
+        host=ns.host,
+        port=ns.port,
+        database=ns.database,
+        prefix=ns.prefix,
+        latency=ns.latency,
+        latency_jitter=ns.latency_jitter,
+        error_rate=ns.error_rate,
+        error_status=ns.error_status,
+        retry_after=ns.retry_after,
+        compression=ns.compression,
+        seed=ns.seed,
+    )
+    with api:
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def main(*args: str) -> Optional[int]:
+    parser = make_parser()
+    ns = parser.parse_args(args or None)
+    return runner(ns)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from STACpopulator.timing import BUCKET_BOUNDS, TIMINGS, StageStats, StageTimings
+
+LOGGER = logging.getLogger(__name__)
+
+PREFIX = "stac_populator"
+
+# bounds of the exported histogram buckets, one per doubling of the timing buckets (1ms, 2ms, ..., about 70 minutes)
+EXPORTED_BUCKETS = range(0, len(BUCKET_BOUNDS), 4)
+
+
+def _labels(**labels: Union[str, int]) -> str:
+    if not labels:
+        return ""
+    values = (
+        str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for value in labels.values()
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, values)) + "}"
+
+
+class IngestMetrics:
+    """
+    Metrics of the ingestion in the current process, rendered in the Prometheus text exposition format.
+
+    Item outcomes, HTTP requests (per host in-flight count, latency, errors and response codes) and queue depths are
+    reported by the populators, the loaders and the request helpers, while the durations, errors and bytes of the
+    ingestion stages are taken from the :class:`~STACpopulator.timing.StageTimings`.
+    """
+
+    def __init__(self, timings: StageTimings = TIMINGS) -> None:
+        self.timings = timings
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.last_progress: Optional[float] = None
+        self._processed = 0
+        self._items: Dict[str, int] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._requests: Dict[str, StageStats] = {}
+        self._responses: Dict[Tuple[str, int], int] = {}
+        self._queues: Dict[str, int] = {}
+
+    def item_processed(self) -> None:
+        """Report that the loader item was processed, whatever its outcome."""
+        with self._lock:
+            self._processed += 1
+            self.last_progress = time.time()
+
+    def item_outcome(self, status: str) -> None:
+        """Report the outcome of an item (e.g.: ``posted``, ``create_failed`` or ``post_failed``)."""
+        with self._lock:
+            self._items[status] = self._items.get(status, 0) + 1
+
+    def set_queue_depth(self, queue: str, depth: int) -> None:
+        with self._lock:
+            self._queues[queue] = depth
+
+    @contextmanager
+    def request(self, host: str) -> Iterator[None]:
+        """Measure a request to the host, counting it as an error if it raises."""
+        with self._lock:
+            self._in_flight[host] = self._in_flight.get(host, 0) + 1
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self._in_flight[host] -= 1
+                stats = self._requests.get(host)
+                if stats is None:
+                    stats = self._requests[host] = StageStats()
+                stats.add(duration, error=error)
+
+    def record_response(self, host: str, status: int) -> None:
+        with self._lock:
+            self._responses[host, status] = self._responses.get((host, status), 0) + 1
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def family(name: str, kind: str, description: str) -> str:
+            name = f"{PREFIX}_{name}"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            return name
+
+        def histogram(name: str, stats: StageStats, **labels: str) -> None:
+            cumulative = 0
+            start = 0
+            for index in EXPORTED_BUCKETS:
+                cumulative += sum(stats.buckets[start : index + 1])
+                start = index + 1
+                lines.append(f"{name}_bucket{_labels(**labels, le=f'{BUCKET_BOUNDS[index]:.6g}')} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {stats.count}")
+            lines.append(f"{name}_sum{_labels(**labels)} {stats.total}")
+            lines.append(f"{name}_count{_labels(**labels)} {stats.count}")
+
+        with self._lock:
+            processed = self._processed
+            last_progress = self.last_progress
+            items = dict(self._items)
+            in_flight = dict(self._in_flight)
+            requests = {host: stats.copy() for host, stats in self._requests.items()}
+            responses = dict(self._responses)
+            queues = dict(self._queues)
+        stages = self.timings.snapshot()
+
+        name = family("start_time_seconds", "gauge", "Start time of the ingestion since the Unix epoch.")
+        lines.append(f"{name} {self.started}")
+        name = family("last_progress_time_seconds", "gauge", "Time at which the last item was processed.")
+        lines.append(f"{name} {last_progress if last_progress is not None else 0}")
+        name = family("items_processed_total", "counter", "Number of loader items processed.")
+        lines.append(f"{name} {processed}")
+        name = family("items_total", "counter", "Number of items by outcome (posted, create_failed, post_failed).")
+        for status, count in sorted(items.items()):
+            lines.append(f"{name}{_labels(status=status)} {count}")
+
+        name = family("stage_duration_seconds", "histogram", "Duration of the ingestion stages.")
+        for stage, stats in stages.items():
+            histogram(name, stats, stage=stage)
+        name = family("stage_errors_total", "counter", "Number of failed executions of the ingestion stages.")
+        for stage, stats in stages.items():
+            lines.append(f"{name}{_labels(stage=stage)} {stats.errors}")
+        name = family("stage_bytes_total", "counter", "Number of bytes transferred by the ingestion stages.")
+        for stage, stats in stages.items():
+            lines.append(f"{name}{_labels(stage=stage)} {stats.bytes}")
+
+        name = family("requests_in_flight", "gauge", "Number of HTTP requests in flight.")
+        for host, count in sorted(in_flight.items()):
+            lines.append(f"{name}{_labels(host=host)} {count}")
+        name = family("request_duration_seconds", "histogram", "Latency of the HTTP request attempts.")
+        for host, stats in sorted(requests.items()):
+            histogram(name, stats, host=host)
+        name = family("request_errors_total", "counter", "Number of HTTP requests failing without a response.")
+        for host, stats in sorted(requests.items()):
+            lines.append(f"{name}{_labels(host=host)} {stats.errors}")
+        name = family("responses_total", "counter", "Number of HTTP responses by status code.")
+        for (host, status), count in sorted(responses.items()):
+            lines.append(f"{name}{_labels(host=host, code=status)} {count}")
+
+        name = family("queue_depth", "gauge", "Number of entries waiting in the ingestion queues.")
+        for queue, depth in sorted(queues.items()):
+            lines.append(f"{name}{_labels(queue=queue)} {depth}")
+        return "\n".join(lines) + "\n"
+
+
+# metrics shared by the loaders and populators of the current process
+METRICS = IngestMetrics()
+
+
+class MetricsExporter:
+    """
+    Exports the metrics of the ingestion on an HTTP ``/metrics`` endpoint and/or in a textfile collected by the
+    Prometheus node exporter, which is rewritten atomically every ``interval`` seconds and when stopped.
+    """
+
+    def __init__(
+        self,
+        port: Optional[int] = None,
+        textfile: Optional[Union[os.PathLike[str], str]] = None,
+        interval: float = 15.0,
+        metrics: IngestMetrics = METRICS,
+    ) -> None:
+        """Constructor
+
+        :param port: port of the HTTP endpoint, listening on all interfaces, or None to disable it
+        :type port: int, optional
+        :param textfile: path of the textfile (should end with ``.prom``), or None to disable it
+        :type textfile: Union[os.PathLike[str], str], optional
+        :param interval: interval in seconds between updates of the textfile
+        :type interval: float
+        """
+        self.port = port
+        self.textfile = textfile
+        self.interval = interval
+        self.metrics = metrics
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        if self.port is not None:
+            metrics = self.metrics
+
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self) -> None:
+                    if self.path.split("?", 1)[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = metrics.render().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format: str, *args: object) -> None:
+                    LOGGER.debug(format, *args)
+
+            self._server = ThreadingHTTPServer(("", self.port), MetricsHandler)
+            self._server.daemon_threads = True
+            self.port = self._server.server_address[1]  # resolved if 0
+            self._threads.append(threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True))
+            LOGGER.info(f"Serving metrics on port {self.port}", extra={"metrics_port": self.port})
+        if self.textfile:
+            writer = threading.Thread(target=self._write_periodically, name="metrics-textfile", daemon=True)
+            self._threads.append(writer)
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self.textfile:
+            self.write_textfile()
+
+    def write_textfile(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.textfile))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                file.write(self.metrics.render())
+            # the temporary file is only readable by its owner, unlike the metrics read by the node exporter
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.textfile)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _write_periodically(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.write_textfile()
+            except OSError as exc:
+                LOGGER.warning(f"Could not write the metrics textfile: {exc}", exc_info=exc)
+
+    def __enter__(self) -> "MetricsExporter":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
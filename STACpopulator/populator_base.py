@@ -1,28 +1,68 @@
+import asyncio
 import functools
 import inspect
-import json
 import logging
 import os
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from datetime import datetime
-from typing import Any, Dict, List, MutableMapping, Optional, Type, Union
+from typing import Any, Dict, List, Literal, MutableMapping, Optional, Set, Tuple, Type, Union
 
 import pystac
 from requests.sessions import Session
 
-from STACpopulator.api_requests import (
-    post_stac_collection,
-    post_stac_item,
-    stac_host_reachable,
-)
+from STACpopulator import __version__
+from STACpopulator.api_requests import RequestCompression, stac_host_reachable
 from STACpopulator.input import GenericLoader
+from STACpopulator.journal import IngestJournal, ItemStatus
+from STACpopulator.metrics import METRICS, MetricsExporter
 from STACpopulator.models import AnyGeometry
+from STACpopulator.progress import ProgressReporter
+from STACpopulator.serialization import dumps
+from STACpopulator.sinks import GenericSink, NDJSONSink, OutputType, StaticCatalogSink, STACAPISink
 from STACpopulator.stac_utils import load_config, url_validate
+from STACpopulator.summaries import CollectionSummarizer
+from STACpopulator.timing import TIMINGS, item_stages, stage
 
 LOGGER = logging.getLogger(__name__)
 
+# populator employed to create the STAC items within a worker process of the process pool
+_WORKER_POPULATOR: Optional["STACpopulatorBase"] = None
+
+
+def _initialize_worker(populator: "STACpopulatorBase") -> None:
+    global _WORKER_POPULATOR
+    _WORKER_POPULATOR = populator
+    populator.initialize_worker()
+
+
+def _create_stac_item_in_worker(
+    item_name: str, item_data: MutableMapping[str, Any], item_loc: str
+) -> Tuple[MutableMapping[str, Any], Dict[str, float]]:
+    # the timings of the worker process are returned to be aggregated by the parent process
+    with item_stages() as durations:
+        stac_item = _WORKER_POPULATOR.create_stac_item(item_name, item_data, item_loc=item_loc)
+    return stac_item, durations
+
+
+def _record_worker_stages(result: Tuple[MutableMapping[str, Any], Dict[str, float]]) -> MutableMapping[str, Any]:
+    stac_item, durations = result
+    for name, duration in durations.items():
+        TIMINGS.record(name, duration)
+    return stac_item
+
 
 class STACpopulatorBase(ABC):
+    # prefixes of the item properties aggregated in the collection summaries, all of them if None
+    summary_properties: Optional[Tuple[str, ...]] = None
+
     def __init__(
         self,
         stac_host: str,
@@ -31,6 +71,25 @@ class STACpopulatorBase(ABC):
         session: Optional[Session] = None,
         config_file: Optional[Union[os.PathLike[str], str]] = "collection_config.yml",
         log_debug: Optional[bool] = False,
+        workers: Optional[int] = 1,
+        bulk_size: Optional[int] = None,
+        bulk_max_bytes: Optional[int] = 4 * 1024 * 1024,
+        asynchronous: Optional[bool] = False,
+        processes: Optional[int] = None,
+        journal: Optional[Union[os.PathLike[str], str]] = None,
+        resume: Optional[bool] = False,
+        incremental: Optional[bool] = False,
+        output: OutputType = "api",
+        output_path: Optional[Union[os.PathLike[str], str]] = None,
+        summaries: bool = False,
+        summaries_interval: Optional[float] = 600,
+        adaptive_concurrency: Optional[bool] = False,
+        metrics_port: Optional[int] = None,
+        metrics_textfile: Optional[Union[os.PathLike[str], str]] = None,
+        metrics_interval: Optional[float] = 15,
+        progress_interval: Optional[float] = 30,
+        preload_item_ids: Optional[bool] = False,
+        compression: Optional[Literal["gzip", "zstd"]] = None,
     ) -> None:
         """Constructor
 
@@ -38,6 +97,65 @@ class STACpopulatorBase(ABC):
         :type stac_host: str
         :param data_loader: A concrete implementation of the GenericLoader abstract base class
         :type data_loader: GenericLoader
+        :param workers: Number of items created and posted concurrently during ingestion, defaults to 1 (serial)
+        :type workers: int, optional
+        :param bulk_size: If provided, items are posted in batches of (at most) this many items using the bulk
+          transaction endpoint of the STAC API, defaults to None (items are posted one by one)
+        :type bulk_size: int, optional
+        :param bulk_max_bytes: Maximum size of the serialized items of a batch when ``bulk_size`` is provided
+        :type bulk_max_bytes: int, optional
+        :param asynchronous: If True, ingestion runs on an event loop with up to ``workers`` items processed
+          concurrently as coroutines, using the asynchronous counterparts of the loader and item creation methods.
+        :type asynchronous: bool, optional
+        :param processes: If provided, STAC items are created by a pool of this many processes to employ multiple CPU
+          cores, while loading and posting remain performed by the ``workers``. The populator must be picklable, which
+          is the case by default for any attribute other than the session, the loader and the output.
+        :type processes: int, optional
+        :param journal: Path to a SQLite database where the outcome of every item is recorded, defaults to None
+        :type journal: Union[os.PathLike[str], str], optional
+        :param resume: If True, items that the journal reports as already posted are skipped, defaults to False
+        :type resume: bool, optional
+        :param incremental: If True, items whose source fingerprint provided by the loader (e.g.: modification date
+          and size) is unchanged since they were last posted according to the journal are skipped, defaults to False
+        :type incremental: bool, optional
+        :param output: Destination of the STAC Collection and Items: the STAC API (``api``, default), a
+          newline-delimited JSON file (``ndjson``, compressed if the path ends with ``.gz`` or ``.zst``) or a static
+          catalog written in a directory (``catalog``). The STAC API is not contacted with the other outputs.
+        :type output: str, optional
+        :param output_path: Path of the file or directory written by the ``ndjson`` and ``catalog`` outputs
+        :type output_path: Union[os.PathLike[str], str], optional
+        :param summaries: If True, the summaries and extent of the collection are aggregated from the ingested items
+          and the collection is updated with them at the end of the ingestion, replacing those previously published.
+          Without a journal, they only describe the items of the current run, so that partial runs should not enable
+          them. With a journal, the aggregation of previous runs is extended when resuming or ingesting incrementally.
+        :type summaries: bool
+        :param summaries_interval: Interval in seconds between updates of the collection during the ingestion when
+          ``summaries`` are aggregated, defaults to 600. If 0 or None, the collection is only updated at the end.
+        :type summaries_interval: float, optional
+        :param adaptive_concurrency: If True, the number of items posted concurrently to the STAC API is adapted
+          between 1 and ``workers`` according to its latency and errors, defaults to False
+        :type adaptive_concurrency: bool, optional
+        :param metrics_port: If provided, metrics of the ingestion (items processed, failures by stage, HTTP requests
+          in flight and latency by host, queue depths, etc.) are served in the Prometheus format on the ``/metrics``
+          endpoint of this port during :meth:`ingest`, defaults to None
+        :type metrics_port: int, optional
+        :param metrics_textfile: If provided, the metrics are also written to this file (e.g.: for the textfile
+          collector of the Prometheus node exporter) every ``metrics_interval`` seconds, defaults to None
+        :type metrics_textfile: Union[os.PathLike[str], str], optional
+        :param metrics_interval: Interval in seconds between updates of the ``metrics_textfile``, defaults to 15
+        :type metrics_interval: float, optional
+        :param progress_interval: Interval in seconds between logs of the progress of :meth:`ingest` (items done,
+          throughput, remaining items and estimated time left according to the loader), defaults to 30.
+          If 0 or None, the progress is not reported.
+        :type progress_interval: float, optional
+        :param preload_item_ids: If True and ``update`` is requested, the IDs of the items already present in the
+          collection of the STAC API are loaded before posting the first item, so that existing items are directly
+          updated instead of being rejected by a creation attempt first, defaults to False
+        :type preload_item_ids: bool, optional
+        :param compression: If provided, the bodies of the requests to the STAC API are compressed with this algorithm
+          (``gzip`` or ``zstd``, which requires the ``zstandard`` package), unless the STAC API rejects them,
+          defaults to None
+        :type compression: str, optional
         :raises RuntimeError: Raised if one of the required definitions is not found in the collection info filename
         """
 
@@ -48,12 +166,69 @@ class STACpopulatorBase(ABC):
         self.load_config()
 
         self._ingest_pipeline = data_loader
-        self._stac_host = self.validate_host(stac_host)
         self.update = update
+        if workers is None or workers < 1:
+            raise ValueError(f"Number of ingestion workers must be a positive integer, not [{workers}]")
+        self.workers = workers
+        self.asynchronous = asynchronous
+        self.processes = processes
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        if processes and processes > self.workers:
+            # otherwise, there would never be enough items submitted to employ all processes
+            LOGGER.info(f"Increasing the number of ingestion workers to match the {processes} processes")
+            self.workers = processes
+        self._journal = IngestJournal(journal) if journal else None
+        self.resume = resume
+        self.incremental = incremental
+        self._fingerprints: Dict[str, str] = {}  # fingerprints of the items being processed, by location
+        if resume or incremental:
+            if not self._journal:
+                raise ValueError("Resuming or incremental ingestion requires a journal of the previous attempts")
+            self._ingest_pipeline.item_filter = self._accept_item
+        if output == "api":
+            self._stac_host = self.validate_host(stac_host)
+            self._sink: GenericSink = STACAPISink(
+                self.stac_host,
+                self.collection_id,
+                update=self.update,
+                session=self._session,
+                bulk_size=bulk_size,
+                bulk_max_bytes=bulk_max_bytes,
+                async_limit=self.workers,
+                adaptive_concurrency=adaptive_concurrency,
+                preload_item_ids=preload_item_ids,
+                compression=RequestCompression(compression) if compression else None,
+            )
+        elif not output_path:
+            raise ValueError(f"Output [{output}] requires an output path")
+        elif output == "ndjson":
+            self._stac_host = stac_host
+            self._sink = NDJSONSink(output_path, self.collection_id)
+        elif output == "catalog":
+            self._stac_host = stac_host
+            self._sink = StaticCatalogSink(output_path, self.collection_id, update=self.update)
+        else:
+            raise ValueError(f"Unknown output [{output}]")
+        self._sink.on_success = self._report_post_success
+        self._sink.on_failure = self._report_post_failure
+        self._metrics: Optional[MetricsExporter] = None
+        if metrics_port is not None or metrics_textfile:
+            self._metrics = MetricsExporter(metrics_port, metrics_textfile, interval=metrics_interval or 15)
+        self.progress_interval = progress_interval
+        self._items_done = 0  # items processed or skipped, for progress reports
+        self._summarizer: Optional[CollectionSummarizer] = None
+        self.summaries_interval = summaries_interval
+        self._summaries_updated = time.monotonic()
+        if summaries:
+            self._summarizer = CollectionSummarizer(self.summary_properties)
+            if self._journal and (resume or incremental):
+                state = self._journal.load_summaries(self.collection_id)
+                if state:
+                    self._summarizer.loads(state)
 
         LOGGER.info("Initialization complete")
         LOGGER.info(f"Collection {self.collection_name} is assigned ID {self.collection_id}")
-        self.create_stac_collection()
+        self._collection_data = self.create_stac_collection()
 
     def load_config(self):
         """
@@ -104,6 +279,44 @@ class STACpopulatorBase(ABC):
     def create_stac_item(self, item_name: str, item_data: dict[str, Any], **kwargs) -> dict[str, Any]:
         raise NotImplementedError
 
+    async def acreate_stac_item(self, item_name: str, item_data: dict[str, Any], **kwargs) -> dict[str, Any]:
+        """
+        Asynchronous counterpart of :meth:`create_stac_item`.
+
+        By default, :meth:`create_stac_item` is called from a worker thread (or process, if a process pool is used)
+        to avoid blocking the event loop. Implementations that perform requests to build their items can override
+        this method to await them instead.
+        """
+        if self._process_pool is not None:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._process_pool, _create_stac_item_in_worker, item_name, item_data, kwargs.get("item_loc")
+            )
+            return _record_worker_stages(result)
+        return await asyncio.to_thread(self.create_stac_item, item_name, item_data, **kwargs)
+
+    def initialize_worker(self) -> None:
+        """
+        Prepare the current process for the creation of STAC items by a process pool.
+
+        Called once in every worker process before any item is created. Implementations can override this method to
+        load expensive resources (controlled vocabularies, JSON-schemas, etc.) once rather than for the first item.
+        """
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Picklable state sent to the worker processes, without the resources bound to the current process."""
+        state = self.__dict__.copy()
+        for attr in ["_session", "_ingest_pipeline", "_sink", "_process_pool", "_journal", "_summarizer", "_metrics"]:
+            state[attr] = None
+        return state
+
+    def _create_stac_item(self, item_name: str, item_data: MutableMapping[str, Any], item_loc: str) -> dict[str, Any]:
+        """Create the STAC item, using the process pool if one is employed."""
+        if self._process_pool is not None:
+            future = self._process_pool.submit(_create_stac_item_in_worker, item_name, item_data, item_loc)
+            return _record_worker_stages(future.result())
+        return self.create_stac_item(item_name, item_data, item_loc=item_loc)
+
     def validate_host(self, stac_host: str) -> str:
         if not url_validate(stac_host):
             raise ValueError("stac_host URL is not appropriately formatted")
@@ -112,14 +325,13 @@ class STACpopulatorBase(ABC):
 
         return stac_host
 
-    # FIXME: should provide a way to update after item generation
-    #   STAC collections are supposed to include 'summaries' with
-    #   an aggregation of all supported 'properties' by its child items
     @functools.cache
     def create_stac_collection(self) -> dict[str, Any]:
         """
         Create a basic STAC collection.
 
+        Its summaries and extent are those of the configuration, until updated by :meth:`update_stac_collection`.
+
         Returns the collection.
         """
         LOGGER.info(f"Creating collection '{self.collection_name}'")
@@ -184,48 +396,286 @@ class STACpopulatorBase(ABC):
         return pystac_assets
 
     def publish_stac_collection(self, collection_data: dict[str, Any]) -> None:
-        post_stac_collection(self.stac_host, collection_data, self.update, session=self._session)
+        self._sink.publish_collection(collection_data)
+
+    def update_stac_collection(self) -> None:
+        """Publish the collection with the summaries and extent aggregated from the items ingested so far."""
+        if not self._summarizer:
+            return
+        self._summaries_updated = time.monotonic()
+        collection_data = self._summarizer.apply(self._collection_data)
+        if self._journal:
+            self._journal.save_summaries(self.collection_id, self._summarizer.dumps())
+        LOGGER.info(
+            f"Updating collection {self.collection_id} with the summaries of {self._summarizer.count} items",
+            extra={"summaries": list(collection_data["summaries"])},
+        )
+        try:
+            self._sink.update_collection(collection_data)
+        except Exception:
+            LOGGER.exception(f"Failed to update collection {self.collection_id}")
+
+    @property
+    def _summaries_due(self) -> bool:
+        return bool(
+            self._summarizer
+            and self.summaries_interval
+            and time.monotonic() - self._summaries_updated >= self.summaries_interval
+        )
+
+    def ingest_item(self, item_name: str, item_loc: str, item_data: MutableMapping[str, Any]) -> bool:
+        """Create and publish a single STAC item to the output.
+
+        Errors are logged rather than raised so that a failing item does not interrupt the ingestion of other items.
+
+        :param item_name: name of the item, as yielded by the loader
+        :type item_name: str
+        :param item_loc: location of the item, as yielded by the loader
+        :type item_loc: str
+        :param item_data: attributes of the item, as yielded by the loader
+        :type item_data: MutableMapping[str, Any]
+        :return: True if the item was processed successfully, False otherwise
+        :rtype: bool
+        """
+        LOGGER.info(f"New data item: {item_name}", extra={"item_loc": item_loc})
+        try:
+            with stage("create"):
+                stac_item = self._create_stac_item(item_name, item_data, item_loc)
+        except Exception:
+            LOGGER.exception(
+                f"Failed to create STAC item for {item_name}",
+                extra={"item_loc": item_loc, "loader": type(self._ingest_pipeline)},
+            )
+            self._record(item_name, item_loc, "create_failed")
+            return False
+
+        if not stac_item:
+            # nothing to post, the item is not recorded
+            self._fingerprints.pop(item_loc, None)
+            return True
+
+        try:
+            with stage("post"):
+                self._sink.publish_item(item_name, item_loc, stac_item)
+        except Exception:
+            self._report_post_failure(item_name, item_loc, stac_item)
+            return False
+        return True
+
+    def _accept_item(self, item_name: str, item_loc: str, fingerprint: Optional[str] = None) -> bool:
+        """Filter of the loader items skipping those already posted or unchanged according to the journal."""
+        status, last_fingerprint = self._journal.lookup(self.collection_id, item_loc)
+        if self.resume and status == "posted":
+            LOGGER.info(f"Skipping data item already posted: {item_name}", extra={"item_loc": item_loc})
+            self._items_done += 1
+            return False
+        if self.incremental and fingerprint is not None:
+            # a new version of the populator could produce different items from the same source
+            fingerprint = f"{type(self).__name__}/{__version__}:{fingerprint}"
+            if status == "posted" and fingerprint == last_fingerprint:
+                LOGGER.info(f"Skipping unchanged data item: {item_name}", extra={"item_loc": item_loc})
+                self._items_done += 1
+                return False
+            self._fingerprints[item_loc] = fingerprint
+        return True
+
+    def _record(self, item_name: str, item_loc: str, status: ItemStatus) -> None:
+        METRICS.item_outcome(status)
+        fingerprint = self._fingerprints.pop(item_loc, None)
+        if self._journal:
+            self._journal.record(
+                self.collection_id, item_name, item_loc, status, fingerprint if status == "posted" else None
+            )
+
+    def _report_post_success(self, item_name: str, item_loc: str, stac_item: MutableMapping[str, Any]) -> None:
+        self._record(item_name, item_loc, "posted")
+        if self._summarizer:
+            self._summarizer.add(stac_item)
+
+    def _report_post_failure(self, item_name: str, item_loc: str, stac_item: MutableMapping[str, Any]) -> None:
+        """Report an item that could not be posted. Must be called from the exception handler of the failure."""
+        self._record(item_name, item_loc, "post_failed")
+        # Something went wrong on the server side, most likely because the STAC item generated above has
+        # incorrect data. Writing the STAC item to file so that the issue could be diagnosed and fixed.
+        stac_output_fname = "error_STAC_rep_" + item_name.split(".")[0] + ".json"
+        with open(stac_output_fname, "wb") as f:
+            f.write(dumps(stac_item, indent=True))
+        LOGGER.exception(
+            f"Failed to post STAC item for {item_name}",
+            extra={
+                "item_loc": item_loc,
+                "loader": type(self._ingest_pipeline),
+                "stac_output_fname": stac_output_fname,
+            },
+        )
+
+    async def aingest_item(
+        self,
+        item_name: str,
+        item_loc: str,
+        item_data: MutableMapping[str, Any],
+    ) -> bool:
+        """Asynchronous counterpart of :meth:`ingest_item`."""
+        LOGGER.info(f"New data item: {item_name}", extra={"item_loc": item_loc})
+        try:
+            with stage("create"):
+                stac_item = await self.acreate_stac_item(item_name, item_data, item_loc=item_loc)
+        except Exception:
+            LOGGER.exception(
+                f"Failed to create STAC item for {item_name}",
+                extra={"item_loc": item_loc, "loader": type(self._ingest_pipeline)},
+            )
+            self._record(item_name, item_loc, "create_failed")
+            return False
+
+        if not stac_item:
+            # nothing to post, the item is not recorded
+            self._fingerprints.pop(item_loc, None)
+            return True
+
+        try:
+            with stage("post"):
+                await self._sink.apublish_item(item_name, item_loc, stac_item)
+        except Exception:
+            self._report_post_failure(item_name, item_loc, stac_item)
+            return False
+        return True
 
     def ingest(self) -> None:
+        if self._metrics:
+            self._metrics.start()
+        progress = None
+        if self.progress_interval:
+            progress = ProgressReporter(
+                lambda: self._items_done, self._ingest_pipeline.estimate_total, interval=self.progress_interval
+            )
+            progress.start()
+        try:
+            if self.processes:
+                LOGGER.info(f"Creating STAC items with {self.processes} processes")
+                with ProcessPoolExecutor(self.processes, initializer=_initialize_worker, initargs=(self,)) as pool:
+                    self._process_pool = pool
+                    try:
+                        self._ingest()
+                    finally:
+                        self._process_pool = None
+            else:
+                self._ingest()
+            self.update_stac_collection()
+        finally:
+            if progress:
+                progress.stop()
+            self._sink.close()
+            if self._journal:
+                self._journal.close()
+            LOGGER.info(f"Ingestion stage timings:\n{TIMINGS.summary()}")
+            if self._metrics:
+                self._metrics.stop()
+
+    def _ingest_item_stages(
+        self, item_name: str, item_loc: str, item_data: MutableMapping[str, Any]
+    ) -> Tuple[bool, Dict[str, float]]:
+        """Ingest an item, also returning the durations of its stages."""
+        with item_stages() as durations:
+            return self.ingest_item(item_name, item_loc, item_data), durations
+
+    async def _aingest_item_stages(
+        self, item_name: str, item_loc: str, item_data: MutableMapping[str, Any]
+    ) -> Tuple[bool, Dict[str, float]]:
+        with item_stages() as durations:
+            return await self.aingest_item(item_name, item_loc, item_data), durations
+
+    def _ingest(self) -> None:
+        if self.asynchronous:
+            asyncio.run(self.aingest())
+            return
+
         counter = 0
         failures = 0
-        LOGGER.info("Data ingestion")
-        for item_name, item_loc, item_data in self._ingest_pipeline:
-            LOGGER.info(f"New data item: {item_name}", extra={"item_loc": item_loc})
-            try:
-                stac_item = self.create_stac_item(item_name, item_data, item_loc=item_loc)
-            except Exception:
-                LOGGER.exception(
-                    f"Failed to create STAC item for {item_name}",
-                    extra={"item_loc": item_loc, "loader": type(self._ingest_pipeline)},
-                )
+        LOGGER.info("Data ingestion", extra={"workers": self.workers})
+
+        def collect(result: Tuple[bool, Dict[str, float]]) -> None:
+            nonlocal counter, failures
+            success, durations = result
+            if not success:
                 failures += 1
-                stac_item = None
-
-            if stac_item:
-                try:
-                    post_stac_item(
-                        self.stac_host,
-                        self.collection_id,
-                        item_name,
-                        stac_item,
-                        update=self.update,
-                        session=self._session,
-                    )
-                except Exception:
-                    # Something went wrong on the server side, most likely because the STAC item generated above has
-                    # incorrect data. Writing the STAC item to file so that the issue could be diagnosed and fixed.
-                    stac_output_fname = "error_STAC_rep_" + item_name.split(".")[0] + ".json"
-                    json.dump(stac_item, open(stac_output_fname, "w"), indent=2)
-                    LOGGER.exception(
-                        f"Failed to post STAC item for {item_name}",
-                        extra={
-                            "item_loc": item_loc,
-                            "loader": type(self._ingest_pipeline),
-                            "stac_output_fname": stac_output_fname,
-                        },
-                    )
+            counter += 1
+            self._items_done += 1
+            METRICS.item_processed()
+            LOGGER.info(
+                f"Processed {counter} data items. {failures + self._deferred_failures} failures",
+                extra={"stage_durations": durations},
+            )
+            if self._summaries_due:
+                self.update_stac_collection()
+
+        if self.workers == 1:
+            for item_name, item_loc, item_data in self._ingest_pipeline:
+                collect(self._ingest_item_stages(item_name, item_loc, item_data))
+        else:
+            # The loader is consumed on this thread (which overlaps metadata retrieval with the work of the pool),
+            # while items are created and posted by the workers. The number of pending items is bounded to avoid
+            # reading the whole loader in memory when it produces items faster than they can be posted.
+            max_pending = 2 * self.workers
+            pending: Set[Future] = set()
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ingest") as executor:
+                for item_name, item_loc, item_data in self._ingest_pipeline:
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            collect(future.result())
+                    pending.add(executor.submit(self._ingest_item_stages, item_name, item_loc, item_data))
+                    METRICS.set_queue_depth("pending_items", len(pending))
+                for future in wait(pending).done:
+                    collect(future.result())
+                METRICS.set_queue_depth("pending_items", 0)
+
+        self._sink.flush()
+        if self._deferred_failures:
+            LOGGER.info(f"Processed {counter} data items. {failures + self._deferred_failures} failures")
+
+    @property
+    def _deferred_failures(self) -> int:
+        """Number of items that failed to be published after :meth:`ingest_item` returned."""
+        return self._sink.failures
+
+    async def aingest(self) -> None:
+        """Asynchronous counterpart of :meth:`ingest`, processing up to ``workers`` items concurrently."""
+        counter = 0
+        failures = 0
+        LOGGER.info("Data ingestion", extra={"workers": self.workers, "asynchronous": True})
+
+        def collect(done: Set[asyncio.Task]) -> None:
+            nonlocal counter, failures
+            for task in done:
+                success, durations = task.result()
+                if not success:
                     failures += 1
+                counter += 1
+                self._items_done += 1
+                METRICS.item_processed()
+                LOGGER.info(
+                    f"Processed {counter} data items. {failures + self._deferred_failures} failures",
+                    extra={"stage_durations": durations},
+                )
 
-            counter += 1
-            LOGGER.info(f"Processed {counter} data items. {failures} failures")
+        pending: Set[asyncio.Task] = set()
+        try:
+            async for item_name, item_loc, item_data in self._ingest_pipeline:
+                if len(pending) >= self.workers:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    collect(done)
+                    if self._summaries_due:
+                        await asyncio.to_thread(self.update_stac_collection)
+                pending.add(asyncio.create_task(self._aingest_item_stages(item_name, item_loc, item_data)))
+                METRICS.set_queue_depth("pending_items", len(pending))
+            if pending:
+                done, _ = await asyncio.wait(pending)
+                collect(done)
+                METRICS.set_queue_depth("pending_items", 0)
+        finally:
+            await self._sink.aclose()
+
+        await asyncio.to_thread(self._sink.flush)
+        if self._deferred_failures:
+            LOGGER.info(f"Processed {counter} data items. {failures + self._deferred_failures} failures")
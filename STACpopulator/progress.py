@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """
+    Periodically logs the progress of an ingestion: items done, throughput, remaining items and estimated time left.
+
+    The counts are polled from a background thread every ``interval`` seconds, so that reporting adds no work to the
+    processing of each item. The throughput is a moving average of the rates observed in the recent intervals, which
+    follows changes of pace (e.g.: items skipped quickly when resuming) better than the average of the whole run.
+    """
+
+    def __init__(
+        self,
+        done: Callable[[], int],
+        total: Callable[[], Optional[int]],
+        interval: float = 30.0,
+        smoothing: float = 0.3,
+    ) -> None:
+        """Constructor
+
+        :param done: callable returning the number of items done so far
+        :param total: callable returning the (estimated) total number of items, or None if unknown
+        :param interval: interval in seconds between reports
+        :type interval: float
+        :param smoothing: weight of the last interval in the moving average of the throughput
+        :type smoothing: float
+        """
+        self._done = done
+        self._total = total
+        self.interval = interval
+        self.smoothing = smoothing
+        self.rate: Optional[float] = None
+        self._started = time.monotonic()
+        self._last = (self._started, 0)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def report(self) -> Dict[str, Any]:
+        """Log the current progress, and return its figures."""
+        now = time.monotonic()
+        done = self._done()
+        last_time, last_done = self._last
+        if now > last_time:
+            rate = (done - last_done) / (now - last_time)
+            self.rate = rate if self.rate is None else self.smoothing * rate + (1 - self.smoothing) * self.rate
+        self._last = (now, done)
+        try:
+            total = self._total()
+        except Exception as exc:  # the estimate must never interrupt the ingestion
+            LOGGER.debug("Could not estimate the number of items", exc_info=exc)
+            total = None
+        remaining = max(total - done, 0) if total is not None else None
+        eta = remaining / self.rate if remaining is not None and self.rate else None
+
+        message = f"Progress: {done} items done"
+        if total is not None:
+            message += f" of ~{max(total, done)} ({100 * done / max(total, done, 1):.1f}%), {remaining} remaining"
+        message += f", {self.rate or 0:.2f} items/s"
+        if eta is not None:
+            message += f", ETA {timedelta(seconds=round(eta))}"
+        progress = {
+            "items_done": done,
+            "items_total_estimate": total,
+            "items_remaining": remaining,
+            "items_per_second": self.rate,
+            "eta_seconds": eta,
+            "elapsed_seconds": now - self._started,
+        }
+        LOGGER.info(message, extra=progress)
+        return progress
+
+    def start(self) -> None:
+        self._started = time.monotonic()
+        self._last = (self._started, self._done())
+        self._thread = threading.Thread(target=self._run, name="progress", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.report()
+
+    def __enter__(self) -> "ProgressReporter":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
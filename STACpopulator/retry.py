@@ -0,0 +1,299 @@
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Collection, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.sessions import Session
+
+from STACpopulator.metrics import METRICS
+
+if TYPE_CHECKING:
+    import aiohttp
+
+LOGGER = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"])
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker pausing every request to a host that appears overloaded or unavailable.
+
+    The circuit of a host opens after ``threshold`` consecutive failures, or as soon as the host requests a delay with
+    a ``Retry-After`` header. Requests to that host then wait until the end of the ``cooldown`` (or requested delay)
+    before being sent again. The first success closes the circuit, while a failure reopens it immediately.
+
+    The breaker can be shared by multiple threads and event loops.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0) -> None:
+        """Constructor
+
+        :param threshold: number of consecutive failures of a host opening its circuit, 0 to disable the breaker
+        :type threshold: int
+        :param cooldown: delay in seconds during which requests to a host are paused once its circuit opens
+        :type cooldown: float
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+
+    def delay(self, host: str) -> float:
+        """Obtain the remaining delay in seconds before requests can be sent to a host."""
+        with self._lock:
+            return max(0.0, self._open_until.get(host, 0.0) - time.monotonic())
+
+    def wait(self, host: str) -> None:
+        """Block until the circuit of the host is closed."""
+        while (delay := self.delay(host)) > 0:
+            time.sleep(delay)
+
+    async def await_closed(self, host: str) -> None:
+        """Asynchronous counterpart of :meth:`wait`."""
+        while (delay := self.delay(host)) > 0:
+            await asyncio.sleep(delay)
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+            self._open_until.pop(host, None)
+
+    def record_failure(self, host: str, retry_after: Optional[float] = None) -> None:
+        if not self.threshold:
+            return
+        with self._lock:
+            failures = self._failures[host] = self._failures.get(host, 0) + 1
+            half_open = host in self._open_until
+            if retry_after is None and failures < self.threshold and not half_open:
+                return
+            delay = retry_after if retry_after is not None else self.cooldown
+            open_until = time.monotonic() + delay
+            if open_until <= self._open_until.get(host, 0.0):
+                return
+            self._open_until[host] = open_until
+        LOGGER.warning(
+            f"Pausing requests to {host} for {delay:.1f}s after {failures} consecutive failures",
+            extra={"host": host, "consecutive_failures": failures, "pause": delay},
+        )
+
+
+class RetryPolicy:
+    """
+    Retry policy shared by all requests: transient errors are retried with exponential backoff and full jitter.
+
+    Connection errors and responses with a ``retry_statuses`` status code are retried up to ``retries`` times. Since
+    the server may have processed a request whose response timed out, read timeouts are only retried for idempotent
+    methods, while certificate errors are never retried. The delay before the n-th retry is drawn uniformly between 0
+    and ``min(backoff_max, backoff * 2 ** n)``, unless the server provides a ``Retry-After`` header, which is honored
+    instead. Every failure is also reported to the :class:`CircuitBreaker` of the policy.
+    """
+
+    def __init__(
+        self,
+        retries: int = 5,
+        backoff: float = 0.5,
+        backoff_max: float = 60.0,
+        retry_statuses: Collection[int] = (429, 502, 503, 504),
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        """Constructor
+
+        :param retries: maximum number of retries of a request, 0 to disable retries
+        :type retries: int
+        :param backoff: base delay in seconds of the exponential backoff
+        :type backoff: float
+        :param backoff_max: maximum delay in seconds between two attempts, including those requested by the server
+        :type backoff_max: float
+        :param retry_statuses: status codes of the responses that are retried
+        :param breaker: circuit breaker employed to pause requests to failing hosts, defaults to a new one
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay in seconds before the retry following the given (0-based) attempt."""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2**attempt))
+
+    @staticmethod
+    def retry_after(headers: Any) -> Optional[float]:
+        """Parse the ``Retry-After`` header, expressed either in seconds or as an HTTP date."""
+        value = headers.get("Retry-After") if headers is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def retry_error(method: str, error: Exception) -> bool:
+        """Whether a request failing with the given :mod:`requests` or :mod:`aiohttp` error can be retried."""
+        if isinstance(error, requests.exceptions.SSLError):
+            return False
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.ConnectTimeout)):
+            return True
+        if isinstance(error, requests.exceptions.Timeout):
+            return method.upper() in IDEMPOTENT_METHODS
+        import aiohttp
+
+        if isinstance(error, aiohttp.ClientSSLError):
+            return False
+        # 'ConnectionTimeoutError' is only defined by aiohttp>=3.10
+        if isinstance(error, getattr(aiohttp, "ConnectionTimeoutError", ())):
+            return True
+        if isinstance(error, asyncio.TimeoutError):
+            return method.upper() in IDEMPOTENT_METHODS
+        return isinstance(error, aiohttp.ClientConnectionError)
+
+    def log_retry(
+        self,
+        method: str,
+        url: str,
+        attempt: int,
+        delay: float,
+        status: Optional[int] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        reason = f"status {status}" if status is not None else f"{type(error).__name__}"
+        LOGGER.warning(
+            f"Request {method} {url} failed with {reason}. Retrying in {delay:.2f}s "
+            f"(attempt {attempt + 1}/{self.retries})",
+            extra={
+                "url": url,
+                "method": method,
+                "status": status,
+                "error": str(error) if error is not None else None,
+                "retry_attempt": attempt + 1,
+                "retry_delay": delay,
+            },
+        )
+
+
+class RetryAdapter(HTTPAdapter):
+    """
+    Transport adapter applying a :class:`RetryPolicy` to every request of the :mod:`requests` session it is mounted on.
+    """
+
+    def __init__(self, policy: RetryPolicy, **kwargs: Any) -> None:
+        self.policy = policy
+        super().__init__(**kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        policy = self.policy
+        host = urlparse(request.url).netloc
+        attempt = 0
+        while True:
+            policy.breaker.wait(host)
+            try:
+                with METRICS.request(host):
+                    response = super().send(request, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
+                policy.breaker.record_failure(host)
+                if attempt >= policy.retries or not policy.retry_error(request.method, exc):
+                    raise
+                delay = policy.delay(attempt)
+                policy.log_retry(request.method, request.url, attempt, delay, error=exc)
+            else:
+                METRICS.record_response(host, response.status_code)
+                if response.status_code not in policy.retry_statuses:
+                    policy.breaker.record_success(host)
+                    return response
+                retry_after = policy.retry_after(response.headers)
+                policy.breaker.record_failure(host, retry_after)
+                if attempt >= policy.retries:
+                    return response
+                delay = policy.delay(attempt, retry_after)
+                policy.log_retry(request.method, request.url, attempt, delay, status=response.status_code)
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+
+def apply_retry_policy(session: Session, policy: RetryPolicy) -> None:
+    """Apply the policy to all HTTP(S) requests of the session.
+
+    The policy replaces the one of the :class:`RetryAdapter` already mounted on the session if any, preserving its
+    connection pools, or else a new adapter is mounted.
+    """
+    new_adapter = None
+    for prefix in ["http://", "https://"]:
+        adapter = session.get_adapter(prefix)
+        if isinstance(adapter, RetryAdapter):
+            adapter.policy = policy
+        else:
+            new_adapter = new_adapter or RetryAdapter(policy)
+            session.mount(prefix, new_adapter)
+
+
+def get_retry_policy(session: Optional[Session]) -> Optional[RetryPolicy]:
+    """Obtain the retry policy applied to the session, if any."""
+    if session is None:
+        return None
+    adapter = session.get_adapter("https://")
+    return adapter.policy if isinstance(adapter, RetryAdapter) else None
+
+
+async def arequest(
+    async_session: "aiohttp.ClientSession",
+    method: str,
+    url: str,
+    policy: Optional[RetryPolicy] = None,
+    **kwargs: Any,
+) -> "aiohttp.ClientResponse":
+    """Send an asynchronous request with :mod:`aiohttp`, applying the retry policy if any.
+
+    The body of the response is read before it is returned, so that it remains available once the connection is
+    released (e.g.: with ``await response.text()``).
+    """
+    import aiohttp
+
+    host = urlparse(url).netloc
+    attempt = 0
+    while True:
+        if policy is not None:
+            await policy.breaker.await_closed(host)
+        try:
+            with METRICS.request(host):
+                response = await async_session.request(method, url, **kwargs)
+                # reading the whole body returns the connection to the pool, while keeping the body available
+                await response.read()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+            if policy is None:
+                raise
+            policy.breaker.record_failure(host)
+            if attempt >= policy.retries or not policy.retry_error(method, exc):
+                raise
+            delay = policy.delay(attempt)
+            policy.log_retry(method, url, attempt, delay, error=exc)
+        else:
+            METRICS.record_response(host, response.status)
+            if policy is None:
+                return response
+            if response.status not in policy.retry_statuses:
+                policy.breaker.record_success(host)
+                return response
+            retry_after = policy.retry_after(response.headers)
+            policy.breaker.record_failure(host, retry_after)
+            if attempt >= policy.retries:
+                return response
+            delay = policy.delay(attempt, retry_after)
+            policy.log_retry(method, url, attempt, delay, status=response.status)
+        await asyncio.sleep(delay)
+        attempt += 1
@@ -0,0 +1,57 @@
+import json
+import math
+from datetime import date, datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    # values that the JSON encoders do not handle natively, found in NcML attributes and pystac dictionaries
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if hasattr(obj, "tolist"):  # numpy arrays and scalars
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _finite(obj: Any) -> Any:
+    # NaN and infinite values are not valid JSON, replaced by null as orjson does
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    if hasattr(obj, "tolist"):
+        return _finite(obj.tolist())
+    return obj
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize an object to compact JSON, as the UTF-8 bytes sent over the wire.
+
+    The bytes can be passed directly as the body of a request or written to a file, which avoids serializing the same
+    STAC item several times along its way. The optional ``orjson`` package is employed if installed, being several
+    times faster than the :mod:`json` module. Otherwise, the output is the same apart from insignificant whitespace.
+    In both cases, NaN and infinite values, which are not valid JSON, are serialized as ``null``.
+
+    :param obj: JSON compatible object, which may also contain tuples, datetimes and numpy values
+    :param indent: indent the JSON with 2 spaces for readability, instead of the compact representation
+    :return: the JSON representation of the object
+    :rtype: bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=_default, option=option)
+    options = {"indent": 2} if indent else {"separators": (",", ":")}
+    try:
+        return json.dumps(obj, default=_default, ensure_ascii=False, allow_nan=False, **options).encode()
+    except ValueError:
+        # only sanitize the rare objects having non-finite values, which the encoder rejects
+        return json.dumps(_finite(obj), default=_default, ensure_ascii=False, allow_nan=False, **options).encode()
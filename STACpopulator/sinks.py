@@ -0,0 +1,378 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import IO, TYPE_CHECKING, Any, Callable, Container, Literal, MutableMapping, Optional, Union
+
+from requests.sessions import Session
+
+from STACpopulator.api_requests import (
+    AdaptiveConcurrencyLimiter,
+    BulkItemUploader,
+    RequestCompression,
+    apost_stac_item,
+    create_async_session,
+    load_stac_item_ids,
+    post_stac_collection,
+    post_stac_item,
+)
+from STACpopulator.serialization import dumps
+
+if TYPE_CHECKING:
+    import aiohttp
+
+LOGGER = logging.getLogger(__name__)
+
+OutputType = Literal["api", "ndjson", "catalog"]
+
+# Callback receiving the name, location and JSON representation of an item.
+ItemCallback = Callable[[str, str, MutableMapping[str, Any]], None]
+
+
+class GenericSink(ABC):
+    """
+    Destination of the STAC Collection and Items produced by a populator.
+
+    Items that cannot be published raise an error from :meth:`publish_item`. Sinks that defer the publication of
+    items (e.g.: batches) instead report them with :attr:`on_failure`, called within the handler of the error, and
+    count them in :attr:`failures`. Every published item is reported with :attr:`on_success`.
+    """
+
+    # whether the sink requires the STAC API to be reachable
+    remote = False
+
+    def __init__(self) -> None:
+        self.on_success: Optional[ItemCallback] = None
+        self.on_failure: Optional[ItemCallback] = None
+        self.failures = 0
+
+    @abstractmethod
+    def publish_collection(self, collection_data: MutableMapping[str, Any]) -> None:
+        raise NotImplementedError
+
+    def update_collection(self, collection_data: MutableMapping[str, Any]) -> None:
+        """
+        Publish a new version of the STAC Collection, such as one with updated summaries, even without ``update``.
+        """
+        self.publish_collection(collection_data)
+
+    @abstractmethod
+    def publish_item(self, item_name: str, item_loc: str, stac_item: MutableMapping[str, Any]) -> None:
+        raise NotImplementedError
+
+    async def apublish_item(self, item_name: str, item_loc: str, stac_item: MutableMapping[str, Any]) -> None:
+        """
+        Asynchronous counterpart of :meth:`publish_item`, which is called from a worker thread by default.
+        """
+        await asyncio.to_thread(self.publish_item, item_name, item_loc, stac_item)
+
+    def flush(self) -> None:
+        """Publish any pending item."""
+
+    async def aclose(self) -> None:
+        """Release the resources employed by :meth:`apublish_item`."""
+
+    def close(self) -> None:
+        """Flush pending items and release resources."""
+        self.flush()
+
+    def _published(self, item_name: str, item_loc: str, stac_item: MutableMapping[str, Any]) -> None:
+        if self.on_success:
+            self.on_success(item_name, item_loc, stac_item)
+
+
+class STACAPISink(GenericSink):
+    """
+    Publishes the STAC Collection and Items to a STAC API, with optional batches of items using bulk transactions.
+    """
+
+    remote = True
+
+    def __init__(
+        self,
+        stac_host: str,
+        collection_id: str,
+        update: Optional[bool] = False,
+        session: Optional[Session] = None,
+        bulk_size: Optional[int] = None,
+        bulk_max_bytes: Optional[int] = 4 * 1024 * 1024,
+        async_limit: int = 100,
+        adaptive_concurrency: Optional[bool] = False,
+        preload_item_ids: Optional[bool] = False,
+        compression: Optional[RequestCompression] = None,
+    ) -> None:
+        """Constructor
+
+        :param bulk_size: If provided, items are posted in batches of (at most) this many items using the bulk
+          transaction endpoint of the STAC API, defaults to None (items are posted one by one)
+        :param bulk_max_bytes: Maximum size of the serialized items of a batch when ``bulk_size`` is provided
+        :param async_limit: Maximum number of simultaneous connections when items are published asynchronously.
+        :param adaptive_concurrency: If True, the number of items posted concurrently is adapted between 1 and
+          ``async_limit`` according to the latency and errors of the STAC API, using an
+          :class:`AdaptiveConcurrencyLimiter`.
+        :param preload_item_ids: If True and ``update`` is requested, the IDs of the items already in the collection
+          are loaded before the first item is published, in order to directly update those items instead of
+          attempting to create them first.
+        :param compression: Compression of the bodies of the requests to the STAC API, if any.
+        """
+        super().__init__()
+        self.stac_host = stac_host
+        self.collection_id = collection_id
+        self.update = update
+        self.async_limit = async_limit
+        self._session = session
+        self._async_session: Optional["aiohttp.ClientSession"] = None
+        self._limiter = AdaptiveConcurrencyLimiter(maximum=async_limit) if adaptive_concurrency else None
+        self._compression = compression
+        self.preload_item_ids = preload_item_ids and update
+        self._existing_items: Optional[Container[str]] = None
+        self._existing_items_lock = threading.Lock()
+        self._bulk_uploader = None
+        if bulk_size:
+            self._bulk_uploader = BulkItemUploader(
+                stac_host,
+                collection_id,
+                update=update,
+                session=session,
+                max_items=bulk_size,
+                max_bytes=bulk_max_bytes,
+                on_failure=self._deferred_failure,
+                on_success=self._published,
+                limiter=self._limiter,
+                compression=compression,
+            )
+
+    def publish_collection(self, collection_data: MutableMapping[str, Any]) -> None:
+        post_stac_collection(
+            self.stac_host, collection_data, self.update, session=self._session, compression=self._compression
+        )
+
+    def update_collection(self, collection_data: MutableMapping[str, Any]) -> None:
+        post_stac_collection(
+            self.stac_host, collection_data, update=True, session=self._session, compression=self._compression
+        )
+
+    def publish_item(self, item_name: str, item_loc: str, stac_item: MutableMapping[str, Any]) -> None:
+        if self._bulk_uploader:
+            self._bulk_uploader.add(item_name, item_loc, stac_item)
+            return
+        post_stac_item(
+            self.stac_host,
+            self.collection_id,
+            item_name,
+            stac_item,
+            update=self.update,
+            session=self._session,
+            limiter=self._limiter,
+            exists=self._item_exists(stac_item),
+            compression=self._compression,
+        )
+        self._published(item_name, item_loc, stac_item)
+
+    async def apublish_item(self, item_name: str, item_loc: str, stac_item: MutableMapping[str, Any]) -> None:
+        if self._bulk_uploader:
+            await asyncio.to_thread(self._bulk_uploader.add, item_name, item_loc, stac_item)
+            return
+        if self._async_session is None:
+            self._async_session = create_async_session(self._session, limit=self.async_limit)
+        if self.preload_item_ids and self._existing_items is None:
+            await asyncio.to_thread(self._load_existing_items)
+        await apost_stac_item(
+            self.stac_host,
+            self.collection_id,
+            item_name,
+            stac_item,
+            update=self.update,
+            session=self._session,
+            async_session=self._async_session,
+            limiter=self._limiter,
+            exists=self._item_exists(stac_item),
+            compression=self._compression,
+        )
+        self._published(item_name, item_loc, stac_item)
+
+    def _load_existing_items(self) -> Container[str]:
+        with self._existing_items_lock:
+            if self._existing_items is None:
+                self._existing_items = load_stac_item_ids(self.stac_host, self.collection_id, session=self._session)
+        return self._existing_items
+
+    def _item_exists(self, stac_item: MutableMapping[str, Any]) -> Optional[bool]:
+        if not self.preload_item_ids:
+            return None
+        return stac_item["id"] in self._load_existing_items()
+
+    def flush(self) -> None:
+        if self._bulk_uploader:
+            self._bulk_uploader.flush()
+
+    async def aclose(self) -> None:
+        if self._async_session is not None:
+            await self._async_session.close()
+            self._async_session = None
+
+    def _deferred_failure(self, item_name: str, item_loc: str, stac_item: MutableMapping[str, Any]) -> None:
+        self.failures += 1
+        if self.on_failure:
+            self.on_failure(item_name, item_loc, stac_item)
+
+
+class NDJSONSink(GenericSink):
+    """
+    Appends the STAC Items to a newline-delimited JSON file, for instance to be loaded with ``pypgstac load``.
+
+    The file is compressed according to its extension: ``.gz`` (gzip) or ``.zst`` (zstandard, which requires the
+    optional ``zstandard`` package). Successive runs append to the same file, as compressed streams support it.
+    STAC Collections are appended to a distinct file named after the items file (``<name>.collections.ndjson``),
+    where updated versions of a collection replace the previous ones.
+    """
+
+    def __init__(self, path: Union[os.PathLike[str], str], collection_id: str) -> None:
+        super().__init__()
+        self.path = os.fspath(path)
+        self.collection_id = collection_id
+        self._lock = threading.Lock()
+        self._file = self._open(self.path)
+
+    @staticmethod
+    def _open(path: str) -> IO[bytes]:
+        if path.endswith(".zst"):
+            try:
+                import zstandard
+            except ImportError as exc:  # pragma: no cover
+                raise ImportError("Package 'zstandard' is required to write '.zst' compressed outputs.") from exc
+            return zstandard.ZstdCompressor().stream_writer(open(path, "ab"), closefd=True)
+        if path.endswith(".gz"):
+            return gzip.open(path, "ab")
+        return open(path, "ab")
+
+    @property
+    def collections_path(self) -> str:
+        base = self.path
+        for ext in [".zst", ".gz", ".ndjson", ".jsonl", ".json"]:
+            if base.endswith(ext):
+                base = base[: -len(ext)]
+        return f"{base}.collections.ndjson"
+
+    def publish_collection(self, collection_data: MutableMapping[str, Any]) -> None:
+        with open(self.collections_path, "ab") as file:
+            file.write(dumps(collection_data) + b"\n")
+        LOGGER.info(f"Collection {collection_data['id']} written to [{self.collections_path}]")
+
+    def update_collection(self, collection_data: MutableMapping[str, Any]) -> None:
+        """
+        Replace the previous versions of the STAC Collection in the collections file, keeping the other collections.
+
+        The file is rewritten atomically, so that periodic updates of the summaries leave a single line per collection.
+        """
+        lines = []
+        if os.path.exists(self.collections_path):
+            with open(self.collections_path, "rb") as file:
+                lines = [line for line in file if line.strip() and json.loads(line)["id"] != collection_data["id"]]
+        lines.append(dumps(collection_data) + b"\n")
+        tmp_path = f"{self.collections_path}.tmp-{threading.get_ident()}"
+        with open(tmp_path, "wb") as file:
+            file.writelines(lines)
+        os.replace(tmp_path, self.collections_path)
+        LOGGER.info(f"Collection {collection_data['id']} updated in [{self.collections_path}]")
+
+    def publish_item(self, item_name: str, item_loc: str, stac_item: MutableMapping[str, Any]) -> None:
+        if "collection" not in stac_item:
+            stac_item = {**stac_item, "collection": self.collection_id}
+        line = dumps(stac_item) + b"\n"
+        with self._lock:
+            self._file.write(line)
+        self._published(item_name, item_loc, stac_item)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        LOGGER.info(f"Items written to [{self.path}]")
+
+
+class StaticCatalogSink(GenericSink):
+    """
+    Writes a static STAC catalog on disk.
+
+    The layout is ``<path>/catalog.json``, ``<path>/<collection-id>/collection.json`` and
+    ``<path>/<collection-id>/<item-id>.json``, which can also be published later with the ``DirectoryLoader``
+    implementation. Files are replaced atomically so that an interrupted run never leaves partially written files.
+    """
+
+    def __init__(self, path: Union[os.PathLike[str], str], collection_id: str, update: Optional[bool] = False) -> None:
+        super().__init__()
+        self.path = os.fspath(path)
+        self.collection_id = collection_id
+        self.update = update
+        self.collection_dir = os.path.join(self.path, collection_id)
+        os.makedirs(self.collection_dir, exist_ok=True)
+
+    def publish_collection(self, collection_data: MutableMapping[str, Any], update: Optional[bool] = None) -> None:
+        collection_path = os.path.join(self.collection_dir, "collection.json")
+        if os.path.exists(collection_path) and not (self.update if update is None else update):
+            LOGGER.info(f"Collection {self.collection_id} already exists.")
+        else:
+            collection_data = dict(collection_data)
+            collection_data["links"] = [
+                link for link in collection_data.get("links", []) if link.get("rel") not in ["root", "parent", "self"]
+            ] + [
+                {"rel": "root", "href": "../catalog.json", "type": "application/json"},
+                {"rel": "parent", "href": "../catalog.json", "type": "application/json"},
+            ]
+            self._write(collection_path, collection_data)
+        self._update_catalog()
+
+    def update_collection(self, collection_data: MutableMapping[str, Any]) -> None:
+        self.publish_collection(collection_data, update=True)
+
+    def publish_item(self, item_name: str, item_loc: str, stac_item: MutableMapping[str, Any]) -> None:
+        item_path = os.path.join(self.collection_dir, f"{stac_item['id']}.json")
+        if os.path.exists(item_path) and not self.update:
+            LOGGER.warning(f"Item {stac_item['id']} already exists.", extra={"item_path": item_path})
+        else:
+            self._write(item_path, self._link_item(stac_item))
+        self._published(item_name, item_loc, stac_item)
+
+    def _link_item(self, stac_item: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        stac_item = dict(stac_item)
+        stac_item["collection"] = self.collection_id
+        stac_item["links"] = [
+            link for link in stac_item.get("links", []) if link.get("rel") not in ["root", "parent", "collection"]
+        ] + [
+            {"rel": "root", "href": "../catalog.json", "type": "application/json"},
+            {"rel": "parent", "href": "./collection.json", "type": "application/json"},
+            {"rel": "collection", "href": "./collection.json", "type": "application/json"},
+        ]
+        return stac_item
+
+    def _update_catalog(self) -> None:
+        catalog_path = os.path.join(self.path, "catalog.json")
+        if os.path.exists(catalog_path):
+            with open(catalog_path, encoding="utf-8") as file:
+                catalog = json.load(file)
+        else:
+            catalog = {
+                "type": "Catalog",
+                "stac_version": "1.0.0",
+                "id": "catalog",
+                "description": "Static catalog written by STACpopulator.",
+                "links": [{"rel": "root", "href": "./catalog.json", "type": "application/json"}],
+            }
+        child = {"rel": "child", "href": f"./{self.collection_id}/collection.json", "type": "application/json"}
+        if child not in catalog["links"]:
+            catalog["links"].append(child)
+            self._write(catalog_path, catalog)
+
+    @staticmethod
+    def _write(path: str, data: MutableMapping[str, Any]) -> None:
+        tmp_path = f"{path}.tmp-{threading.get_ident()}"
+        with open(tmp_path, "wb") as file:
+            file.write(dumps(data, indent=True))
+        os.replace(tmp_path, path)
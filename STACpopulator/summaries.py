@@ -0,0 +1,173 @@
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Set, Tuple, Union
+
+from pystac.utils import datetime_to_str, str_to_datetime
+
+LOGGER = logging.getLogger(__name__)
+
+Scalar = Union[str, int, float, bool]
+
+
+class CollectionSummarizer:
+    """
+    Streaming aggregation of the properties and extents of the STAC Items of a collection.
+
+    Every item added updates the distinct values of its scalar properties, the minimum and maximum of its numeric
+    properties, and the spatial and temporal envelope of the collection. Memory is bounded regardless of the number
+    of items: a property stops being summarized by its distinct values once it has more than ``max_distinct`` of
+    them, in which case only its range remains if it is numeric.
+
+    Items can be added from multiple threads.
+    """
+
+    def __init__(self, prefixes: Optional[Iterable[str]] = None, max_distinct: int = 256) -> None:
+        """Constructor
+
+        :param prefixes: If provided, only the properties starting with one of these prefixes are summarized
+        :type prefixes: Iterable[str], optional
+        :param max_distinct: Maximum number of distinct values retained for each property
+        :type max_distinct: int
+        """
+        self.prefixes = tuple(prefixes) if prefixes is not None else None
+        self.max_distinct = max_distinct
+        self.count = 0
+        self._lock = threading.Lock()
+        self._distinct: Dict[str, Set[Scalar]] = {}
+        self._overflow: Set[str] = set()
+        self._ranges: Dict[str, List[Union[int, float]]] = {}
+        self._bbox: Optional[List[float]] = None
+        self._interval: Optional[List[Optional[datetime]]] = None
+
+    def add(self, stac_item: MutableMapping[str, Any]) -> None:
+        """Update the aggregation with the properties, bounding box and datetimes of a STAC Item."""
+        properties = stac_item.get("properties") or {}
+        start, end = self._item_interval(properties)
+        bbox = stac_item.get("bbox")
+        with self._lock:
+            self.count += 1
+            for prop, value in properties.items():
+                if prop in ["datetime", "start_datetime", "end_datetime"]:
+                    continue
+                if self.prefixes is not None and not prop.startswith(self.prefixes):
+                    continue
+                for val in value if isinstance(value, list) else [value]:
+                    self._add_value(prop, val)
+            if bbox:
+                dims = len(bbox) // 2
+                self._extend_bbox([bbox[0], bbox[1], bbox[dims], bbox[dims + 1]])
+            if start or end:
+                self._extend_interval(start, end)
+
+    def _add_value(self, prop: str, value: Any) -> None:
+        if not isinstance(value, (str, int, float, bool)):
+            return
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value_range = self._ranges.get(prop)
+            if value_range is None:
+                self._ranges[prop] = [value, value]
+            else:
+                value_range[0] = min(value_range[0], value)
+                value_range[1] = max(value_range[1], value)
+        if prop in self._overflow:
+            return
+        values = self._distinct.setdefault(prop, set())
+        values.add(value)
+        if len(values) > self.max_distinct:
+            del self._distinct[prop]
+            self._overflow.add(prop)
+
+    def _extend_bbox(self, bbox: List[float]) -> None:
+        if self._bbox is None:
+            self._bbox = list(bbox)
+        else:
+            self._bbox = [
+                min(self._bbox[0], bbox[0]),
+                min(self._bbox[1], bbox[1]),
+                max(self._bbox[2], bbox[2]),
+                max(self._bbox[3], bbox[3]),
+            ]
+
+    def _extend_interval(self, start: Optional[datetime], end: Optional[datetime]) -> None:
+        if self._interval is None:
+            self._interval = [start, end]
+            return
+        if start and (self._interval[0] is None or start < self._interval[0]):
+            self._interval[0] = start
+        if end and (self._interval[1] is None or end > self._interval[1]):
+            self._interval[1] = end
+
+    @staticmethod
+    def _item_interval(properties: MutableMapping[str, Any]) -> Tuple[Optional[datetime], Optional[datetime]]:
+        start = properties.get("start_datetime") or properties.get("datetime")
+        end = properties.get("end_datetime") or properties.get("datetime")
+        return (str_to_datetime(start) if start else None, str_to_datetime(end) if end else None)
+
+    def summaries(self) -> Dict[str, Any]:
+        """Summaries of the properties: the sorted distinct values, or the range of numeric properties with too many."""
+        with self._lock:
+            summaries: Dict[str, Any] = {}
+            for prop in sorted(set(self._distinct) | set(self._ranges)):
+                if prop in self._distinct:
+                    summaries[prop] = sorted(self._distinct[prop], key=lambda val: (type(val).__name__, val))
+                else:
+                    summaries[prop] = {"minimum": self._ranges[prop][0], "maximum": self._ranges[prop][1]}
+            return summaries
+
+    def extent(self) -> Optional[Dict[str, Any]]:
+        """Spatial and temporal extent of the items, in the JSON representation of a STAC Collection."""
+        with self._lock:
+            if self._bbox is None and self._interval is None:
+                return None
+            interval = [datetime_to_str(dt) if dt else None for dt in self._interval or [None, None]]
+            return {
+                "spatial": {"bbox": [self._bbox or [-180.0, -90.0, 180.0, 90.0]]},
+                "temporal": {"interval": [interval]},
+            }
+
+    def apply(self, collection_data: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        """Obtain a copy of the collection with the aggregated summaries and extent.
+
+        Summaries of the properties found in the items replace those of the collection, while the other ones are
+        preserved. The placeholder ``needs_summaries_update`` summary is removed once any item was aggregated.
+        """
+        collection_data = dict(collection_data)
+        summaries = dict(collection_data.get("summaries") or {})
+        if self.count:
+            summaries.pop("needs_summaries_update", None)
+        summaries.update(self.summaries())
+        collection_data["summaries"] = summaries
+        extent = self.extent()
+        if extent:
+            collection_data["extent"] = extent
+        return collection_data
+
+    def dumps(self) -> str:
+        """Serialize the state of the aggregation, to be restored with :meth:`loads`."""
+        with self._lock:
+            return json.dumps(
+                {
+                    "count": self.count,
+                    "distinct": {prop: list(values) for prop, values in self._distinct.items()},
+                    "overflow": sorted(self._overflow),
+                    "ranges": self._ranges,
+                    "bbox": self._bbox,
+                    "interval": [datetime_to_str(dt) if dt else None for dt in self._interval]
+                    if self._interval
+                    else None,
+                }
+            )
+
+    def loads(self, state: str) -> None:
+        """Restore the state of the aggregation, such as the one of the items processed by a previous run."""
+        data = json.loads(state)
+        with self._lock:
+            self.count = data["count"]
+            self._distinct = {prop: set(values) for prop, values in data["distinct"].items()}
+            self._overflow = set(data["overflow"])
+            self._ranges = data["ranges"]
+            self._bbox = data["bbox"]
+            if data["interval"]:
+                self._interval = [str_to_datetime(dt) if dt else None for dt in data["interval"]]
@@ -0,0 +1,145 @@
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import ContextManager, Dict, Iterator, List, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+# Upper bounds (in seconds) of the histogram buckets: 4 buckets per doubling from 1ms up to about 70 minutes,
+# which bounds the relative error of the percentiles to about 19% with constant memory.
+BUCKET_BOUNDS: List[float] = [0.001 * 2 ** (i / 4) for i in range(89)]
+
+# durations of the stages of the item being processed in the current context
+_ITEM_STAGES: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("item_stages", default=None)
+
+
+class StageStats:
+    """
+    Count, errors, total duration, bytes and latency histogram of a stage.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.bytes = 0
+        self.maximum = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def add(self, duration: float, nbytes: int = 0, error: bool = False) -> None:
+        self.count += 1
+        self.errors += int(error)
+        self.total += duration
+        self.bytes += nbytes
+        self.maximum = max(self.maximum, duration)
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS, duration)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Approximate the q-th percentile (between 0 and 100) of the durations, in seconds."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.maximum
+                return min(bound, self.maximum)
+        return self.maximum
+
+    def copy(self) -> "StageStats":
+        stats = StageStats()
+        stats.__dict__.update(self.__dict__, buckets=list(self.buckets))
+        return stats
+
+
+class StageTimer:
+    """Measure of a single execution of a stage, whose transferred ``bytes`` can be set while it runs."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.bytes = 0
+        self.duration = 0.0
+
+
+class StageTimings:
+    """
+    Aggregated timings of the stages of an ingestion (catalog crawl, metadata requests, item creation, posting, etc.).
+
+    Stages are measured with :meth:`stage`, from any thread or coroutine. The durations of the stages measured while
+    processing an item within :func:`item_stages` are also collected for that item.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stages: Dict[str, StageStats] = {}
+
+    def record(self, name: str, duration: float, nbytes: int = 0, error: bool = False) -> None:
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = StageStats()
+            stats.add(duration, nbytes, error)
+        item_stages = _ITEM_STAGES.get()
+        if item_stages is not None:
+            item_stages[name] = item_stages.get(name, 0.0) + duration
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageTimer]:
+        """Measure the duration of a stage, and whether it fails."""
+        timer = StageTimer(name)
+        start = time.perf_counter()
+        error = False
+        try:
+            yield timer
+        except BaseException:
+            error = True
+            raise
+        finally:
+            timer.duration = time.perf_counter() - start
+            self.record(name, timer.duration, timer.bytes, error)
+
+    def snapshot(self) -> Dict[str, StageStats]:
+        """Copy of the statistics of every stage."""
+        with self._lock:
+            return {name: stats.copy() for name, stats in self._stages.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+    def summary(self) -> str:
+        """Table of the statistics of every stage."""
+        header = f"{'stage':<16} {'count':>8} {'errors':>7} {'total (s)':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} "
+        header += f"{'p99 (ms)':>9} {'bytes':>12}"
+        lines = [header, "-" * len(header)]
+        for name, stats in self.snapshot().items():
+            lines.append(
+                f"{name:<16} {stats.count:>8} {stats.errors:>7} {stats.total:>10.2f} "
+                f"{stats.percentile(50) * 1000:>9.1f} {stats.percentile(95) * 1000:>9.1f} "
+                f"{stats.percentile(99) * 1000:>9.1f} {stats.bytes:>12}"
+            )
+        return "\n".join(lines)
+
+
+# timings shared by the loaders and populators of the current process
+TIMINGS = StageTimings()
+
+
+def stage(name: str) -> ContextManager[StageTimer]:
+    """Measure a stage with the shared :data:`TIMINGS`."""
+    return TIMINGS.stage(name)
+
+
+@contextmanager
+def item_stages() -> Iterator[Dict[str, float]]:
+    """Collect the durations of the stages measured while processing an item in the current context."""
+    durations: Dict[str, float] = {}
+    token = _ITEM_STAGES.set(durations)
+    try:
+        yield durations
+    finally:
+        _ITEM_STAGES.reset(token)
@@ -0,0 +1,67 @@
+import threading
+from typing import Optional
+
+from requests.sessions import Session
+
+from STACpopulator.retry import CircuitBreaker, RetryAdapter, RetryPolicy
+
+# connections kept alive per host by default, matching the default of requests
+DEFAULT_POOL_SIZE = 10
+
+_default_session: Optional[Session] = None
+_default_session_lock = threading.Lock()
+
+
+def configure_session(
+    session: Session,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    policy: Optional[RetryPolicy] = None,
+    max_hosts: int = 10,
+) -> Session:
+    """Mount the transport of the project on all HTTP(S) requests of a session.
+
+    Each host gets a pool of up to ``pool_size`` connections that are kept alive between requests, which avoids
+    repeating the TCP and TLS handshakes. Requests exceeding the pool wait for a connection to be returned instead of
+    opening extra ones that would be discarded after a single use. The pool size should therefore be at least the
+    number of requests sent concurrently to a same host.
+
+    :param session: session to configure
+    :type session: Session
+    :param pool_size: maximum number of connections per host
+    :type pool_size: int
+    :param policy: retry policy applied to the requests, defaults to no retries
+    :type policy: RetryPolicy, optional
+    :param max_hosts: number of hosts whose connection pools are cached
+    :type max_hosts: int
+    :return: the configured session
+    :rtype: Session
+    """
+    if policy is None:
+        policy = RetryPolicy(retries=0, breaker=CircuitBreaker(threshold=0))
+    adapter = RetryAdapter(policy, pool_connections=max_hosts, pool_maxsize=pool_size, pool_block=True)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session(session: Optional[Session] = None) -> Session:
+    """Obtain the session to employ for a request: the provided one, or else a session shared by the whole process.
+
+    The shared session ensures that connections are pooled even when no session is provided, unlike the functions of
+    the :mod:`requests` module, which open a new connection for every request.
+    """
+    if session is not None:
+        return session
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = configure_session(Session())
+        return _default_session
+
+
+def get_pool_size(session: Optional[Session]) -> Optional[int]:
+    """Obtain the maximum number of connections per host of a session configured by :func:`configure_session`."""
+    if session is None:
+        return None
+    adapter = session.get_adapter("https://")
+    return adapter._pool_maxsize if isinstance(adapter, RetryAdapter) else None
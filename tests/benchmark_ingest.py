@@ -0,0 +1,73 @@
+"""
+Throughput benchmark of the ingestion of STAC items into the local stand-in STAC API.
+
+Copies of the items of the directory test data are ingested with the ``DirectoryLoader`` populator into a
+:class:`STACpopulator.local_api.LocalSTACAPI` simulating the latency and errors of a remote server. Options after
+``--`` are passed to the populator, in order to compare ingestion modes on the same workload.
+
+Run with ``make benchmark-ingest`` or, for instance::
+
+    python tests/benchmark_ingest.py --items 2000 --latency 0.02 -- --workers 8 --bulk-size 100
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from STACpopulator.implementations.DirectoryLoader import crawl_directory
+from STACpopulator.local_api import LocalSTACAPI
+
+CUR_DIR = os.path.dirname(__file__)
+
+
+def make_directory(path: str, items: int) -> None:
+    source = os.path.join(CUR_DIR, "data", "test_directory")
+    with open(os.path.join(source, "collection.json"), encoding="utf-8") as file:
+        collection = json.load(file)
+    collection["links"] = [link for link in collection["links"] if link["rel"] != "item"]
+    with open(os.path.join(path, "collection.json"), "w", encoding="utf-8") as file:
+        json.dump(collection, file)
+    with open(os.path.join(source, "item-0.json"), encoding="utf-8") as file:
+        item = json.load(file)
+    for index in range(items):
+        with open(os.path.join(path, f"item-{index}.json"), "w", encoding="utf-8") as file:
+            json.dump({**item, "id": f"{item['id']}-{index}"}, file)
+
+
+def main(*args: str) -> None:
+    args = list(args or sys.argv[1:])
+    populator_args = args[args.index("--") + 1 :] if "--" in args else []
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--items", type=int, default=1000, help="Number of items to ingest.")
+    parser.add_argument("--latency", type=float, default=0.01, help="Latency of the API responses in seconds.")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="Random latency added to the responses.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of transient API errors.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random latency and errors.")
+    ns = parser.parse_args(args[: args.index("--")] if "--" in args else args)
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as path:
+        make_directory(path, ns.items)
+        api = LocalSTACAPI(
+            prefix="/stac",
+            latency=ns.latency,
+            latency_jitter=ns.latency_jitter,
+            error_rate=ns.error_rate,
+            seed=ns.seed,
+        )
+        with api:
+            start = time.perf_counter()
+            crawl_directory.main(api.url, path, "--progress-interval", "0", *populator_args)
+            elapsed = time.perf_counter() - start
+            requests = sum(api.requests.values())
+            errors = sum(count for (_, status), count in api.requests.items() if status >= 400)
+    print(f"populator options: {' '.join(populator_args) or '(defaults)'}")
+    print(f"{ns.items} items in {elapsed:.2f}s: {ns.items / elapsed:.1f} items/s, {requests} requests, {errors} errors")
+
+
+if __name__ == "__main__":
+    main()
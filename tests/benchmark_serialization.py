@@ -0,0 +1,88 @@
+"""
+Micro-benchmark of the serialization of STAC items built from the NcML test files.
+
+Compares the former path, where every item was converted to JSON and back by the populator before being serialized
+again by ``requests`` when posted, with :func:`STACpopulator.serialization.dumps` producing the request body once.
+
+Run with ``make benchmark-serialization`` or ``python tests/benchmark_serialization.py [repeat]``.
+"""
+
+import datetime
+import json
+import os
+import sys
+import timeit
+import warnings
+
+import pystac
+import xncml
+from pystac.extensions.datacube import DatacubeExtension
+
+from STACpopulator import serialization
+from STACpopulator.extensions.datacube import DataCubeHelper
+from STACpopulator.extensions.thredds import THREDDSExtension, THREDDSHelper
+
+CUR_DIR = os.path.dirname(__file__)
+NCML_FILES = [
+    "clt_Amon_EC-Earth3_historical_r2i1p1f1_gr_185001-201412.xml",
+    "o3_Amon_GFDL-ESM4_historical_r1i1p1f1_gr1_185001-194912.xml",
+]
+
+
+def build_item(file_name: str) -> pystac.Item:
+    """Build an item like the populators do, without the CMIP6 extension that requires the pyessv archive."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        attrs = xncml.Dataset(filepath=os.path.join(CUR_DIR, "data", file_name)).to_cf_dict()
+    url = f"https://example.com/thredds/fileServer/{file_name}"
+    attrs["access_urls"] = {"HTTPServer": url, "OPENDAP": url.replace("fileServer", "dodsC")}
+    properties = {f"cmip6:{name}": val for name, val in attrs["attributes"].items() if isinstance(val, str)}
+    time = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+    item = pystac.Item(
+        id=os.path.splitext(file_name)[0],
+        geometry={"type": "Point", "coordinates": [0, 0]},
+        bbox=[0, 0, 0, 0],
+        properties=properties,
+        datetime=None,
+        start_datetime=time,
+        end_datetime=time,
+    )
+    dc_helper = DataCubeHelper(attrs)
+    dc_ext = DatacubeExtension.ext(item, add_if_missing=True)
+    dc_ext.apply(dimensions=dc_helper.dimensions, variables=dc_helper.variables)
+    thredds_helper = THREDDSHelper(attrs["access_urls"])
+    THREDDSExtension.ext(item).apply(thredds_helper.services, thredds_helper.links)
+    return item
+
+
+def round_trip(item: pystac.Item) -> bytes:
+    # former path: 'json.loads(json.dumps(item.to_dict()))' in the populator, then 'json=' in requests
+    return json.dumps(json.loads(json.dumps(item.to_dict()))).encode()
+
+
+def single_pass(item: pystac.Item) -> bytes:
+    return serialization.dumps(item.to_dict())
+
+
+def main(repeat: int = 2000) -> None:
+    items = [build_item(file_name) for file_name in NCML_FILES]
+    orjson = serialization.orjson
+    cases = [("round trip (json)", round_trip, None), ("single pass (json)", single_pass, None)]
+    if orjson is not None:
+        cases.append(("single pass (orjson)", single_pass, orjson))
+
+    baseline = None
+    print(f"{len(items)} items of {sum(len(round_trip(item)) for item in items) // len(items)} bytes on average")
+    for name, func, backend in cases:
+        serialization.orjson = backend
+        try:
+            seconds = min(timeit.repeat(lambda: [func(item) for item in items], number=repeat, repeat=3))
+        finally:
+            serialization.orjson = orjson
+        per_item = seconds / (repeat * len(items)) * 1e6
+        baseline = baseline or per_item
+        print(f"{name:<24} {per_item:8.1f} us/item  {baseline / per_item:5.2f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
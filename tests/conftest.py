@@ -0,0 +1,28 @@
+import argparse
+import os
+from typing import Any, Callable
+
+import pytest
+
+from STACpopulator.implementations.DirectoryLoader import crawl_directory
+
+CUR_DIR = os.path.dirname(__file__)
+
+
+@pytest.fixture
+def directory_namespace() -> Callable[..., argparse.Namespace]:
+    """Factory of the arguments of the directory populator, populating the test STAC host with the test directory.
+
+    Options not overridden keep the defaults of the command line parser.
+    """
+
+    def make(**options: Any) -> argparse.Namespace:
+        ns = crawl_directory.make_parser().parse_args(
+            ["http://test-host.com/stac/", os.path.join(CUR_DIR, "data/test_directory"), "--update", "--no-verify"]
+        )
+        unknown = set(options) - set(vars(ns))
+        assert not unknown, f"Unknown options of the directory populator: {sorted(unknown)}"
+        vars(ns).update(options)
+        return ns
+
+    return make
@@ -0,0 +1,277 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+
+import pytest
+import requests
+import responses
+
+from STACpopulator.api_requests import (
+    AdaptiveConcurrencyLimiter,
+    BulkItemUploader,
+    RequestCompression,
+    load_stac_item_ids,
+    post_stac_item,
+)
+from STACpopulator.bloom import BloomFilter
+
+STAC_HOST = "http://test-host.com/stac/"
+COLLECTION_ID = "test-collection"
+ITEMS_URL = f"{STAC_HOST}collections/{COLLECTION_ID}/items"
+BULK_URL = f"{STAC_HOST}collections/{COLLECTION_ID}/bulk_items"
+
+
+def make_item(index: int) -> dict:
+    return {"type": "Feature", "id": f"item-{index}", "properties": {"index": index}}
+
+
+@pytest.mark.parametrize("update", [True, False])
+def test_bulk_uploader_flushes_by_count(update: bool):
+    with responses.RequestsMock() as request_mock:
+        request_mock.add("POST", BULK_URL)
+        uploader = BulkItemUploader(STAC_HOST, COLLECTION_ID, update=update, max_items=2)
+        for i in range(5):
+            uploader.add(f"item-{i}.nc", f"/data/item-{i}.nc", make_item(i))
+        assert len(request_mock.calls) == 2
+        uploader.flush()
+        assert len(request_mock.calls) == 3
+
+        bodies = [json.loads(call.request.body) for call in request_mock.calls]
+        assert [list(body["items"]) for body in bodies] == [["item-0", "item-1"], ["item-2", "item-3"], ["item-4"]]
+        assert all(body["method"] == ("upsert" if update else "insert") for body in bodies)
+        assert uploader.failures == 0
+
+
+def test_bulk_uploader_flushes_by_size():
+    item_size = len(json.dumps(make_item(0)))
+    with responses.RequestsMock() as request_mock:
+        request_mock.add("POST", BULK_URL)
+        uploader = BulkItemUploader(STAC_HOST, COLLECTION_ID, max_items=100, max_bytes=int(item_size * 2.5))
+        for i in range(3):
+            uploader.add(f"item-{i}.nc", f"/data/item-{i}.nc", make_item(i))
+        assert len(request_mock.calls) == 1
+        assert list(json.loads(request_mock.calls[0].request.body)["items"]) == ["item-0", "item-1"]
+
+
+def test_bulk_uploader_reports_rejected_items_individually():
+    failed = []
+    with responses.RequestsMock() as request_mock:
+        request_mock.add("POST", BULK_URL, status=400)
+        request_mock.add("POST", ITEMS_URL)
+        request_mock.add("POST", ITEMS_URL, status=400)
+        request_mock.add("POST", ITEMS_URL)
+        uploader = BulkItemUploader(
+            STAC_HOST,
+            COLLECTION_ID,
+            max_items=3,
+            on_failure=lambda name, loc, data: failed.append(name),
+        )
+        for i in range(3):
+            uploader.add(f"item-{i}.nc", f"/data/item-{i}.nc", make_item(i))
+
+        assert len(request_mock.calls) == 4
+        assert uploader.failures == 1
+        assert failed == ["item-1.nc"]
+
+
+@pytest.mark.parametrize("failure", [{"status": 503}, {"body": requests.exceptions.ConnectionError()}])
+def test_bulk_uploader_fails_batch_on_transient_error(failure: dict):
+    failed = []
+    with responses.RequestsMock() as request_mock:
+        request_mock.add("POST", BULK_URL, **failure)
+        uploader = BulkItemUploader(
+            STAC_HOST,
+            COLLECTION_ID,
+            session=requests.Session(),  # without retries
+            max_items=3,
+            on_failure=lambda name, loc, data: failed.append(name),
+        )
+        for i in range(3):
+            uploader.add(f"item-{i}.nc", f"/data/item-{i}.nc", make_item(i))
+
+        # the items are not posted individually to the failing host
+        assert [call.request.url for call in request_mock.calls] == [BULK_URL]
+        assert uploader.failures == 3
+        assert failed == ["item-0.nc", "item-1.nc", "item-2.nc"]
+
+
+def test_bulk_uploader_disabled_when_unsupported():
+    with responses.RequestsMock() as request_mock:
+        request_mock.add("POST", BULK_URL, status=404)
+        request_mock.add("POST", ITEMS_URL)
+        uploader = BulkItemUploader(STAC_HOST, COLLECTION_ID, max_items=1)
+        for i in range(3):
+            uploader.add(f"item-{i}.nc", f"/data/item-{i}.nc", make_item(i))
+
+        urls = [call.request.url for call in request_mock.calls]
+        assert urls == [BULK_URL, ITEMS_URL, ITEMS_URL, ITEMS_URL]
+        assert uploader.failures == 0
+
+
+def test_adaptive_limiter_grows_and_backs_off():
+    limiter = AdaptiveConcurrencyLimiter(minimum=1, maximum=8)
+    for _ in range(7):  # windows of 1, 2 and 4 healthy requests (slow start)
+        with limiter:
+            limiter.record(0.1, 200)
+    assert limiter.limit == 8
+
+    with limiter:
+        limiter.record(0.1, 503)
+    assert limiter.limit == 4
+    with limiter:
+        limiter.record(0.5, 200)  # latency degraded compared to the baseline
+    assert limiter.limit == 2
+
+    # additive increase after the first decrease
+    for _ in range(2):
+        with limiter:
+            limiter.record(0.1, 200)
+    assert limiter.limit == 3
+
+    # client errors are not a sign of overload
+    with limiter:
+        limiter.record(0.1, 400)
+    assert limiter.limit == 3
+
+
+def test_adaptive_limiter_ignores_requests_in_flight_on_decrease():
+    limiter = AdaptiveConcurrencyLimiter(minimum=1, maximum=8)
+    limiter.limit = 8
+    for _ in range(4):
+        limiter.acquire()
+    limiter.record(1.0, 503)
+    limiter.release()
+    assert limiter.limit == 4
+    for _ in range(3):  # sent under the previous limit
+        limiter.record(1.0, 503)
+        limiter.release()
+    assert limiter.limit == 4
+
+
+def test_adaptive_limiter_bounds_concurrency():
+    limiter = AdaptiveConcurrencyLimiter(minimum=2, maximum=2)
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def request():
+        with limiter:
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+
+    async def arequest():
+        async with limiter:
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            with lock:
+                in_flight.pop()
+
+    async def run_async():
+        await asyncio.gather(*[arequest() for _ in range(6)])
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    threads.append(threading.Thread(target=asyncio.run, args=(run_async(),)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(peak) == 12
+    assert max(peak) == 2
+
+
+@pytest.mark.parametrize("max_exact", [10, 2])
+def test_load_stac_item_ids(max_exact: int):
+    next_url = f"{ITEMS_URL}?token=next:item-1"
+    with responses.RequestsMock() as request_mock:
+        request_mock.add(
+            "GET",
+            ITEMS_URL,
+            match=[responses.matchers.query_param_matcher({"limit": "2", "fields": "id"})],
+            json={
+                "features": [{"id": "item-0"}, {"id": "item-1"}],
+                "numberMatched": 3,
+                "links": [{"rel": "next", "href": next_url}],
+            },
+        )
+        request_mock.add("GET", next_url, json={"features": [{"id": "item-2"}], "links": []})
+        ids = load_stac_item_ids(STAC_HOST, COLLECTION_ID, page_size=2, max_exact=max_exact)
+        assert len(request_mock.calls) == 2
+
+    assert isinstance(ids, set if max_exact == 10 else BloomFilter)
+    assert all(f"item-{i}" in ids for i in range(3))
+    assert "item-3" not in ids
+
+
+def test_load_stac_item_ids_missing_collection():
+    with responses.RequestsMock() as request_mock:
+        request_mock.add("GET", ITEMS_URL, status=404)
+        assert load_stac_item_ids(STAC_HOST, COLLECTION_ID) == set()
+
+
+def test_post_stac_item_known_to_exist():
+    item_url = f"{ITEMS_URL}/item-0"
+    with responses.RequestsMock() as request_mock:
+        request_mock.add("PUT", item_url)
+        post_stac_item(STAC_HOST, COLLECTION_ID, "item-0.nc", make_item(0), update=True, exists=True)
+        assert [call.request.method for call in request_mock.calls] == ["PUT"]
+
+    # the item may be missing after all (e.g.: false positive of a Bloom filter)
+    with responses.RequestsMock() as request_mock:
+        request_mock.add("PUT", item_url, status=404)
+        request_mock.add("POST", ITEMS_URL)
+        post_stac_item(STAC_HOST, COLLECTION_ID, "item-0.nc", make_item(0), update=True, exists=True)
+        assert [call.request.method for call in request_mock.calls] == ["PUT", "POST"]
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"item-{i}")
+    assert all(f"item-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_post_stac_item_compressed():
+    compression = RequestCompression("gzip", min_size=0)
+    item = make_item(0)
+    with responses.RequestsMock() as request_mock:
+        request_mock.add("POST", ITEMS_URL)
+        post_stac_item(STAC_HOST, COLLECTION_ID, "item-0.nc", item, compression=compression)
+        request = request_mock.calls[0].request
+        assert request.headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(request.body)) == item
+
+
+def test_post_stac_item_compression_invalid_item():
+    compression = RequestCompression("gzip", min_size=0)
+    with responses.RequestsMock() as request_mock:
+        request_mock.add("POST", ITEMS_URL, status=400)
+        request_mock.add("POST", ITEMS_URL)
+        with pytest.raises(requests.exceptions.HTTPError):
+            post_stac_item(STAC_HOST, COLLECTION_ID, "item-0.nc", make_item(0), compression=compression)
+        post_stac_item(STAC_HOST, COLLECTION_ID, "item-1.nc", make_item(1), compression=compression)
+        # an invalid item is not sent again, and compression remains enabled
+        encodings = [call.request.headers.get("Content-Encoding") for call in request_mock.calls]
+        assert encodings == ["gzip", "gzip"]
+
+
+def test_post_stac_item_compression_rejected():
+    compression = RequestCompression("gzip", min_size=0)
+    with responses.RequestsMock() as request_mock:
+        request_mock.add("POST", ITEMS_URL, status=415)
+        request_mock.add("POST", ITEMS_URL)
+        request_mock.add("POST", ITEMS_URL)
+        for i in range(2):
+            post_stac_item(STAC_HOST, COLLECTION_ID, f"item-{i}.nc", make_item(i), compression=compression)
+        encodings = [call.request.headers.get("Content-Encoding") for call in request_mock.calls]
+        # the rejected request is sent again uncompressed, then compression is disabled for the host
+        assert encodings == ["gzip", None, None]
@@ -0,0 +1,15 @@
+import argparse
+import inspect
+
+from STACpopulator.cli import add_ingest_options, ingest_kwargs
+from STACpopulator.populator_base import STACpopulatorBase
+
+
+def test_ingest_kwargs():
+    parser = argparse.ArgumentParser()
+    add_ingest_options(parser)
+    ns = parser.parse_args([])
+    kwargs = ingest_kwargs(ns)
+    # every ingestion option is passed to the populators, which accept all of them
+    assert set(kwargs) == set(vars(ns))
+    assert set(kwargs) <= set(inspect.signature(STACpopulatorBase.__init__).parameters)
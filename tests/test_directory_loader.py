@@ -1,10 +1,16 @@
-import argparse
 import json
 import os
+import shutil
+
 import pytest
+import requests
 import responses
 
+from STACpopulator.api_requests import load_stac_item_ids
 from STACpopulator.implementations.DirectoryLoader import crawl_directory
+from STACpopulator.journal import IngestJournal
+from STACpopulator.local_api import LocalSTACAPI
+from STACpopulator.serialization import dumps
 
 CUR_DIR = os.path.dirname(__file__)
 
@@ -13,16 +19,17 @@ CUR_DIR = os.path.dirname(__file__)
     "prune_option",
     [True, False]
 )
-def test_directory_loader_populator_runner(prune_option: bool):
-    ns = argparse.Namespace()
+@pytest.mark.parametrize(
+    "workers",
+    [1, 4]
+)
+@pytest.mark.parametrize(
+    "processes",
+    [None, 2]
+)
+def test_directory_loader_populator_runner(directory_namespace, prune_option: bool, workers: int, processes: int):
     stac_host = "http://test-host.com/stac/"
-    setattr(ns, "verify", False)
-    setattr(ns, "cert", None)
-    setattr(ns, "auth_handler", None)
-    setattr(ns, "stac_host", stac_host)
-    setattr(ns, "directory", os.path.join(CUR_DIR, "data/test_directory"))
-    setattr(ns, "prune", prune_option)
-    setattr(ns, "update", True)
+    ns = directory_namespace(stac_host=stac_host, prune=prune_option, workers=workers, processes=processes)
 
     file_id_map = {
         "collection.json": "EuroSAT-subset-train",
@@ -37,7 +44,7 @@ def test_directory_loader_populator_runner(prune_option: bool):
         ref_file = os.path.join(CUR_DIR, "data/test_directory", file_name)
         with open(ref_file, mode="r", encoding="utf-8") as f:
             json_data = json.load(f)
-            file_contents[file_name] = json.dumps(json_data, indent=None).encode()
+            file_contents[file_name] = dumps(json_data)
 
     with responses.RequestsMock(assert_all_requests_are_fired=False) as request_mock:
         request_mock.add("GET", stac_host, json={"stac_version": "1.0.0", "type": "Catalog"})
@@ -98,3 +105,85 @@ def test_directory_loader_populator_runner(prune_option: bool):
 
             assert request_mock.calls[item1_idx].request.path_url == f"/stac/collections/{nested_col}/items"
             assert request_mock.calls[item1_idx].request.body == file_contents["nested/item-1.json"]
+
+
+def test_directory_loader_populator_runner_resume(directory_namespace, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # error report of the failed item written in current directory
+    stac_host = "http://test-host.com/stac/"
+    ns = directory_namespace(stac_host=stac_host, prune=True, journal=str(tmp_path / "journal.db"), resume=True)
+    closed_journals = []
+    close_journal = IngestJournal.close
+    monkeypatch.setattr(IngestJournal, "close", lambda journal: closed_journals.append(close_journal(journal)))
+
+    items_url = f"{stac_host}collections/EuroSAT-subset-train/items"
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as request_mock:
+        request_mock.add("GET", stac_host, json={"stac_version": "1.0.0", "type": "Catalog"})
+        request_mock.add("POST", f"{stac_host}collections")
+        request_mock.add("POST", items_url, status=500)  # first item fails
+        request_mock.add("POST", items_url)
+
+        crawl_directory.runner(ns)
+        assert [call.request.url for call in request_mock.calls][2:] == [items_url, items_url]
+        failed_item = json.loads(request_mock.calls[2].request.body)["id"]
+
+        # only the failed item should be posted again
+        crawl_directory.runner(ns)
+        assert [call.request.url for call in request_mock.calls][6:] == [items_url]
+        assert json.loads(request_mock.calls[6].request.body)["id"] == failed_item
+    assert len(closed_journals) == 2
+
+
+def test_directory_loader_populator_runner_incremental(directory_namespace, tmp_path):
+    data_dir = tmp_path / "data"
+    shutil.copytree(os.path.join(CUR_DIR, "data/test_directory"), data_dir)
+
+    stac_host = "http://test-host.com/stac/"
+    ns = directory_namespace(
+        stac_host=stac_host,
+        directory=str(data_dir),
+        prune=True,
+        journal=str(tmp_path / "journal.db"),
+        incremental=True,
+    )
+
+    items_url = f"{stac_host}collections/EuroSAT-subset-train/items"
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as request_mock:
+        request_mock.add("GET", stac_host, json={"stac_version": "1.0.0", "type": "Catalog"})
+        request_mock.add("POST", f"{stac_host}collections")
+        request_mock.add("POST", items_url)
+
+        crawl_directory.runner(ns)
+        assert len(request_mock.calls) == 4
+
+        # nothing changed, no item should be posted
+        crawl_directory.runner(ns)
+        assert len(request_mock.calls) == 6
+
+        # only the modified item should be posted
+        item_path = data_dir / "item-1.json"
+        os.utime(item_path, ns=(item_path.stat().st_atime_ns, item_path.stat().st_mtime_ns + 10**9))
+        crawl_directory.runner(ns)
+        assert len(request_mock.calls) == 9
+        assert json.loads(request_mock.calls[8].request.body)["id"] == "EuroSAT-subset-train-sample-1-class-AnnualCrop"
+
+
+@pytest.fixture
+def api():
+    with LocalSTACAPI(prefix="/stac") as api:
+        yield api
+
+
+def test_directory_loader_populator_runner_async(directory_namespace, api: LocalSTACAPI):
+    pytest.importorskip("aiohttp")
+
+    ns = directory_namespace(stac_host=api.url, prune=True, workers=4, asynchronous=True)
+
+    crawl_directory.runner(ns)
+
+    collections = requests.get(f"{api.url}collections").json()["collections"]
+    assert [collection["id"] for collection in collections] == ["EuroSAT-subset-train"]
+    assert load_stac_item_ids(api.url, "EuroSAT-subset-train") == {
+        "EuroSAT-subset-train-sample-0-class-AnnualCrop",
+        "EuroSAT-subset-train-sample-1-class-AnnualCrop",
+    }
+    assert api.requests[("POST", 200)] == 3
@@ -0,0 +1,106 @@
+import gzip
+import json
+import os
+
+import pytest
+import requests
+
+from STACpopulator.api_requests import (
+    BulkItemUploader,
+    load_stac_item_ids,
+    post_stac_collection,
+    post_stac_item,
+    stac_host_reachable,
+)
+from STACpopulator.implementations.DirectoryLoader import crawl_directory
+from STACpopulator.local_api import LocalSTACAPI
+
+CUR_DIR = os.path.dirname(__file__)
+COLLECTION_ID = "test-collection"
+
+
+def make_item(index: int) -> dict:
+    return {"type": "Feature", "id": f"item-{index}", "properties": {"index": index}}
+
+
+@pytest.fixture
+def api():
+    with LocalSTACAPI(prefix="/stac") as api:
+        yield api
+
+
+def test_local_api_transactions(api: LocalSTACAPI):
+    assert stac_host_reachable(api.url)
+    items_url = f"{api.url}collections/{COLLECTION_ID}/items"
+    assert requests.post(items_url, json=make_item(0)).status_code == 404
+
+    post_stac_collection(api.url, {"id": COLLECTION_ID, "description": "first"})
+    post_stac_collection(api.url, {"id": COLLECTION_ID, "description": "updated"}, update=True)
+    assert requests.get(f"{api.url}collections/{COLLECTION_ID}").json()["description"] == "updated"
+
+    for i in range(5):
+        post_stac_item(api.url, COLLECTION_ID, f"item-{i}.nc", make_item(i))
+    assert requests.post(items_url, json=make_item(0)).status_code == 409
+    assert requests.put(f"{items_url}/item-9", json=make_item(9)).status_code == 404
+    post_stac_item(api.url, COLLECTION_ID, "item-0.nc", {**make_item(0), "properties": {"index": -1}}, update=True)
+    assert requests.get(f"{items_url}/item-0").json()["properties"]["index"] == -1
+    assert load_stac_item_ids(api.url, COLLECTION_ID, page_size=2) == {f"item-{i}" for i in range(5)}
+
+    body = gzip.compress(json.dumps(make_item(5)).encode())
+    r = requests.post(items_url, data=body, headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+    assert r.status_code == 200
+    # corrupted or truncated bodies are reported as an unsupported encoding, not as a server error
+    for corrupted in [b"not gzip", body[:-4], body[:10] + b"x" * 20]:
+        headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+        assert requests.post(items_url, data=corrupted, headers=headers).status_code == 415
+
+    # a bulk insert conflicting with an existing item is rejected as a whole, unlike an upsert
+    bulk_url = f"{api.url}collections/{COLLECTION_ID}/bulk_items"
+    items = {item["id"]: item for item in map(make_item, [5, 6])}
+    assert requests.post(bulk_url, json={"items": items, "method": "insert"}).status_code == 409
+    assert requests.get(f"{items_url}/item-6").status_code == 404
+    assert requests.post(bulk_url, json={"items": items, "method": "upsert"}).status_code == 200
+    assert requests.get(items_url, params={"limit": 100}).json()["numberMatched"] == 7
+
+
+def test_local_api_error_injection():
+    statuses = []
+    for _ in range(2):
+        with LocalSTACAPI(error_rate=0.5, retry_after=1, seed=42) as api:
+            responses = [requests.get(api.url) for _ in range(20)]
+        statuses.append([r.status_code for r in responses])
+        assert {r.headers.get("Retry-After") for r in responses if r.status_code == 503} == {"1"}
+    assert statuses[0] == statuses[1]  # reproducible
+    assert 0 < statuses[0].count(503) < 20
+
+    with LocalSTACAPI(compression=False) as api:
+        post_stac_collection(api.url, {"id": COLLECTION_ID})
+        body = gzip.compress(json.dumps(make_item(0)).encode())
+        r = requests.post(
+            f"{api.url}collections/{COLLECTION_ID}/items",
+            data=body,
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+        assert r.status_code == 415
+
+
+def test_local_api_bulk_uploader(api: LocalSTACAPI):
+    post_stac_collection(api.url, {"id": COLLECTION_ID})
+    post_stac_item(api.url, COLLECTION_ID, "item-2.nc", make_item(2))
+    uploader = BulkItemUploader(api.url, COLLECTION_ID, update=False, max_items=3)
+    for i in range(6):
+        uploader.add(f"item-{i}.nc", f"/data/item-{i}.nc", make_item(i))
+    uploader.flush()
+    assert load_stac_item_ids(api.url, COLLECTION_ID) == {f"item-{i}" for i in range(6)}
+    assert api.requests[("POST", 409)] == 2  # the conflicting batch, then its existing item posted individually
+
+
+@pytest.mark.parametrize("options", [[], ["--workers", "4"], ["--bulk-size", "2"], ["--async"]])
+def test_local_api_directory_populator(api: LocalSTACAPI, options):
+    if "--async" in options:
+        pytest.importorskip("aiohttp")
+    crawl_directory.main(api.url, os.path.join(CUR_DIR, "data/test_directory"), "--progress-interval", "0", *options)
+    collections = requests.get(f"{api.url}collections").json()["collections"]
+    assert {collection["id"] for collection in collections} == {"EuroSAT-subset-train", "EuroSAT-subset-test"}
+    for collection in collections:
+        assert len(load_stac_item_ids(api.url, collection["id"])) == 2
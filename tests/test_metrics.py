@@ -0,0 +1,55 @@
+import os
+import stat
+import urllib.request
+
+import pytest
+
+from STACpopulator.metrics import IngestMetrics, MetricsExporter
+from STACpopulator.timing import StageTimings
+
+
+@pytest.fixture
+def metrics() -> IngestMetrics:
+    timings = StageTimings()
+    with timings.stage("ncml") as timer:
+        timer.bytes = 100
+    metrics = IngestMetrics(timings)
+    metrics.item_processed()
+    metrics.item_outcome("posted")
+    metrics.item_outcome("post_failed")
+    metrics.set_queue_depth("pending_items", 3)
+    with metrics.request("stac.example.com"):
+        metrics.record_response("stac.example.com", 201)
+    with pytest.raises(ConnectionError):
+        with metrics.request("stac.example.com"):
+            raise ConnectionError
+    return metrics
+
+
+def test_metrics_render(metrics):
+    lines = metrics.render().splitlines()
+    assert "stac_populator_items_processed_total 1" in lines
+    assert 'stac_populator_items_total{status="post_failed"} 1' in lines
+    assert 'stac_populator_stage_bytes_total{stage="ncml"} 100' in lines
+    assert 'stac_populator_stage_duration_seconds_count{stage="ncml"} 1' in lines
+    assert 'stac_populator_requests_in_flight{host="stac.example.com"} 0' in lines
+    assert 'stac_populator_request_duration_seconds_bucket{host="stac.example.com",le="+Inf"} 2' in lines
+    assert 'stac_populator_request_errors_total{host="stac.example.com"} 1' in lines
+    assert 'stac_populator_responses_total{host="stac.example.com",code="201"} 1' in lines
+    assert 'stac_populator_queue_depth{queue="pending_items"} 3' in lines
+    # histogram buckets are cumulative
+    prefix = "stac_populator_stage_duration_seconds_bucket"
+    buckets = [int(line.rsplit(" ", 1)[1]) for line in lines if line.startswith(prefix)]
+    assert buckets == sorted(buckets)
+    assert buckets[-1] == 1
+
+
+def test_metrics_exporter(metrics, tmp_path):
+    textfile = tmp_path / "stac_populator.prom"
+    with MetricsExporter(port=0, textfile=textfile, interval=60, metrics=metrics) as exporter:
+        with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics") as response:
+            assert response.read().decode() == metrics.render()
+    with open(textfile) as file:
+        assert "stac_populator_items_processed_total 1\n" in file.read()
+    if os.name == "posix":
+        assert stat.S_IMODE(os.stat(textfile).st_mode) == 0o644
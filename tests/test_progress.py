@@ -0,0 +1,44 @@
+import logging
+import os
+
+from STACpopulator.input import STACDirectoryLoader
+from STACpopulator.progress import ProgressReporter
+
+CUR_DIR = os.path.dirname(__file__)
+
+
+def test_progress_reporter(monkeypatch, caplog):
+    clock = [100.0]
+    monkeypatch.setattr("STACpopulator.progress.time.monotonic", lambda: clock[0])
+    done = [0]
+    reporter = ProgressReporter(lambda: done[0], lambda: 100, interval=10, smoothing=0.5)
+
+    clock[0] += 10
+    done[0] = 20
+    with caplog.at_level(logging.INFO, logger="STACpopulator.progress"):
+        progress = reporter.report()
+    assert progress["items_per_second"] == 2
+    assert progress["items_remaining"] == 80
+    assert progress["eta_seconds"] == 40
+    assert "ETA 0:00:40" in caplog.records[-1].getMessage()
+
+    clock[0] += 10
+    done[0] = 60
+    progress = reporter.report()
+    assert progress["items_per_second"] == 3  # moving average of 2 and 4 items/s
+    assert progress["eta_seconds"] == 40 / 3
+
+
+def test_progress_reporter_unknown_total():
+    reporter = ProgressReporter(lambda: 5, lambda: None)
+    progress = reporter.report()
+    assert progress["items_total_estimate"] is None
+    assert progress["eta_seconds"] is None
+
+
+def test_directory_loader_estimate_total():
+    path = os.path.join(CUR_DIR, "data/test_directory")
+    loader = STACDirectoryLoader(path, "item")
+    assert loader.estimate_total() == len(list(loader)) == 2
+    assert STACDirectoryLoader(path, "collection").estimate_total() == 2
+    assert STACDirectoryLoader(path, "collection", prune=True).estimate_total() == 1
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+
+import pytest
+import requests
+import responses
+
+from STACpopulator.api_requests import post_stac_item
+from STACpopulator.retry import CircuitBreaker, RetryPolicy, apply_retry_policy
+
+STAC_HOST = "http://test-host.com/stac/"
+ITEMS_URL = f"{STAC_HOST}collections/test-collection/items"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr("STACpopulator.retry.time.sleep", delays.append)
+    return delays
+
+
+def make_session(**kwargs) -> requests.Session:
+    session = requests.Session()
+    apply_retry_policy(session, RetryPolicy(**kwargs))
+    return session
+
+
+def test_retry_transient_errors(sleeps, caplog):
+    session = make_session(retries=3, backoff=1.0, breaker=CircuitBreaker(threshold=0))
+    with responses.RequestsMock() as request_mock:
+        request_mock.add("POST", ITEMS_URL, status=503)
+        request_mock.add("POST", ITEMS_URL, status=429, headers={"Retry-After": "7"})
+        request_mock.add("POST", ITEMS_URL)
+        with caplog.at_level(logging.WARNING, logger="STACpopulator.retry"):
+            post_stac_item(STAC_HOST, "test-collection", "item.nc", {"id": "item"}, session=session)
+        assert len(request_mock.calls) == 3
+
+    assert 0 <= sleeps[0] <= 1.0  # jittered backoff of the first attempt
+    assert sleeps[1] == 7  # requested by the server
+    assert [record.retry_attempt for record in caplog.records if hasattr(record, "retry_attempt")] == [1, 2]
+
+
+def test_retry_exhausted(sleeps):
+    session = make_session(retries=2, breaker=CircuitBreaker(threshold=0))
+    with responses.RequestsMock() as request_mock:
+        request_mock.add("POST", ITEMS_URL, status=502)
+        with pytest.raises(requests.exceptions.HTTPError):
+            post_stac_item(STAC_HOST, "test-collection", "item.nc", {"id": "item"}, session=session)
+        assert len(request_mock.calls) == 3
+    assert len(sleeps) == 2
+
+
+def test_retry_not_applied_to_client_errors(sleeps):
+    session = make_session()
+    with responses.RequestsMock() as request_mock:
+        request_mock.add("POST", ITEMS_URL, status=400)
+        with pytest.raises(requests.exceptions.HTTPError):
+            post_stac_item(STAC_HOST, "test-collection", "item.nc", {"id": "item"}, session=session)
+        assert len(request_mock.calls) == 1
+    assert sleeps == []
+
+
+@pytest.mark.parametrize(
+    ["method", "error", "calls"],
+    [
+        ("POST", requests.exceptions.ConnectTimeout(), 3),
+        ("POST", requests.exceptions.ReadTimeout(), 1),
+        ("GET", requests.exceptions.ReadTimeout(), 3),
+        ("GET", requests.exceptions.SSLError(), 1),
+        ("GET", requests.exceptions.ConnectionError(), 3),
+    ],
+)
+def test_retry_errors(sleeps, method, error, calls):
+    session = make_session(retries=2, breaker=CircuitBreaker(threshold=0))
+    with responses.RequestsMock() as request_mock:
+        request_mock.add(method, ITEMS_URL, body=error)
+        with pytest.raises(type(error)):
+            session.request(method, ITEMS_URL)
+        assert len(request_mock.calls) == calls
+
+
+def test_retry_aiohttp_errors():
+    aiohttp = pytest.importorskip("aiohttp")
+    connection_key = type("ConnectionKey", (), {"ssl": None})()
+    assert not RetryPolicy.retry_error("GET", aiohttp.ClientSSLError(connection_key, OSError()))
+    assert RetryPolicy.retry_error("POST", aiohttp.ClientConnectorError(connection_key, OSError()))
+    assert RetryPolicy.retry_error("GET", aiohttp.ServerTimeoutError())
+    assert not RetryPolicy.retry_error("POST", aiohttp.ServerTimeoutError())
+    assert not RetryPolicy.retry_error("POST", asyncio.TimeoutError())
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(threshold=2, cooldown=30)
+    breaker.record_failure("host")
+    assert breaker.delay("host") == 0
+    breaker.record_failure("host")
+    assert 29 < breaker.delay("host") <= 30
+    assert breaker.delay("other-host") == 0
+    breaker.record_success("host")
+    assert breaker.delay("host") == 0
+
+    # a delay requested by the server pauses the host immediately
+    breaker.record_failure("host", retry_after=5)
+    assert 4 < breaker.delay("host") <= 5
@@ -0,0 +1,55 @@
+import json
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from STACpopulator import serialization
+from STACpopulator.serialization import dumps
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_dumps(monkeypatch, fast: bool):
+    if not fast:
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    data = {
+        "id": "item-é",
+        "bbox": (-180.0, -90.0, 180.0, 90.0),
+        "properties": {"datetime": datetime(2020, 1, 1), "size": np.int32(3), "values": np.arange(2)},
+    }
+    body = dumps(data)
+    assert isinstance(body, bytes)
+    assert json.loads(body) == {
+        "id": "item-é",
+        "bbox": [-180.0, -90.0, 180.0, 90.0],
+        "properties": {"datetime": "2020-01-01T00:00:00", "size": 3, "values": [0, 1]},
+    }
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_dumps_nan(monkeypatch, fast: bool):
+    if not fast:
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    data = {
+        "nan": float("nan"),
+        "inf": float("-inf"),
+        "values": (1.5, float("inf")),
+        "numpy": {"scalar": np.float32("nan"), "array": np.array([1.0, np.nan])},
+    }
+    assert dumps(data) == b'{"nan":null,"inf":null,"values":[1.5,null],"numpy":{"scalar":null,"array":[1.0,null]}}'
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_dumps_indent(monkeypatch, fast: bool):
+    if not fast:
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    data = {"id": "item", "bbox": [0, 1], "properties": {"value": float("nan")}}
+    body = dumps(data, indent=True)
+    assert body.decode().splitlines()[:3] == ["{", '  "id": "item",', '  "bbox": [']
+    assert json.loads(body) == {"id": "item", "bbox": [0, 1], "properties": {"value": None}}
@@ -0,0 +1,122 @@
+import gzip
+import json
+import os
+
+import pytest
+import responses
+
+from STACpopulator.implementations.DirectoryLoader import crawl_directory
+from STACpopulator.sinks import NDJSONSink, StaticCatalogSink
+
+COLLECTION_ID = "test-collection"
+
+
+def make_item(index: int) -> dict:
+    return {"type": "Feature", "id": f"item-{index}", "properties": {"index": index}, "links": []}
+
+
+@pytest.mark.parametrize("file_name", ["items.ndjson", "items.ndjson.gz"])
+def test_ndjson_sink_appends_items(tmp_path, file_name: str):
+    path = tmp_path / file_name
+    published = []
+    for run in range(2):
+        sink = NDJSONSink(path, COLLECTION_ID)
+        sink.on_success = lambda name, loc, data: published.append(name)
+        sink.publish_collection({"id": COLLECTION_ID, "type": "Collection"})
+        sink.publish_item(f"item-{run}.nc", f"/data/item-{run}.nc", make_item(run))
+        sink.close()
+
+    with (gzip.open if file_name.endswith(".gz") else open)(path, "rt") as file:
+        items = [json.loads(line) for line in file]
+    assert [item["id"] for item in items] == ["item-0", "item-1"]
+    assert all(item["collection"] == COLLECTION_ID for item in items)
+    assert published == ["item-0.nc", "item-1.nc"]
+    with open(tmp_path / "items.collections.ndjson") as file:
+        assert len(file.readlines()) == 2
+
+
+def test_ndjson_sink_update_collection(tmp_path):
+    sink = NDJSONSink(tmp_path / "items.ndjson", COLLECTION_ID)
+    sink.publish_collection({"id": "other-collection", "type": "Collection"})
+    sink.publish_collection({"id": COLLECTION_ID, "type": "Collection"})
+    for version in range(2):
+        sink.update_collection({"id": COLLECTION_ID, "type": "Collection", "version": version})
+    sink.close()
+
+    with open(tmp_path / "items.collections.ndjson") as file:
+        collections = [json.loads(line) for line in file]
+    assert [collection["id"] for collection in collections] == ["other-collection", COLLECTION_ID]
+    assert collections[1]["version"] == 1
+    assert sorted(os.listdir(tmp_path)) == ["items.collections.ndjson", "items.ndjson"]
+
+
+@pytest.mark.parametrize("update", [True, False])
+def test_static_catalog_sink_layout(tmp_path, update: bool):
+    sink = StaticCatalogSink(tmp_path, COLLECTION_ID, update=update)
+    sink.publish_collection({"id": COLLECTION_ID, "type": "Collection", "links": []})
+    sink.publish_item("item-0.nc", "/data/item-0.nc", make_item(0))
+    sink.publish_item("item-0.nc", "/data/item-0.nc", {**make_item(0), "properties": {"index": 1}})
+    sink.close()
+
+    with open(tmp_path / "catalog.json") as file:
+        catalog = json.load(file)
+    assert {"rel": "child", "href": f"./{COLLECTION_ID}/collection.json", "type": "application/json"} in (
+        catalog["links"]
+    )
+    assert os.path.isfile(tmp_path / COLLECTION_ID / "collection.json")
+    with open(tmp_path / COLLECTION_ID / "item-0.json") as file:
+        item = json.load(file)
+    assert item["collection"] == COLLECTION_ID
+    assert item["properties"]["index"] == (1 if update else 0)
+    assert sorted(os.listdir(tmp_path / COLLECTION_ID)) == ["collection.json", "item-0.json"]
+
+
+def test_sinks_write_valid_json(tmp_path):
+    collection = {"id": COLLECTION_ID, "type": "Collection", "links": [], "extent": {"nan": float("nan")}}
+    item = {**make_item(0), "properties": {"index": float("inf")}}
+
+    sink = NDJSONSink(tmp_path / "items.ndjson", COLLECTION_ID)
+    sink.publish_collection(collection)
+    sink.update_collection(collection)
+    sink.publish_item("item-0.nc", "/data/item-0.nc", item)
+    sink.close()
+    sink = StaticCatalogSink(tmp_path / "catalog", COLLECTION_ID)
+    sink.publish_collection(collection)
+    sink.publish_item("item-0.nc", "/data/item-0.nc", item)
+    sink.close()
+
+    def strict(value: str):
+        raise ValueError(f"invalid JSON constant {value}")
+
+    for path in ["items.ndjson", "items.collections.ndjson", f"catalog/{COLLECTION_ID}/collection.json"]:
+        with open(tmp_path / path) as file:
+            json.loads(file.readline() if path.endswith(".ndjson") else file.read(), parse_constant=strict)
+    with open(tmp_path / "catalog" / COLLECTION_ID / "item-0.json") as file:
+        assert json.loads(file.read(), parse_constant=strict)["properties"]["index"] is None
+
+
+def test_directory_loader_populator_runner_ndjson_output(directory_namespace, tmp_path):
+    ns = directory_namespace(output="ndjson", output_path=str(tmp_path / "items.ndjson"))
+
+    # the STAC API must not be contacted at all
+    with responses.RequestsMock() as request_mock:
+        crawl_directory.runner(ns)
+        assert len(request_mock.calls) == 0
+
+    with open(tmp_path / "items.ndjson") as file:
+        items = [json.loads(line) for line in file]
+    assert {item["id"] for item in items} == {
+        "EuroSAT-subset-train-sample-0-class-AnnualCrop",
+        "EuroSAT-subset-train-sample-1-class-AnnualCrop",
+        "EuroSAT-subset-test-sample-0-class-AnnualCrop",
+        "EuroSAT-subset-test-sample-1-class-AnnualCrop",
+    }
+
+    # without summaries, the collections are published as is and never updated
+    with open(tmp_path / "items.collections.ndjson") as file:
+        collections = [json.loads(line) for line in file]
+    assert len(collections) == 2
+    for collection in collections:
+        path = "collection.json" if collection["id"] == "EuroSAT-subset-train" else "nested/collection.json"
+        with open(os.path.join(os.path.dirname(__file__), "data/test_directory", path)) as file:
+            assert collection == json.load(file)
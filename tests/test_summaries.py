@@ -0,0 +1,75 @@
+import json
+import os
+
+from STACpopulator.implementations.DirectoryLoader import crawl_directory
+from STACpopulator.summaries import CollectionSummarizer
+
+CUR_DIR = os.path.dirname(__file__)
+
+
+def make_item(index: int) -> dict:
+    return {
+        "type": "Feature",
+        "id": f"item-{index}",
+        "bbox": [index, -index, index + 10, 10],
+        "properties": {
+            "start_datetime": f"20{10 + index}-01-01T00:00:00Z",
+            "end_datetime": f"20{10 + index}-12-31T00:00:00Z",
+            "cmip6:variable_id": ["tas", "pr"][index % 2],
+            "cmip6:realization_index": index,
+            "cmip6:tracking_id": f"hdl:{index}",
+            "eo:bands": [{"name": "B01"}],
+            "other": "ignored",
+        },
+    }
+
+
+def test_collection_summarizer():
+    summarizer = CollectionSummarizer(prefixes=["cmip6:"], max_distinct=3)
+    for i in range(5):
+        summarizer.add(make_item(i))
+
+    assert summarizer.summaries() == {
+        "cmip6:variable_id": ["pr", "tas"],
+        "cmip6:realization_index": {"minimum": 0, "maximum": 4},
+    }
+    assert summarizer.extent() == {
+        "spatial": {"bbox": [[0, -4, 14, 10]]},
+        "temporal": {"interval": [["2010-01-01T00:00:00Z", "2014-12-31T00:00:00Z"]]},
+    }
+
+    collection = summarizer.apply(
+        {"id": "test", "summaries": {"needs_summaries_update": ["true"], "cmip6:mip_era": ["CMIP6"]}}
+    )
+    assert collection["summaries"] == {"cmip6:mip_era": ["CMIP6"], **summarizer.summaries()}
+    assert collection["extent"] == summarizer.extent()
+
+    restored = CollectionSummarizer(prefixes=["cmip6:"], max_distinct=3)
+    restored.loads(summarizer.dumps())
+    restored.add(make_item(5))
+    assert restored.count == 6
+    assert restored.summaries()["cmip6:realization_index"] == {"minimum": 0, "maximum": 5}
+    assert restored.extent()["temporal"]["interval"] == [["2010-01-01T00:00:00Z", "2015-12-31T00:00:00Z"]]
+
+
+def test_directory_loader_populator_runner_summaries(directory_namespace, tmp_path):
+    ns = directory_namespace(
+        prune=True,
+        output="ndjson",
+        output_path=str(tmp_path / "items.ndjson"),
+        summaries=True,
+        summaries_interval=0,
+    )
+
+    crawl_directory.runner(ns)
+
+    with open(tmp_path / "items.collections.ndjson") as file:
+        collections = [json.loads(line) for line in file]
+    # the collection is published as is, then replaced by its version with the summaries of its items
+    assert len(collections) == 1
+    summaries = collections[0]["summaries"]
+    assert summaries["ml-aoi:split"] == ["train"]
+    assert summaries["gsd"] == [10]
+    # summaries of other properties are preserved
+    with open(os.path.join(CUR_DIR, "data/test_directory/collection.json")) as file:
+        assert summaries["eo:bands"] == json.load(file)["summaries"]["eo:bands"]
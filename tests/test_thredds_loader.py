@@ -0,0 +1,309 @@
+import hashlib
+import re
+
+import pytest
+import requests
+import responses
+from siphon.catalog import CatalogRef, Dataset
+
+from STACpopulator.crawl_index import CrawlIndex
+from STACpopulator.http_cache import HTTPCache
+from STACpopulator.input import THREDDSCatalog, THREDDSCatalogReader, THREDDSLoader
+
+THREDDS_URL = "http://test-thredds.com/thredds"
+NCML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<netcdf xmlns="http://www.unidata.ucar.edu/namespaces/netcdf/ncml-2.2" location="{name}">'
+    '<attribute name="title" value="{name}"/></netcdf>'
+)
+# catalog path -> (datasets, sub-catalogs)
+TREE = {
+    "data": (["a.nc", "b.nc"], ["sub1", "sub2"]),
+    "data/sub1": (["c.nc"], ["deep"]),
+    "data/sub1/deep": (["d.nc"], []),
+    "data/sub2": (["e.nc", "f.nc"], []),
+}
+
+
+def make_catalog(path: str, datasets: list, refs: list) -> str:
+    ds = "".join(
+        f'<dataset name="{name}" ID="{path}/{name}" urlPath="{path}/{name}">'
+        '<dataSize units="Kbytes">10</dataSize><date type="modified">2020-01-01T00:00:00Z</date></dataset>'
+        for name in datasets
+    )
+    cat_refs = "".join(
+        f'<catalogRef xlink:href="{ref}/catalog.xml" xlink:title="{ref}" ID="{path}/{ref}" name=""/>' for ref in refs
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<catalog xmlns="http://www.unidata.ucar.edu/namespaces/thredds/InvCatalog/v1.0" '
+        f'xmlns:xlink="http://www.w3.org/1999/xlink" name="{path}" version="1.2">'
+        '<service name="all" serviceType="Compound" base="">'
+        '<service name="odap" serviceType="OpenDAP" base="/thredds/dodsC/"/>'
+        '<service name="ncml" serviceType="NCML" base="/thredds/ncml/"/></service>'
+        f'<dataset name="{path}" ID="{path}"><metadata inherited="true"><serviceName>all</serviceName></metadata>'
+        f"{ds}{cat_refs}</dataset></catalog>"
+    )
+
+
+@pytest.fixture
+def thredds():
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as request_mock:
+        for path, (datasets, refs) in TREE.items():
+            request_mock.add(
+                "GET",
+                f"{THREDDS_URL}/catalog/{path}/catalog.xml",
+                body=make_catalog(path, datasets, refs),
+                content_type="text/xml",
+            )
+        request_mock.add_callback(
+            "GET",
+            re.compile(f"{THREDDS_URL}/ncml/.*"),
+            callback=lambda request: (200, {}, NCML.format(name=request.url.rsplit("/", 1)[-1])),
+            content_type="text/xml",
+        )
+        yield request_mock
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"crawl_workers": 3},
+        {"ncml_prefetch": 4},
+        {"crawl_workers": 2, "ncml_prefetch": 2, "ncml_ordered": False},
+        {"streaming": True},
+        {"streaming": True, "ncml_prefetch": 2},
+    ],
+)
+def test_thredds_loader(thredds, options: dict):
+    loader = THREDDSLoader(f"{THREDDS_URL}/catalog/data/catalog.xml", **options)
+    items = {name: (url, attrs) for name, url, attrs in loader}
+    assert set(items) == {"a.nc", "b.nc", "c.nc", "d.nc", "e.nc", "f.nc"}
+    url, attrs = items["d.nc"]
+    assert url == f"{THREDDS_URL}/catalog/data/sub1/deep/d.nc"
+    assert attrs["attributes"]["title"] == "d.nc"
+    assert attrs["access_urls"]["NCML"] == f"{THREDDS_URL}/ncml/data/sub1/deep/d.nc"
+    assert loader.estimate_total() == 6
+
+
+def test_thredds_loader_crawl_catalogs(thredds):
+    loader = THREDDSLoader(f"{THREDDS_URL}/catalog/data/catalog.xml", crawl_workers=2)
+    names = [catalog.catalog_name for catalog in loader.crawl_catalogs()]
+    assert names[0] == "data"
+    assert sorted(names) == sorted(TREE)
+    assert names.index("data/sub1/deep") > names.index("data/sub1")
+
+    loader = THREDDSLoader(f"{THREDDS_URL}/catalog/data/catalog.xml", depth=1, crawl_workers=2)
+    assert {name for name, _, _ in loader} == {"a.nc", "b.nc", "c.nc", "e.nc", "f.nc"}
+
+
+def test_thredds_loader_ncml_prefetch_ordered(thredds):
+    serial = [name for name, _, _ in THREDDSLoader(f"{THREDDS_URL}/catalog/data/catalog.xml")]
+    loader = THREDDSLoader(f"{THREDDS_URL}/catalog/data/catalog.xml", ncml_prefetch=3)
+    assert [name for name, _, attrs in loader if attrs["attributes"]["title"] == name] == serial
+
+
+def test_thredds_catalog_reader(thredds):
+    url = f"{THREDDS_URL}/catalog/data/catalog.xml"
+    catalog = THREDDSCatalog(url)
+    reader = THREDDSCatalogReader(url)
+    entries = list(reader)
+    datasets = [entry for entry in entries if isinstance(entry, Dataset)]
+    refs = [entry for entry in entries if isinstance(entry, CatalogRef)]
+    assert reader.catalog_name == catalog.catalog_name == "data"
+    assert [ds.name for ds in datasets] == list(catalog.datasets)
+    for ds in datasets:
+        assert dict(ds.access_urls) == dict(catalog.datasets[ds.name].access_urls)
+        assert (ds.modified, ds.size) == ("2020-01-01T00:00:00Z", "10 Kbytes")
+    assert [ref.href for ref in refs] == [ref.href for ref in catalog.catalog_refs.values()]
+
+
+@pytest.mark.parametrize("spool_size", [1, 1024 * 1024])
+def test_thredds_catalog_reader_closes_response(thredds, spool_size: int):
+    session = requests.Session()
+    received = []
+    get = session.get
+    session.get = lambda *args, **kwargs: received.append(get(*args, **kwargs)) or received[-1]
+    url = f"{THREDDS_URL}/catalog/data/catalog.xml"
+    entries = iter(THREDDSCatalogReader(url, session=session, spool_size=spool_size))
+    first = next(entries)
+    # the document is read entirely before its entries are processed
+    assert received[0].raw.closed
+    assert [first.name] + [entry.name for entry in entries if isinstance(entry, Dataset)] == ["a.nc", "b.nc"]
+
+
+@pytest.mark.parametrize("options", [{}, {"streaming": True}, {"crawl_workers": 2}])
+def test_thredds_loader_depth(thredds, options: dict):
+    loader = THREDDSLoader(f"{THREDDS_URL}/catalog/data/catalog.xml", depth=1, **options)
+    assert sorted(name for name, _, _ in loader) == ["a.nc", "b.nc", "c.nc", "e.nc", "f.nc"]
+    loader = THREDDSLoader(f"{THREDDS_URL}/catalog/data/catalog.xml", depth=0, **options)
+    assert sorted(name for name, _, _ in loader) == ["a.nc", "b.nc"]
+
+
+@pytest.mark.parametrize("options", [{}, {"streaming": True}, {"crawl_workers": 2}])
+def test_thredds_loader_cycles(options: dict):
+    # 'sub2' is referenced twice, and references the top-level catalog
+    tree = {"data": (["a.nc"], ["sub1", "sub2"]), "data/sub1": (["b.nc"], ["../sub2"]), "data/sub2": (["c.nc"], [".."])}
+    with responses.RequestsMock() as request_mock:
+        for path, (datasets, refs) in tree.items():
+            request_mock.add(
+                "GET",
+                f"{THREDDS_URL}/catalog/{path}/catalog.xml",
+                body=make_catalog(path, datasets, refs),
+                content_type="text/xml",
+            )
+        request_mock.add_callback(
+            "GET",
+            re.compile(f"{THREDDS_URL}/ncml/.*"),
+            callback=lambda request: (200, {}, NCML.format(name=request.url.rsplit("/", 1)[-1])),
+            content_type="text/xml",
+        )
+        loader = THREDDSLoader(f"{THREDDS_URL}/catalog/data/catalog.xml", **options)
+        assert sorted(name for name, _, _ in loader) == ["a.nc", "b.nc", "c.nc"]
+        assert len([call for call in request_mock.calls if "/catalog/" in call.request.url]) == 3
+        assert loader.estimate_total() == 3
+
+
+def conditional(body: str):
+    """Response callback providing an ETag and answering 304 to a request with the same one."""
+    etag = f'"{hashlib.md5(body.encode()).hexdigest()}"'
+
+    def callback(request):
+        if request.headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, ""
+        return 200, {"ETag": etag}, body
+
+    return callback
+
+
+@pytest.fixture
+def cached_thredds():
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as request_mock:
+        for path, (datasets, refs) in TREE.items():
+            request_mock.add_callback(
+                "GET",
+                f"{THREDDS_URL}/catalog/{path}/catalog.xml",
+                callback=conditional(make_catalog(path, datasets, refs)),
+                content_type="text/xml",
+            )
+        for name in ["a.nc", "b.nc", "c.nc", "d.nc", "e.nc", "f.nc"]:
+            request_mock.add_callback(
+                "GET",
+                re.compile(f"{THREDDS_URL}/ncml/.*/{name}"),
+                callback=conditional(NCML.format(name=name)),
+                content_type="text/xml",
+            )
+        yield request_mock
+
+
+@pytest.mark.parametrize("options", [{}, {"crawl_workers": 2, "ncml_prefetch": 2}])
+def test_thredds_loader_http_cache(cached_thredds, tmp_path, options: dict):
+    with HTTPCache(tmp_path / "cache.db") as cache:
+        first = list(THREDDSLoader(f"{THREDDS_URL}/catalog/data/catalog.xml", http_cache=cache, **options))
+        assert (cache.hits, cache.misses) == (0, 10)
+    with HTTPCache(tmp_path / "cache.db") as cache:
+        second = list(THREDDSLoader(f"{THREDDS_URL}/catalog/data/catalog.xml", http_cache=cache, **options))
+        assert (cache.hits, cache.misses) == (10, 0)
+    assert sorted(second) == sorted(first)
+    assert all(call.response.status_code == 304 for call in cached_thredds.calls[10:])
+
+
+def test_thredds_loader_streaming_unsupported(tmp_path):
+    with HTTPCache(tmp_path / "cache.db") as cache, pytest.raises(ValueError, match="HTTP cache"):
+        THREDDSLoader(f"{THREDDS_URL}/catalog/data/catalog.xml", http_cache=cache, streaming=True)
+    with CrawlIndex(tmp_path / "index.db") as index, pytest.raises(ValueError, match="crawl index"):
+        THREDDSLoader(f"{THREDDS_URL}/catalog/data/catalog.xml", crawl_index=index, streaming=True)
+
+
+def test_http_cache_eviction(tmp_path):
+    with HTTPCache(tmp_path / "cache.db", max_size=250) as cache:
+        for name in ["a", "b", "c"]:
+            cache.store(f"{THREDDS_URL}/{name}", {"ETag": f'"{name}"'}, b"x" * 100)
+        assert cache.lookup(f"{THREDDS_URL}/a") is None
+        assert cache.lookup(f"{THREDDS_URL}/c").headers == {"ETag": '"c"'}
+        cache.store(f"{THREDDS_URL}/d", {}, b"not revalidable")
+        assert cache.lookup(f"{THREDDS_URL}/d") is None
+
+
+@pytest.mark.parametrize("options", [{}, {"crawl_workers": 2}])
+def test_thredds_loader_crawl_index(cached_thredds, tmp_path, options: dict):
+    url = f"{THREDDS_URL}/catalog/data/catalog.xml"
+    with CrawlIndex(tmp_path / "index.db") as index:
+        first = sorted(THREDDSLoader(url, crawl_index=index, **options))
+        assert index.stats() == {"catalogs": 4, "catalogs_seen": 4, "datasets": 6, "datasets_seen": 6}
+        assert index.catalog(f"{THREDDS_URL}/catalog/data/sub1/catalog.xml").datasets["c.nc"].modified == (
+            "2020-01-01T00:00:00Z"
+        )
+
+    def catalog_statuses():
+        return [call.response.status_code for call in cached_thredds.calls if "/catalog/" in call.request.url]
+
+    with CrawlIndex(tmp_path / "index.db") as index:
+        cached_thredds.calls.reset()
+        assert sorted(THREDDSLoader(url, crawl_index=index, **options)) == first
+        assert catalog_statuses() == [304] * 4
+        assert index.run == 2 and index.stats()["datasets_seen"] == 6
+
+        cached_thredds.calls.reset()
+        assert sorted(THREDDSLoader(url, crawl_index=index, from_index=True, **options)) == first
+        assert catalog_statuses() == []
+
+
+def test_crawl_index_digests(cached_thredds, tmp_path):
+    url = f"{THREDDS_URL}/catalog/data/catalog.xml"
+    with CrawlIndex(tmp_path / "index.db") as index:
+        list(THREDDSLoader(url, crawl_index=index))
+    with CrawlIndex(tmp_path / "index.db") as index:
+        digests = {path: index.catalog(f"{THREDDS_URL}/catalog/{path}/catalog.xml").digest for path in TREE}
+        assert None not in digests.values() and len(set(digests.values())) == 4
+
+        # the subtrees of catalogs beyond the crawl depth are not digested
+        list(THREDDSLoader(url, depth=1, crawl_workers=2, crawl_index=index))
+        index.update_digests()
+        assert index.catalog(url).digest is None
+        assert index.catalog(f"{THREDDS_URL}/catalog/data/sub1/catalog.xml").digest is None
+        assert index.catalog(f"{THREDDS_URL}/catalog/data/sub2/catalog.xml").digest == digests["data/sub2"]
+
+
+@pytest.mark.parametrize("options", [{}, {"crawl_workers": 2}])
+def test_thredds_loader_skip_unchanged_subtrees(cached_thredds, tmp_path, options: dict):
+    url = f"{THREDDS_URL}/catalog/data/catalog.xml"
+    with CrawlIndex(tmp_path / "index.db") as index:
+        first = sorted(THREDDSLoader(url, crawl_index=index, skip_unchanged_subtrees=True, **options))
+
+    for run in range(2):
+        with CrawlIndex(tmp_path / "index.db") as index:
+            cached_thredds.calls.reset()
+            assert sorted(THREDDSLoader(url, crawl_index=index, skip_unchanged_subtrees=True, **options)) == first
+            assert [call.request.url for call in cached_thredds.calls if "/catalog/" in call.request.url] == [url]
+            assert index.stats()["datasets_seen"] == 6
+
+
+def test_thredds_loader_skip_changed_index_subtree(cached_thredds, tmp_path):
+    url = f"{THREDDS_URL}/catalog/data/catalog.xml"
+    sub1 = f"{THREDDS_URL}/catalog/data/sub1/catalog.xml"
+    with CrawlIndex(tmp_path / "index.db") as index:
+        first = sorted(name for name, _, _ in THREDDSLoader(url, crawl_index=index))
+
+    # a sub-catalog changed and was recorded by a run crawling it alone, unlike the unchanged top-level catalog
+    cached_thredds.replace("GET", sub1, body=make_catalog("data/sub1", ["c.nc", "g.nc"], ["deep"]))
+    cached_thredds.add_callback(
+        "GET", re.compile(f"{THREDDS_URL}/ncml/.*/g.nc"), callback=conditional(NCML.format(name="g.nc"))
+    )
+    with CrawlIndex(tmp_path / "index.db") as index:
+        THREDDSLoader(sub1, crawl_index=index)
+        assert index.subtree_digest(url) != index.catalog(url).digest
+
+    # the subtree no longer matches its digest, and is crawled again
+    with CrawlIndex(tmp_path / "index.db") as index:
+        cached_thredds.calls.reset()
+        loader = THREDDSLoader(url, crawl_index=index, skip_unchanged_subtrees=True)
+        assert sorted(name for name, _, _ in loader) == sorted(first + ["g.nc"])
+        assert len([call for call in cached_thredds.calls if "/catalog/" in call.request.url]) == 4
+
+    with CrawlIndex(tmp_path / "index.db") as index:
+        assert index.subtree_digest(url) == index.catalog(url).digest
+        cached_thredds.calls.reset()
+        assert len(list(THREDDSLoader(url, crawl_index=index, skip_unchanged_subtrees=True))) == len(first) + 1
+        assert [call.request.url for call in cached_thredds.calls if "/catalog/" in call.request.url] == [url]
@@ -0,0 +1,39 @@
+import pytest
+
+from STACpopulator.timing import StageStats, StageTimings, item_stages
+
+
+def test_stage_stats_percentiles():
+    stats = StageStats()
+    for i in range(1, 101):
+        stats.add(i / 1000, nbytes=10)
+    assert stats.count == 100
+    assert stats.bytes == 1000
+    assert stats.maximum == pytest.approx(0.1)
+    # percentiles are bounded by the upper bound of their bucket (4 buckets per doubling)
+    assert 0.050 <= stats.percentile(50) <= 0.050 * 2**0.25
+    assert 0.095 <= stats.percentile(95) <= 0.1
+    assert stats.percentile(100) == pytest.approx(0.1)
+    assert StageStats().percentile(50) == 0
+
+
+def test_stage_timings_items_and_errors():
+    timings = StageTimings()
+    with item_stages() as durations:
+        with timings.stage("fetch") as timer:
+            timer.bytes = 42
+        with pytest.raises(ValueError):
+            with timings.stage("parse"):
+                raise ValueError
+        with timings.stage("fetch"):
+            pass
+    with timings.stage("post"):
+        pass
+
+    assert set(durations) == {"fetch", "parse"}
+    snapshot = timings.snapshot()
+    assert snapshot["fetch"].count == 2
+    assert snapshot["fetch"].bytes == 42
+    assert snapshot["parse"].errors == 1
+    assert snapshot["post"].count == 1
+    assert timings.summary().splitlines()[2].startswith("fetch")
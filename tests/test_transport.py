@@ -0,0 +1,29 @@
+import requests
+
+from STACpopulator.retry import RetryAdapter, RetryPolicy, apply_retry_policy, get_retry_policy
+from STACpopulator.transport import configure_session, get_pool_size, get_session
+
+
+def test_configure_session():
+    session = configure_session(requests.Session(), pool_size=32)
+    adapter = session.get_adapter("https://stac.example.com")
+    assert isinstance(adapter, RetryAdapter)
+    assert session.get_adapter("http://stac.example.com") is adapter
+    assert get_pool_size(session) == 32
+    assert adapter.poolmanager.connection_pool_kw["block"] is True
+    assert get_retry_policy(session).retries == 0
+
+    # the pools are preserved when a retry policy is applied afterward
+    policy = RetryPolicy(retries=3)
+    apply_retry_policy(session, policy)
+    assert session.get_adapter("https://stac.example.com") is adapter
+    assert get_retry_policy(session) is policy
+    assert get_pool_size(session) == 32
+    assert get_pool_size(requests.Session()) is None
+
+
+def test_get_session():
+    session = requests.Session()
+    assert get_session(session) is session
+    assert get_session() is get_session()
+    assert get_pool_size(get_session()) is not None